@@ -0,0 +1,256 @@
+import asyncio
+import socket
+from time import perf_counter
+
+from reddish import Command
+from reddish.clients import asyncio as asyncio_client
+from reddish.clients import socket as socket_client
+
+from .server import RespServer
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import trio
+    from reddish.clients import trio as trio_client
+except ImportError:
+    trio = None
+
+try:
+    import anyio
+    from reddish.clients import anyio as anyio_client
+except ImportError:
+    anyio = None
+
+TOTAL = 20_000  # commands per measurement
+GET = Command("GET foo")
+
+
+class EndToEnd:
+    """Commands per second through a client against an in-process RESP server.
+
+    The commands are sent in batches of `batch` commands one after another so
+    small batches are dominated by round trips and large ones by encoding and
+    decoding.
+    """
+
+    params = [1, 10, 100]
+    param_names = ["batch"]
+    unit = "commands/s"
+    timeout = 120
+
+    def setup(self, batch):
+        self.server = RespServer()
+        self.commands = [GET] * batch
+
+    def teardown(self, batch):
+        self.server.close()
+
+
+class Socket(EndToEnd):
+    def track_throughput(self, batch):
+        with socket.create_connection(self.server.address) as stream:
+            redis = socket_client.Redis(stream)
+            commands = self.commands
+            start = perf_counter()
+            for _ in range(TOTAL // batch):
+                redis.execute_many(*commands)
+            return TOTAL / (perf_counter() - start)
+
+
+class SocketStream:
+    """Commands per second streamed through a socket client keeping `window` of
+    them in flight.
+    """
+
+    params = [100, 1000, 10_000]
+    param_names = ["window"]
+    unit = "commands/s"
+    timeout = 120
+
+    def setup(self, window):
+        self.server = RespServer()
+
+    def teardown(self, window):
+        self.server.close()
+
+    def track_throughput(self, window):
+        with socket.create_connection(self.server.address) as stream:
+            redis = socket_client.Redis(stream)
+            start = perf_counter()
+            for _ in redis.execute_stream((GET for _ in range(TOTAL)), window):
+                pass
+            return TOTAL / (perf_counter() - start)
+
+
+class Asyncio(EndToEnd):
+    async def _throughput(self, batch):
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        redis = asyncio_client.Redis((reader, writer))
+        commands = self.commands
+        start = perf_counter()
+        for _ in range(TOTAL // batch):
+            await redis.execute_many(*commands)
+        elapsed = perf_counter() - start
+        writer.close()
+        return TOTAL / elapsed
+
+    def track_throughput(self, batch):
+        return asyncio.run(self._throughput(batch))
+
+
+class AsyncioStream(SocketStream):
+    """Commands per second streamed through an asyncio client keeping `window` of
+    them in flight.
+    """
+
+    async def _throughput(self, window):
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        redis = asyncio_client.Redis((reader, writer))
+        start = perf_counter()
+        async for _ in redis.execute_stream((GET for _ in range(TOTAL)), window):
+            pass
+        elapsed = perf_counter() - start
+        writer.close()
+        return TOTAL / elapsed
+
+    def track_throughput(self, window):
+        return asyncio.run(self._throughput(window))
+
+
+def _run(coroutine, loop):
+    if loop == "asyncio":
+        return asyncio.run(coroutine)
+    if uvloop is None:
+        coroutine.close()
+        raise NotImplementedError("uvloop is not installed")
+    event_loop = uvloop.new_event_loop()
+    try:
+        return event_loop.run_until_complete(coroutine)
+    finally:
+        event_loop.close()
+
+
+async def _connect(address, client):
+    # a streams based client or one on a `RedisProtocol` and its transport
+    if client == "streams":
+        reader, writer = await asyncio.open_connection(*address)
+        return asyncio_client.Redis((reader, writer)), writer
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_connection(
+        asyncio_client.RedisProtocol, *address
+    )
+    return asyncio_client.ProtocolRedis((transport, protocol)), transport
+
+
+class AsyncioTransports:
+    """Commands per second through the streams and the protocol based asyncio
+    clients in batches of `batch` commands.
+    """
+
+    params = [["streams", "protocol"], ["asyncio", "uvloop"], [1, 100]]
+    param_names = ["client", "loop", "batch"]
+    unit = "commands/s"
+    timeout = 120
+
+    def setup(self, client, loop, batch):
+        self.server = RespServer()  # closed by `teardown` even when skipped
+        self.commands = [GET] * batch
+        if loop == "uvloop" and uvloop is None:
+            raise NotImplementedError("uvloop is not installed")
+
+    def teardown(self, client, loop, batch):
+        self.server.close()
+
+    async def _throughput(self, client, batch):
+        redis, transport = await _connect(self.server.address, client)
+        commands = self.commands
+        start = perf_counter()
+        for _ in range(TOTAL // batch):
+            await redis.execute_many(*commands)
+        elapsed = perf_counter() - start
+        transport.close()
+        return TOTAL / elapsed
+
+    def track_throughput(self, client, loop, batch):
+        return _run(self._throughput(client, batch), loop)
+
+
+class AsyncioTransportsConcurrent(AsyncioTransports):
+    """Commands per second of `batch` concurrent callers sharing a connection of
+    the streams or the protocol based asyncio client.
+    """
+
+    params = [["streams", "protocol"], ["asyncio", "uvloop"], [10, 100]]
+
+    async def _throughput(self, client, batch):
+        redis, transport = await _connect(self.server.address, client)
+
+        async def caller():
+            for _ in range(TOTAL // batch):
+                await redis.execute(GET)
+
+        start = perf_counter()
+        await asyncio.gather(*[caller() for _ in range(batch)])
+        elapsed = perf_counter() - start
+        transport.close()
+        return TOTAL / elapsed
+
+
+class AsyncioTransportsStream(AsyncioTransports):
+    """Commands per second streamed through the streams or the protocol based
+    asyncio client keeping `window` of them in flight.
+    """
+
+    params = [["streams", "protocol"], ["asyncio", "uvloop"], [1000]]
+    param_names = ["client", "loop", "window"]
+
+    async def _throughput(self, client, window):
+        redis, transport = await _connect(self.server.address, client)
+        start = perf_counter()
+        async for _ in redis.execute_stream((GET for _ in range(TOTAL)), window):
+            pass
+        elapsed = perf_counter() - start
+        transport.close()
+        return TOTAL / elapsed
+
+
+class Trio(EndToEnd):
+    def setup(self, batch):
+        if trio is None:
+            raise NotImplementedError("trio is not installed")
+        super().setup(batch)
+
+    async def _throughput(self, batch):
+        async with await trio.open_tcp_stream(*self.server.address) as stream:
+            redis = trio_client.Redis(stream)
+            commands = self.commands
+            start = perf_counter()
+            for _ in range(TOTAL // batch):
+                await redis.execute_many(*commands)
+            return TOTAL / (perf_counter() - start)
+
+    def track_throughput(self, batch):
+        return trio.run(self._throughput, batch)
+
+
+class Anyio(EndToEnd):
+    def setup(self, batch):
+        if anyio is None:
+            raise NotImplementedError("anyio is not installed")
+        super().setup(batch)
+
+    async def _throughput(self, batch):
+        async with await anyio.connect_tcp(*self.server.address) as stream:
+            redis = anyio_client.Redis(stream)
+            commands = self.commands
+            start = perf_counter()
+            for _ in range(TOTAL // batch):
+                await redis.execute_many(*commands)
+            return TOTAL / (perf_counter() - start)
+
+    def track_throughput(self, batch):
+        return anyio.run(self._throughput, batch, backend="asyncio")
@@ -0,0 +1,127 @@
+from array import array
+
+from reddish import Args, Command, MultiExec
+from reddish._core.sansio import RedisSansIO
+from reddish._core.templating import CompiledTemplate, apply_template
+
+
+class TemplateApplication:
+    """Creating a command from a template string vs a precompiled template."""
+
+    template = "SET {key} {value}"
+
+    def setup(self):
+        self.compiled = Command.template(self.template)
+
+    def time_parse_template(self):
+        CompiledTemplate(self.template).apply((), {"key": "foo", "value": 42})
+
+    def time_apply_template(self):
+        apply_template(self.template, key="foo", value=42)
+
+    def time_command(self):
+        Command(self.template, key="foo", value=42)
+
+    def time_command_template(self):
+        self.compiled(key="foo", value=42)
+
+
+class Encoding:
+    """Encoding a command for sending it to redis."""
+
+    def setup(self):
+        self.command = Command("MGET {}", Args([f"key:{i}" for i in range(100)]))
+
+    def time_encode(self):
+        self.command._encoded = None
+        bytes(self.command)
+
+    def time_encode_cached(self):
+        bytes(self.command)
+
+
+class TransactionEncoding:
+    """Encoding a transaction for sending it to redis."""
+
+    def setup(self):
+        self.commands = [Command("SET {} {}", f"key:{i}", i) for i in range(100)]
+        self.transaction = MultiExec(*self.commands)
+
+    def time_encode(self):
+        for command in self.commands:
+            command._encoded = None
+        self.transaction._encoded = None
+        bytes(self.transaction)
+
+    def time_encode_cached(self):
+        bytes(self.transaction)
+
+
+class LargeValues:
+    """Sending a large value held in bytes vs a buffer that isn't copied."""
+
+    params = [1_000_000, 50_000_000]
+    param_names = ["size"]
+
+    def setup(self, size):
+        self.redis = RedisSansIO()
+        self.value = bytearray(size)
+
+    def _send(self, value):
+        for _ in self.redis.send_chunks([Command("SET {} {}", "key", value)]):
+            pass
+        self.redis.receive(b"+OK\r\n")
+
+    def time_bytes(self, size):
+        self._send(bytes(self.value))
+
+    def time_buffer(self, size):
+        self._send(self.value)
+
+    def peakmem_bytes(self, size):
+        self._send(bytes(self.value))
+
+    def peakmem_buffer(self, size):
+        self._send(self.value)
+
+
+class BulkArgs:
+    """Validating many arguments of the same type one by one vs at once."""
+
+    def setup(self):
+        self.ids = list(range(10_000))
+        self.array = array("q", self.ids)
+
+    def time_args(self):
+        Args(self.ids)
+
+    def time_from_sequence(self):
+        Args.from_sequence(self.ids)
+
+    def time_from_array(self):
+        Args.from_sequence(self.array)
+
+
+class KeyLookup:
+    """Looking up the keys of a command from the command table."""
+
+    def setup(self):
+        self.get = Command("GET foo")
+        self.mget = Command("MGET {}", Args([f"key:{i}" for i in range(100)]))
+        self.xread = Command("XREAD COUNT 10 STREAMS a b c 0 0 0")
+        self.template = Command.template("GET {}")
+
+    def time_command_with_info(self):
+        self.template("foo")
+
+    def time_info(self):
+        self.get.info.readonly
+
+    def time_keys(self):
+        self.get.keys()
+
+    def time_keys_variadic(self):
+        self.mget.keys()
+
+    def time_keys_keyword(self):
+        self.xread.keys()
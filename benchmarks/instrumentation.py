@@ -0,0 +1,38 @@
+from reddish import Command, Instrumentation, LatencyRecorder
+from reddish._core.sansio import RedisSansIO
+
+BATCHES = {
+    "single": ([Command("GET foo")], b"$3\r\nbar\r\n"),
+    "pipeline_100": (100 * [Command("GET foo")], 100 * b"$3\r\nbar\r\n"),
+}
+INSTRUMENTATIONS = {
+    "none": lambda: None,
+    "noop": Instrumentation,
+    "latency_recorder": LatencyRecorder,
+}
+
+
+class SendReceive:
+    """Overhead of instrumentation on sending a batch and decoding its replies.
+
+    `none` is the baseline without any hooks installed, `noop` the cost of calling
+    the hooks and `latency_recorder` the built-in histograms.
+    """
+
+    params = (list(BATCHES), list(INSTRUMENTATIONS))
+    param_names = ["batch", "instrumentation"]
+
+    def setup(self, batch, instrumentation):
+        self.commands, self.replies = BATCHES[batch]
+        self.redis = RedisSansIO(instrumentation=INSTRUMENTATIONS[instrumentation]())
+
+    def time_send_receive(self, batch, instrumentation):
+        redis = self.redis
+        redis.send(self.commands)
+        redis.receive(self.replies)
+
+    def time_send_chunks_receive_outcomes(self, batch, instrumentation):
+        redis = self.redis
+        for _ in redis.send_chunks(self.commands):
+            pass
+        redis.receive_outcomes(self.replies)
@@ -0,0 +1,64 @@
+import tracemalloc
+
+from reddish import Args, Command, MultiExec
+from reddish._core.sansio import RedisSansIO
+
+SIZE = 100_000  # commands of a large pipeline
+SET = Command.template("SET {} {}")
+
+
+def _set():
+    return [SET(f"key:{i}", i) for i in range(SIZE)]
+
+
+def _hset():
+    fields = {"name": "alice", "age": 42, "city": "berlin"}
+    return [
+        Command("HSET {} {}", f"user:{i}", Args.from_dict(fields)) for i in range(SIZE)
+    ]
+
+
+def _mset():
+    return [Command("MSET {}", Args([f"key:{i}", i] * 10)) for i in range(SIZE // 10)]
+
+
+def _multi_exec():
+    return [
+        MultiExec(Command("INCR {}", f"key:{i}"), Command("EXPIRE {} 60", f"key:{i}"))
+        for i in range(SIZE // 2)
+    ]
+
+
+PIPELINES = {"set": _set, "hset": _hset, "mset": _mset, "multi_exec": _multi_exec}
+
+
+class QueuedPipeline:
+    """Memory held by a large pipeline of commands queued for their replies."""
+
+    params = list(PIPELINES)
+    param_names = ["pipeline"]
+    unit = "bytes"
+    timeout = 120
+
+    def track_memory(self, pipeline):
+        tracemalloc.start()
+        try:
+            commands = PIPELINES[pipeline]()
+            redis = RedisSansIO()
+            for _ in redis.send_chunks(commands):
+                pass  # as if written to the connection
+            del commands  # only the queued batch holds the commands now
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del redis
+        return size
+
+    def track_memory_per_command(self, pipeline):
+        tracemalloc.start()
+        try:
+            commands = PIPELINES[pipeline]()
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return size // len(commands)
@@ -0,0 +1,160 @@
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Json
+
+from reddish import Command
+from reddish._core.parser import parse
+from reddish.models import (
+    Array,
+    Hash,
+    Info,
+    NDArray,
+    Numbers,
+    ScoredArrays,
+    ScoredMembers,
+    StreamEntries,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class User(BaseModel):
+    name: str
+    age: int
+
+
+# typical models and replies they are parsed from
+MODELS = {
+    "int": (int, b"42"),
+    "str": (str, b"foo"),
+    "list[str]": (List[str], [b"foo"] * 100),
+    "dict[str, int]": (Dict[str, int], {f"key:{i}".encode(): b"1" for i in range(100)}),
+    "Json[BaseModel]": (Json[User], b'{"name": "alice", "age": 42}'),
+}
+
+
+class Parse:
+    """Parsing a reply into a model."""
+
+    params = list(MODELS)
+    param_names = ["model"]
+
+    def setup(self, model):
+        self.model, self.reply = MODELS[model]
+        self.command = Command("GET foo").into(self.model)
+
+    def time_parse(self, model):
+        parse(self.model, self.reply)
+
+    def time_parse_response(self, model):
+        self.command._parse_response(self.reply)
+
+
+def _pairs(items):
+    return dict(zip(items[::2], items[1::2]))
+
+
+def _hgetall(reply):
+    return _pairs(parse(List[str], reply))
+
+
+def _zrange_withscores(reply):
+    return list(zip(parse(List[str], reply[::2]), parse(List[float], reply[1::2])))
+
+
+def _xrange(reply):
+    entries = parse(List[Tuple[str, List[str]]], reply)
+    return [(id, _pairs(fields)) for id, fields in entries]
+
+
+def _mget_numbers(reply):
+    return parse(List[Optional[int]], reply)
+
+
+INFO = (
+    b"# Server\r\n"
+    + b"".join(b"field_%d:%d\r\n" % (i, i) for i in range(100))
+    + b"# Keyspace\r\ndb0:keys=1,expires=0,avg_ttl=0\r\n"
+)
+
+# RESP2 replies of common shapes with a reply model and the equivalent conversion
+# with pydantic types, if any
+REPLY_MODELS = {
+    "hgetall": ([f"field:{i}".encode() for i in range(200)], Hash, _hgetall),
+    "zrange_withscores": (
+        [b"member:%d" % (i // 2) if i % 2 == 0 else b"%d" % i for i in range(200)],
+        ScoredMembers,
+        _zrange_withscores,
+    ),
+    "xrange": (
+        [[f"{i}-0".encode(), [b"field", b"value"] * 5] for i in range(100)],
+        StreamEntries,
+        _xrange,
+    ),
+    "mget_numbers": ([b"%d" % i for i in range(100)], Numbers, _mget_numbers),
+    "info": (INFO, Info, None),
+}
+
+
+class ParseReplyModels:
+    """Parsing common reply shapes with reply models and with pydantic types."""
+
+    params = (list(REPLY_MODELS), ["reddish", "pydantic"])
+    param_names = ["reply", "model"]
+
+    def setup(self, reply, model):
+        self.reply, fast, slow = REPLY_MODELS[reply]
+        if model == "reddish":
+            self.parse = lambda reply: parse(fast, reply)
+        elif slow is None:
+            raise NotImplementedError("no pydantic type for the reply")
+        else:
+            self.parse = slow
+
+    def time_parse(self, reply, model):
+        self.parse(self.reply)
+
+
+SAMPLES = [b"%d.25" % i for i in range(100_000)]  # e.g. LRANGE of a time series
+SCORED = [b"%d" % i for i in range(200_000)]  # ZRANGE ... WITHSCORES
+NUMERIC_MODELS = {
+    "list[float]": (SAMPLES, List[float]),
+    "Array": (SAMPLES, Array),
+    "NDArray": (SAMPLES, NDArray),
+    "list[tuple[float, float]]": (SCORED, List[Tuple[float, float]]),
+    "ScoredArrays[float]": (SCORED, ScoredArrays[float]),
+}
+
+
+class ParseNumericArrays:
+    """Parsing 100k numeric bulk strings into lists, arrays and NumPy arrays."""
+
+    params = list(NUMERIC_MODELS)
+    param_names = ["model"]
+    unit = "bytes"
+
+    def setup(self, model):
+        if model == "NDArray" and numpy is None:
+            raise NotImplementedError("numpy is not installed")
+        self.reply, self.model = NUMERIC_MODELS[model]
+        if self.model == List[Tuple[float, float]]:
+            # pydantic needs the flat list paired up
+            self.reply = list(zip(self.reply[::2], self.reply[1::2]))
+
+    def time_parse(self, model):
+        parse(self.model, self.reply)
+
+    def track_memory(self, model):
+        # bytes held by the parsed reply
+        tracemalloc.start()
+        try:
+            parsed = parse(self.model, self.reply)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del parsed
+        return size
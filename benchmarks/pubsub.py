@@ -0,0 +1,16 @@
+from reddish._core.pubsub import SubscriberSansIO
+
+
+class MessageDecoding:
+    """Decoding a read full of published messages."""
+
+    params = [1, 100, 1000]
+    param_names = ["messages"]
+
+    def setup(self, messages):
+        message = b"*3\r\n$7\r\nmessage\r\n$4\r\nnews\r\n$16\r\n" + 16 * b"x" + b"\r\n"
+        self.data = messages * message
+        self.subscriber = SubscriberSansIO()
+
+    def time_receive(self, messages):
+        self.subscriber.receive(self.data)
@@ -0,0 +1,51 @@
+from reddish import Args, Command
+from reddish._core.sansio import RedisSansIO
+
+CHUNK_SIZE = 1 << 16  # bytes per read from the connection
+
+
+def _bulk(data):
+    return b"$%d\r\n%b\r\n" % (len(data), data)
+
+
+# a single large reply, a single reply with many elements and many small replies
+REPLIES = {
+    "bulk_1mb": ([Command("GET foo")], _bulk(b"x" * (1 << 20))),
+    "array_10k": (
+        [Command("MGET {}", Args(f"key:{i}" for i in range(10_000)))],
+        b"*10000\r\n" + 10_000 * _bulk(b"x" * 16),
+    ),
+    "pipeline_1k": (1000 * [Command("GET foo")], 1000 * _bulk(b"x" * 16)),
+}
+
+
+class ReceiveReplies:
+    """Decoding the replies to a batch of commands."""
+
+    params = list(REPLIES)
+    param_names = ["replies"]
+
+    def setup(self, replies):
+        self.commands, self.data = REPLIES[replies]
+        self.chunks = [
+            self.data[i : i + CHUNK_SIZE]  # noqa: E203
+            for i in range(0, len(self.data), CHUNK_SIZE)
+        ]
+        self.redis = RedisSansIO()
+
+    def time_receive(self, replies):
+        redis = self.redis
+        redis.send(self.commands)
+        redis.receive(self.data)
+
+    def time_receive_chunked(self, replies):
+        # as read from the connection
+        redis = self.redis
+        redis.send(self.commands)
+        for chunk in self.chunks:
+            redis.receive(chunk)
+
+    def time_receive_outcomes(self, replies):
+        redis = self.redis
+        redis.send(self.commands)
+        redis.receive_outcomes(self.data)
@@ -0,0 +1,78 @@
+import socket
+import threading
+
+import hiredis
+
+VALUE = 16 * b"x"
+REPLIES = {
+    b"PING": b"+PONG\r\n",
+    b"GET": b"$%d\r\n%b\r\n" % (len(VALUE), VALUE),
+    b"INCR": b":1\r\n",
+}
+OK = b"+OK\r\n"
+QUEUED = b"+QUEUED\r\n"
+
+
+class RespServer:
+    """In-process stand-in for redis answering every command with a canned reply.
+
+    Replies don't depend on any data so the server does as little work as possible
+    and benchmarks mostly measure the client.
+    """
+
+    def __init__(self):
+        self._server = socket.socket()  # `socket.create_server` requires python 3.8
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen()
+        self.address = self._server.getsockname()
+        self._connections = []
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.close()
+        for connection in self._connections:
+            connection.close()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._connections.append(connection)
+            threading.Thread(
+                target=self._handle, args=(connection,), daemon=True
+            ).start()
+
+    def _handle(self, connection):
+        reader = hiredis.Reader()
+        transaction = None  # replies of the commands queued after MULTI
+        while True:
+            try:
+                data = connection.recv(1 << 16)
+            except OSError:
+                return
+            if not data:
+                return
+            reader.feed(data)
+            out = []
+            command = reader.gets()
+            while command is not False:
+                name = command[0].upper()
+                reply = REPLIES.get(name, OK)
+                if name == b"MULTI":
+                    transaction = []
+                elif name == b"EXEC":
+                    reply = b"*%d\r\n%b" % (len(transaction), b"".join(transaction))
+                    transaction = None
+                elif transaction is not None:
+                    transaction.append(reply)
+                    reply = QUEUED
+                out.append(reply)
+                command = reader.gets()
+            try:
+                connection.sendall(b"".join(out))
+            except OSError:
+                return
@@ -1,6 +1,21 @@
 # flake8: noqa F401
-from reddish._core.command import Args as Args, Command as Command
+from reddish._core.command import (
+    Args as Args,
+    Command as Command,
+    CommandTemplate as CommandTemplate,
+)
 from reddish._core.multiexec import MultiExec as MultiExec
+from reddish._core.cache import ClientSideCache as ClientSideCache
+from reddish._core.pubsub import Message as Message
+from reddish._core.script import Library as Library, Script as Script
+from reddish._core.instrumentation import (
+    BatchStats as BatchStats,
+    Histogram as Histogram,
+    Instrumentation as Instrumentation,
+    LatencyRecorder as LatencyRecorder,
+    prometheus_text as prometheus_text,
+)
+from reddish._core.command_info import command_table as command_table
 import reddish._core.errors as errors
 import reddish.clients as clients
 import reddish.models as models
@@ -1,2 +1,5 @@
-from .command import Args, Command  # noqa
+from .command import Args, Command, CommandTemplate  # noqa
 from .multiexec import MultiExec  # noqa
+from .cache import ClientSideCache  # noqa
+from .script import Library, Script  # noqa
+from .instrumentation import Instrumentation, LatencyRecorder, prometheus_text  # noqa
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Any, List, Optional, Sequence
+
+from outcome import Error, Outcome, Value
+
+from .errors import ConnectionError, PipelineError
+from .supported_commands import check_for_unsupported_commands
+from .utils import ZERO_COPY, partition
+
+
+class PendingRequest:
+    """Commands of a single caller waiting to be sent as part of a shared pipeline."""
+
+    def __init__(self, commands: Sequence[Any]):
+        self.commands = commands
+        self.outcome: Optional[Outcome] = None
+
+    @property
+    def done(self) -> bool:
+        return self.outcome is not None
+
+    def unwrap(self) -> Any:
+        assert self.outcome is not None, "request has not been executed yet"
+        return self.outcome.unwrap()
+
+
+class Batch:
+    """Requests of concurrent callers that are executed as one pipeline."""
+
+    def __init__(self, requests: List[PendingRequest]):
+        self._requests = requests
+        self.commands = tuple(
+            chain.from_iterable(request.commands for request in requests)
+        )
+
+    def resolve(self, outcomes: Sequence[Outcome]) -> None:
+        """Hand every request the outcomes of its own commands."""
+        lengths = (len(request.commands) for request in self._requests)
+        for request, request_outcomes in zip(
+            self._requests, partition(outcomes, lengths)
+        ):
+            if any(isinstance(outcome, Error) for outcome in request_outcomes):
+                request.outcome = Error(PipelineError(request_outcomes))
+            else:
+                request.outcome = Value(
+                    [outcome.unwrap() for outcome in request_outcomes]
+                )
+
+    def resolve_replies(self, replies: Sequence[Any]) -> None:
+        self.resolve([Value(reply) for reply in replies])
+
+    def fail(self) -> None:
+        """Fail all requests because the connection broke while executing them."""
+        for request in self._requests:
+            request.outcome = Error(ConnectionError())
+
+
+class AutoPipeline:
+    """Collects commands of concurrent callers so they can share a single round trip.
+
+    The first caller to acquire the connection becomes the leader which takes all
+    requests collected so far, executes them as one pipeline and distributes the
+    replies. Callers queued up behind the leader find their request completed
+    once it is their turn.
+    """
+
+    def __init__(self) -> None:
+        self._pending: List[PendingRequest] = []
+
+    def add(self, commands: Sequence[Any]) -> PendingRequest:
+        # reject unsupported commands and ones that can't be encoded upfront so
+        # they can't fail the shared batch
+        for command in commands:
+            check_for_unsupported_commands(command)
+            if getattr(command, "_encoded", None) is ZERO_COPY:
+                command._segments()  # buffers are passed on without copying them
+            else:
+                bytes(command)  # kept for sending, see `Command.__bytes__`
+        request = PendingRequest(commands)
+        self._pending.append(request)
+        return request
+
+    def discard(self, request: PendingRequest) -> None:
+        try:
+            self._pending.remove(request)
+        except ValueError:
+            pass  # already taken as part of a batch
+
+    def take(self) -> Batch:
+        requests, self._pending = self._pending, []
+        return Batch(requests)
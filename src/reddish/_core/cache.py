@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import hiredis
+
+from .command import Command, ZERO_COPY
+
+MISS = object()
+
+# read-only commands whose replies only depend on the keys they read, the
+# positions of their keys come from the command table
+CACHEABLE_COMMANDS = frozenset(
+    """
+    GET GETRANGE STRLEN MGET EXISTS HGET HMGET HGETALL HKEYS HVALS HLEN HEXISTS
+    HSTRLEN LINDEX LLEN LRANGE SCARD SISMEMBER SMISMEMBER SMEMBERS ZCARD ZRANGE
+    ZRANK ZSCORE ZMSCORE
+    """.split()
+)
+
+
+def _to_bytes(part) -> bytes:
+    if isinstance(part, bytes):
+        return part
+    elif isinstance(part, str):
+        return part.encode()
+    else:
+        return str(part).encode()
+
+
+def cached_keys(command) -> Optional[Tuple[bytes, ...]]:
+    """Keys read by a cacheable command or `None` if it can't be cached."""
+    if not isinstance(command, Command):
+        return None
+    info = command._info
+    if info is None or info.name not in CACHEABLE_COMMANDS:
+        return None
+    if command._encoded is ZERO_COPY:  # buffers may change after caching
+        return None
+    keys = info.keys(command._flat_parts())
+    return tuple(_to_bytes(key) for key in keys) or None
+
+
+def _sizeof(reply) -> int:
+    if isinstance(reply, (bytes, str)):
+        return len(reply)
+    elif isinstance(reply, list):
+        return 8 * len(reply) + sum(_sizeof(item) for item in reply)
+    elif isinstance(reply, dict):
+        return 16 * len(reply) + sum(
+            _sizeof(key) + _sizeof(value) for key, value in reply.items()
+        )
+    else:
+        return 8
+
+
+class _Entry:
+    def __init__(
+        self,
+        reply: Any,
+        keys: Tuple[bytes, ...],
+        size: int,
+        expires: float,
+        owner: object,
+    ):
+        self.reply = reply
+        self.keys = keys
+        self.size = size
+        self.expires = expires
+        self.owner = owner  # the connection redis sends invalidations of the keys to
+
+
+class ClientSideCache:
+    """Local cache for replies of read-only commands kept up to date by redis.
+
+    Connections using the cache have redis track the keys they read and drop
+    entries once redis reports that their keys changed. An entry is only served
+    to the connection that read it, as only that connection is told about
+    changes, and clients handle pending invalidations before serving entries.
+    The `ttl` bounds how long an entry can be served without hearing from redis
+    e.g. while an invalidation is still on its way.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = 60.0,
+    ):
+        """Create a cache shared by any number of connections.
+
+        Args:
+            max_entries: maximum number of cached replies.
+            max_bytes: approximate upper limit for the memory used by cached replies.
+            ttl: seconds after which entries expire or `None` to keep them until
+                they are invalidated or evicted which risks serving stale replies
+                for as long as invalidations don't arrive.
+        """
+        if getattr(hiredis, "PushNotification", None) is None:
+            raise RuntimeError("Client side caching requires 'hiredis>=3.0.0'")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()  # least recent first
+        self._entries_by_key: Dict[bytes, Set[bytes]] = {}
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory used by cached replies in bytes."""
+        return self._size
+
+    def get(self, command, owner: object = None) -> Any:
+        """Cached reply for `command` read by the connection `owner` or `MISS`."""
+        cache_key = bytes(command)
+        entry = self._entries.get(cache_key)
+        if entry is None or entry.owner is not owner:
+            self.misses += 1
+            return MISS
+        if entry.expires < time.monotonic():
+            self._remove(cache_key)
+            self.misses += 1
+            return MISS
+        self._entries.move_to_end(cache_key)
+        self.hits += 1
+        return entry.reply
+
+    def set(
+        self, command, keys: Tuple[bytes, ...], reply: Any, owner: object = None
+    ) -> None:
+        if isinstance(reply, hiredis.ReplyError):
+            return
+        cache_key = bytes(command)
+        size = len(cache_key) + _sizeof(reply)
+        if size > self._max_bytes:
+            return
+        if cache_key in self._entries:
+            self._remove(cache_key)
+
+        expires = float("inf") if self._ttl is None else time.monotonic() + self._ttl
+        self._entries[cache_key] = _Entry(reply, keys, size, expires, owner)
+        self._size += size
+        for key in keys:
+            self._entries_by_key.setdefault(key, set()).add(cache_key)
+
+        while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, keys: Optional[Iterable[bytes]]) -> None:
+        """Drop entries that read any of `keys` or all entries if `keys` is `None`."""
+        if keys is None:
+            self.invalidations += len(self._entries)
+            self.clear()
+            return
+        for key in keys:
+            for cache_key in self._entries_by_key.pop(key, ()):
+                if cache_key in self._entries:
+                    self._remove(cache_key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._entries_by_key.clear()
+        self._size = 0
+
+    def _remove(self, cache_key: bytes) -> None:
+        entry = self._entries.pop(cache_key)
+        self._size -= entry.size
+        for key in entry.keys:
+            cache_keys = self._entries_by_key.get(key)
+            if cache_keys is not None:
+                cache_keys.discard(cache_key)
+                if not cache_keys:
+                    del self._entries_by_key[key]
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from outcome import Error, Outcome
+
+from .command import Command
+from .errors import CommandError, ConnectionError, PipelineError
+from .multiexec import MultiExec
+from .utils import as_dict, to_str
+
+Address = Tuple[str, int]
+CommandType = Union[Command, MultiExec]
+
+NUM_SLOTS = 16384
+
+
+def _crc16_table() -> List[int]:
+    # CRC16-CCITT (XMODEM) as used by redis cluster
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data: bytes) -> int:
+    crc = 0
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def _to_bytes(part) -> bytes:
+    if isinstance(part, bytes):
+        return part
+    elif isinstance(part, str):
+        return part.encode()
+    elif isinstance(part, memoryview):
+        return part.tobytes()
+    else:
+        return str(part).encode()
+
+
+def key_slot(key: Union[str, bytes, int, float]) -> int:
+    """Hash slot of a key taking `{hashtags}` into account."""
+    key = _to_bytes(key)
+    _, brace, rest = key.partition(b"{")
+    hashtag, closed, _ = rest.partition(b"}")
+    if brace and closed and hashtag:  # only non-empty hashtags count
+        key = hashtag
+    return crc16(key) % NUM_SLOTS
+
+
+def first_key(command: CommandType) -> Optional[Any]:
+    """The first key accessed by a command or `None` if it doesn't access keys."""
+    if isinstance(command, MultiExec):
+        for sub_command in command:
+            key = first_key(sub_command)
+            if key is not None:
+                return key
+        return None
+
+    keys = command.keys()
+    if keys is None:  # unknown e.g. a module's command, assume a key comes first
+        parts = command._flat_parts()
+        return parts[1] if len(parts) > 1 else None
+    return keys[0] if keys else None
+
+
+def command_slot(command: CommandType) -> Optional[int]:
+    """Hash slot a command has to be sent to or `None` if any node will do."""
+    key = first_key(command)
+    return None if key is None else key_slot(key)
+
+
+class SlotMap:
+    """Maps hash slots to the address of the primary node serving them."""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int, Address]] = ()):
+        """Create slot map from `(first slot, last slot, address)` ranges."""
+        self._nodes: List[Address] = []
+        self._slots: List[Optional[int]] = [None] * NUM_SLOTS  # index into nodes
+        for first, last, address in ranges:
+            self.assign(first, last, address)
+
+    @classmethod
+    def from_shards(cls, shards) -> SlotMap:
+        """Build a slot map from the reply to `CLUSTER SHARDS`."""
+        ranges = []
+        for shard in shards:
+            shard = as_dict(shard)
+            shard = {to_str(key): value for key, value in shard.items()}
+            primaries = []
+            for node in shard["nodes"]:
+                node = {to_str(key): value for key, value in as_dict(node).items()}
+                if to_str(node.get("role")) != "master":
+                    continue
+                if to_str(node.get("health", b"online")) != "online":
+                    continue
+                host = node.get("endpoint") or node.get("ip")
+                if host is None or to_str(host) == "?":
+                    host = node.get("ip")
+                port = node.get("port") or node.get("tls-port")
+                primaries.append((to_str(host), int(port)))
+            if not primaries:
+                continue
+            slots = [int(slot) for slot in shard["slots"]]
+            for first, last in zip(slots[::2], slots[1::2]):
+                ranges.append((first, last, primaries[0]))
+        return cls(ranges)
+
+    def assign(self, first: int, last: int, address: Address) -> None:
+        try:
+            index = self._nodes.index(address)
+        except ValueError:
+            index = len(self._nodes)
+            self._nodes.append(address)
+        slots = self._slots
+        for slot in range(first, last + 1):
+            slots[slot] = index
+
+    @property
+    def nodes(self) -> List[Address]:
+        return list(self._nodes)
+
+    def node_for_slot(self, slot: Optional[int]) -> Optional[Address]:
+        """Address of the node serving `slot`, any node for `None`."""
+        if slot is None:
+            return random.choice(self._nodes) if self._nodes else None
+        index = self._slots[slot]
+        return None if index is None else self._nodes[index]
+
+
+class Redirect:
+    def __init__(self, slot: int, address: Address, ask: bool):
+        self.slot = slot
+        self.address = address
+        self.ask = ask
+
+
+def parse_redirect(outcome: Outcome) -> Optional[Redirect]:
+    """The redirect an outcome's error asks for or `None`."""
+    if not isinstance(outcome, Error):
+        return None
+    error = outcome.error
+    if isinstance(error, CommandError) and error.code == "EXECABORT":
+        error = error.__cause__  # the transaction was redirected as a whole
+    if not isinstance(error, CommandError) or error.code not in ("MOVED", "ASK"):
+        return None
+    slot, address = error.message.split()
+    host, _, port = address.rpartition(":")
+    return Redirect(int(slot), (host, int(port)), error.code == "ASK")
+
+
+ASKING = Command("ASKING")
+
+
+class ClusterPipeline:
+    """Splits a batch of commands into pipelines per node and reassembles them.
+
+    Each round `requests` returns the pipelines to execute concurrently. Their
+    outcomes are handed back with `feed`. Commands redirected by `MOVED` or `ASK`
+    are retried in the next round until `done` or `max_redirects` is reached.
+    """
+
+    def __init__(
+        self,
+        slot_map: SlotMap,
+        commands: Sequence[CommandType],
+        max_redirects: int = 5,
+    ):
+        self._slot_map = slot_map
+        self._commands = commands
+        self._outcomes: List[Optional[Outcome]] = [None] * len(commands)
+        self._max_redirects = max_redirects
+        self._round = 0
+        self.moved = False  # the slot map is outdated and needs to be refreshed
+
+        # indices of commands by node with whether to send `ASKING` first
+        self._pending: Dict[Address, List[Tuple[int, bool]]] = {}
+        self._sent: Dict[Address, List[Tuple[int, bool]]] = {}
+        for index, command in enumerate(commands):
+            slot = command_slot(command)
+            address = slot_map.node_for_slot(slot)
+            if address is None:
+                error = ConnectionError(f"No cluster node serves slot {slot}.")
+                self._outcomes[index] = Error(error)
+            else:
+                self._pending.setdefault(address, []).append((index, False))
+
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    def requests(self) -> Dict[Address, List[CommandType]]:
+        """Pipelines to be executed concurrently on the nodes in this round."""
+        self._round += 1
+        self._sent, self._pending = self._pending, {}
+        requests = {}
+        for address, entries in self._sent.items():
+            commands = []
+            for index, asking in entries:
+                if asking:
+                    commands.append(ASKING)
+                commands.append(self._commands[index])
+            requests[address] = commands
+        return requests
+
+    def feed(self, address: Address, outcomes: Sequence[Outcome]) -> None:
+        """Hand over the outcomes of the pipeline executed on `address`."""
+        outcomes = iter(outcomes)
+        for index, asking in self._sent[address]:
+            if asking:
+                next(outcomes)  # reply to `ASKING`
+            outcome = next(outcomes)
+            redirect = parse_redirect(outcome)
+            if redirect is None or self._round > self._max_redirects:
+                self._outcomes[index] = outcome
+            elif not redirect.ask:
+                self.moved = True
+                self._slot_map.assign(redirect.slot, redirect.slot, redirect.address)
+                self._pending.setdefault(redirect.address, []).append((index, False))
+            elif isinstance(self._commands[index], MultiExec):
+                # `ASKING` only applies to the next command, not a whole transaction
+                self._outcomes[index] = outcome
+            else:
+                self._pending.setdefault(redirect.address, []).append((index, True))
+
+    def fail(self, address: Address, error: BaseException) -> None:
+        """Fail the commands sent to `address` e.g. because its connection broke."""
+        for index, _ in self._sent[address]:
+            self._outcomes[index] = Error(error)
+
+    @property
+    def outcomes(self) -> List[Outcome]:
+        assert self.done, "commands have not been executed yet"
+        return self._outcomes  # type: ignore
+
+    def replies(self) -> List[Any]:
+        outcomes = tuple(self.outcomes)
+        if any(isinstance(outcome, Error) for outcome in outcomes):
+            raise PipelineError(outcomes)
+        return [outcome.unwrap() for outcome in outcomes]
@@ -2,39 +2,117 @@ from __future__ import annotations
 from collections.abc import Mapping
 from itertools import chain
 from copy import copy
+from functools import lru_cache
 
 from hiredis import ReplyError, pack_command
 
 from .parser import parse
-from .utils import strip_whitespace
-from .templating import apply_template
-from .errors import CommandError
+from .utils import ZERO_COPY, strip_whitespace
+from .templating import compile_template
+from .errors import CommandError, UnsupportedCommandError
+from .supported_commands import command_support
+from .command_info import command_table
 from typing import TypeVar, Generic
 
 
 T = TypeVar("T")
 
 
+_ARG_TYPES = (int, float, str, bytes)
+# formats of buffers holding raw bytes rather than e.g. numbers of a NumPy array
+_BYTE_FORMATS = ("B", "b", "c")
+
+
+def _buffer(part):
+    # a flat view of byte buffers e.g. `bytearray` or `mmap` or `None` for others
+    try:
+        view = memoryview(part)
+    except TypeError:
+        return None
+    if view.format not in _BYTE_FORMATS:
+        return None  # sending e.g. numbers as raw memory would corrupt them
+    if not view.c_contiguous:
+        raise ValueError(f"'{repr(part)}' is not a contiguous buffer")
+    return view if view.ndim == 1 and view.format == "B" else view.cast("B")
+
+
+_PREVIEW_BYTES = 64  # of buffers in a repr
+
+
+def _repr_part(part):
+    # buffers show their bytes, which `memoryview` itself does not
+    if type(part) is not memoryview:
+        return repr(part)
+    if part.nbytes <= _PREVIEW_BYTES:
+        return repr(part.tobytes())
+    return f"{repr(part[:_PREVIEW_BYTES].tobytes())}...({part.nbytes} bytes)"
+
+
+def _validated(part):
+    if isinstance(part, _ARG_TYPES):
+        return part
+    view = _buffer(part)
+    if view is None:
+        raise ValueError(f"''{repr(part)} is not a valid argument")
+    return view
+
+
 class Args:
     """Container for data to be inlined into a `Command`."""
 
+    __slots__ = ("_parts", "_zero_copy")
+
     def __init__(self, iterable):
         """Inline data to from an iterable collection such as list, tuple etc.
 
         Args:
-            iterable: collection of data to be inlined
+            iterable: collection of data to be inlined. Besides `int`, `float`,
+                `str` and `bytes` items may be buffers of bytes e.g. `bytearray`,
+                `memoryview` or `mmap` which are sent without copying them.
         """
-        self._parts = []
-        for part in iterable:
-            if not isinstance(part, (int, float, str, bytes)):
-                raise ValueError(f"''{repr(part)} is not a valid argument")
-            self._parts.append(part)
+        parts = tuple(iterable)
+        self._zero_copy = False
+        for part in parts:
+            if type(part) not in _ARG_TYPES and not isinstance(part, _ARG_TYPES):
+                parts = tuple(_validated(part) for part in parts)
+                self._zero_copy = any(type(part) is memoryview for part in parts)
+                break
+        self._parts = parts
+
+    @classmethod
+    def from_sequence(cls, values):
+        """Inline a sequence of values of a single type validating them at once.
+
+        Args:
+            values: a list or tuple of `int`, `float`, `str` or `bytes` all of the
+                same type, an `array.array` or a one dimensional NumPy array of
+                numbers, bytes or strings.
+        """
+        dtype = getattr(values, "dtype", None)
+        if dtype is not None:  # e.g. NumPy arrays of ids
+            if dtype.kind not in "iufSU" or getattr(values, "ndim", 1) != 1:
+                raise ValueError(f"Arrays of '{dtype}' are not valid arguments")
+            parts = tuple(values.tolist())
+        elif getattr(values, "typecode", "u") != "u":  # `array.array` of numbers
+            parts = tuple(values.tolist())
+        else:
+            parts = tuple(values)
+            types = set(map(type, parts))
+            if len(types) > 1 or not types <= set(_ARG_TYPES):
+                return cls(parts)  # validated one by one
+        new = cls.__new__(cls)
+        new._parts = parts
+        new._zero_copy = False
+        return new
 
     def __iter__(self):
-        yield from self._parts
+        return iter(self._parts)
+
+    def __len__(self):
+        return len(self._parts)
 
     def __repr__(self):
-        return f"{self.__class__.__name__}([{', '.join(repr(part) for part in self._parts)}])"
+        return f"{self.__class__.__name__}([{', '.join(_repr_part(part) for part in self._parts)}])"
 
     @classmethod
     def from_dict(cls, mapping):
@@ -48,9 +126,84 @@ class Args:
         return cls(chain.from_iterable(mapping.items()))
 
 
+class CommandTemplate(Generic[T]):  # must inherit from Generic[T] to be subscribable
+    """A template for creating many commands without parsing it again."""
+
+    __slots__ = ("_compiled", "_supported", "_info", "_models")
+
+    def __init__(self, template):
+        """Compile a template string for repeated use.
+
+        Args:
+            template: A template string for the command that may contain
+                positional and keyword fields.
+        """
+        self._compiled, self._supported, self._info = _compile(template)
+        if self._supported is False:
+            raise UnsupportedCommandError(
+                f"'{self._compiled.command_name}' is not supported."
+            )
+        self._models: tuple[type, ...] = ()
+
+    def into(self, model):
+        """Create a new template for commands with a type for parsing a response.
+
+        Args:
+            model: type for the reponse to be parsed into
+
+        Returns:
+            A copy of the original template with the type for reponse parsing added
+        """
+        new = copy(self)
+        new._models = (*self._models, model)
+        return new
+
+    def __call__(self, *args, **kwargs):
+        """Create a command by filling the template's fields with data.
+
+        Args:
+            *args: Positional fields
+            **kwargs: Keyword fields
+        """
+        command = Command._from_template(
+            self._compiled, self._supported, self._info, args, kwargs
+        )
+        command._models = self._models
+        return command
+
+    def __repr__(self):
+        return f"Command.template({repr(self._compiled.format_string)})"
+
+
+@lru_cache(maxsize=1024)
+def _compile(template):
+    compiled = compile_template(strip_whitespace(template))
+    if not compiled.num_parts:
+        raise ValueError("An empty template string is not a valid command")
+    name = compiled.command_name
+    # whether the command can be sent is settled once per template if possible
+    supported = command_support(name) if name is not None else None
+    # and so is the info about the command unless it depends on a field
+    info = command_table.lookup(name, compiled.subcommand_name)
+    if info is not None and info.subcommands and 1 in compiled.field_indices:
+        info = None
+    return compiled, supported, info
+
+
 class Command(Generic[T]):  # must inherit from Generic[T] to be subscribable at runtime
     """A redis command that can be executed against redis"""
 
+    # a large pipeline holds many commands so they keep as little state as possible
+    __slots__ = (
+        "_template",
+        "_parts",
+        "_unused",
+        "_supported",
+        "_info",
+        "_models",
+        "_encoded",
+    )
+
     def __init__(self, template, *args, **kwargs):
         """Create redis command from template and data.
 
@@ -60,26 +213,59 @@ class Command(Generic[T]):  # must inherit from Generic[T] to be subscribable at
             *args: Positional fields
             **kwargs: Keyword fields
         """
-        normalized_template = strip_whitespace(template)
-        self._parts = apply_template(normalized_template, *args, **kwargs)
+        compiled, supported, info = _compile(template)
+        self._init(compiled, supported, info, args, kwargs)
 
-        for part in self._parts:
-            if not isinstance(part, (int, float, str, bytes, Args)):
-                raise ValueError(f"'{repr(part)}' is not valid as part of a command")
+    @classmethod
+    def template(cls, template):
+        """Compile a template string once for creating many commands from it.
+
+        Args:
+            template: A template string for the command that may contain
+                positional and keyword fields.
 
-        try:
-            self._command_name = self._parts[0]
-        except IndexError:
-            raise ValueError("An empty template string is not a valid command")
+        Returns:
+            A `CommandTemplate` that creates a command when called with data.
+        """
+        return CommandTemplate(template)
 
-        args_and_kwargs = (
-            [repr(normalized_template)]
-            + [repr(arg) for arg in args]
-            + ["{}={}".format(key, repr(value)) for key, value in kwargs.items()]
-        )
-        self._repr = f"{self.__class__.__name__}({', '.join(args_and_kwargs)})"
+    @classmethod
+    def _from_template(cls, compiled, supported, info, args, kwargs):
+        new = cls.__new__(cls)
+        new._init(compiled, supported, info, args, kwargs)
+        return new
+
+    def _init(self, compiled, supported, info, args, kwargs):
+        parts = compiled.apply(args, kwargs)
+        encoded = None  # see `__bytes__`
+        for index in compiled.field_indices:
+            part = parts[index]
+            if isinstance(part, _ARG_TYPES):
+                continue
+            if isinstance(part, Args):
+                if part._zero_copy:
+                    encoded = ZERO_COPY
+                continue
+            view = _buffer(part)
+            if view is None:
+                raise ValueError(f"'{repr(part)}' is not valid as part of a command")
+            parts = (*parts[:index], view, *parts[index + 1 :])  # noqa: E203
+            encoded = ZERO_COPY
 
+        self._template = compiled
+        self._parts = parts
+        # arguments without a field are not sent but kept for `__repr__`
+        self._unused = compiled.unused_arguments(args, kwargs)
+        self._supported = supported
+        if info is None:
+            info = command_table.lookup(parts[0], parts[1] if len(parts) > 1 else None)
+        self._info = info
         self._models: tuple[type, ...] = ()
+        self._encoded = encoded
+
+    @property
+    def _command_name(self):
+        return self._parts[0]
 
     def into(self, model):
         """Create a new command with a type for parsing a response.
@@ -94,6 +280,34 @@ class Command(Generic[T]):  # must inherit from Generic[T] to be subscribable at
         new._models = (*self._models, model)
         return new
 
+    @property
+    def info(self):
+        """What redis reports about the command or `None` for unknown commands."""
+        return self._info
+
+    def keys(self):
+        """The keys the command accesses or `None` if that is unknown.
+
+        Returns:
+            The keys in the order they appear in the command, or `None` for
+            commands that are not in the command table.
+        """
+        info = self._info
+        if info is None:
+            return None
+        if not info.key_specs:
+            return ()
+        return tuple(info.keys(self._flat_parts()))
+
+    def _flat_parts(self):
+        parts = []
+        for part in self._parts:
+            if isinstance(part, Args):
+                parts.extend(part)
+            else:
+                parts.append(part)
+        return parts
+
     def _parse_response(self, response):
         if isinstance(response, ReplyError):
             raise CommandError(str(response)) from None
@@ -110,9 +324,37 @@ class Command(Generic[T]):  # must inherit from Generic[T] to be subscribable at
         return 1
 
     def __repr__(self):
-        return self._repr
+        args, kwargs = self._template.arguments(self._parts)
+        if self._unused is not None:
+            unused_args, unused_kwargs = self._unused
+            args = [*args, *unused_args]
+            kwargs = {**kwargs, **unused_kwargs}
+        args_and_kwargs = (
+            [repr(self._template.format_string)]
+            + [_repr_part(arg) for arg in args]
+            + ["{}={}".format(key, _repr_part(value)) for key, value in kwargs.items()]
+        )
+        return f"{self.__class__.__name__}({', '.join(args_and_kwargs)})"
 
-    def __bytes__(self):
+    def _segments(self):
+        """The encoded command in pieces that keep buffers as they are."""
+        parts = self._flat_parts()
+        segments = [b"*%d\r\n" % len(parts)]
+        run = []  # parts that are not buffers encoded together
+        for part in parts:
+            if type(part) is memoryview:
+                if run:
+                    segments.append(_without_header(pack_command(tuple(run))))
+                    run = []
+                segments += (b"$%d\r\n" % part.nbytes, part, b"\r\n")
+            else:
+                run.append(part)
+        if run:
+            segments.append(_without_header(pack_command(tuple(run))))
+        return segments
+
+    def _encode(self):
+        """The RESP encoding of the command without keeping it."""
         parts = []
         for part in self._parts:
             if isinstance(part, Args):
@@ -121,3 +363,17 @@ class Command(Generic[T]):  # must inherit from Generic[T] to be subscribable at
             else:
                 parts.append(part)
         return pack_command(tuple(parts))
+
+    def __bytes__(self):
+        encoded = self._encoded
+        if encoded is ZERO_COPY:
+            # buffers may change so commands holding them are encoded every time
+            return b"".join(self._segments())
+        if encoded is None:
+            encoded = self._encoded = self._encode()
+        return encoded
+
+
+def _without_header(encoded: bytes) -> bytes:
+    # the arguments of an encoded command without its `*<count>` header
+    return encoded[encoded.index(b"\r\n") + 2 :]  # noqa: E203
@@ -1,6 +1,17 @@
-from typing import Generic, TypeVar, overload, Type, Any, Iterable, Iterator, Mapping
+from typing import (
+    Generic,
+    TypeVar,
+    overload,
+    Type,
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from typing_extensions import Buffer
 
-AtomicType = int | float | str | bytes
+AtomicType = int | float | str | bytes | Buffer
 
 class Args:
     def __init__(self, iterable: Iterable[AtomicType]) -> None: ...
@@ -8,14 +19,29 @@ class Args:
     def __repr__(self) -> str: ...
     @classmethod
     def from_dict(cls, mapping: Mapping[AtomicType, AtomicType]) -> Args: ...
+    @classmethod
+    def from_sequence(cls, values: Sequence[AtomicType] | Any) -> Args: ...
 
 C = TypeVar("C", covariant=True)
 T = TypeVar("T")
 
+class CommandTemplate(Generic[C]):
+    def __init__(self, cmd: str) -> None: ...
+    def __call__(
+        self, *args: AtomicType | Args, **kwargs: AtomicType | Args
+    ) -> Command[C]: ...
+    @overload
+    def into(self: "CommandTemplate[C]", type: Type[T]) -> "CommandTemplate[T]": ...
+    @overload
+    def into(self: "CommandTemplate[C]", type: None) -> "CommandTemplate[None]": ...
+    def __repr__(self) -> str: ...
+
 class Command(Generic[C]):
     def __init__(
         self, cmd: str, *args: AtomicType | Args, **kwargs: AtomicType | Args
     ) -> None: ...
+    @classmethod
+    def template(cls, cmd: str) -> CommandTemplate[Any]: ...
     @overload
     def into(self: "Command[C]", type: Type[T]) -> "Command[T]": ...
     @overload
@@ -0,0 +1,309 @@
+"""What reddish knows about redis commands: their flags and where their keys are.
+
+The bundled table in `command_table.py` is generated from the reply to `COMMAND`
+and can be regenerated against a running server with
+
+    python -m reddish._core.command_info [host] [port] > command_table.py
+
+A `CommandTable` can also be updated at runtime from a live server for commands
+of modules or newer redis versions:
+
+    command_table.update(redis.execute(Command("COMMAND")))
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .command_table import COMMANDS
+from .utils import as_dict, to_str
+
+# A key spec is `(begin search, find keys, a, b, c)` like in `COMMAND INFO`:
+# the search for keys begins at an index or after a `(keyword, start from)`
+# and finds keys either in a range `("range", last key, key step, limit)` or
+# after a number of keys argument `("keynum", key num index, first key, key step)`
+KeySpec = Tuple[Union[int, Tuple[str, int]], str, int, int, int]
+
+
+class CommandInfo:
+    """Flags and key specs of a redis command as reported by `COMMAND INFO`."""
+
+    __slots__ = (
+        "name",
+        "arity",
+        "flags",
+        "key_specs",
+        "subcommands",
+        "readonly",
+        "write",
+        "blocking",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        arity: int = 0,
+        flags: Iterable[str] = (),
+        key_specs: Sequence[KeySpec] = (),
+        subcommands: Optional[Dict[str, CommandInfo]] = None,
+    ):
+        self.name = name
+        self.arity = arity
+        self.flags = frozenset(flags)
+        self.key_specs = tuple(key_specs)
+        self.subcommands = subcommands or {}
+        # flags looked up per command are settled once
+        self.readonly = "readonly" in self.flags
+        self.write = "write" in self.flags
+        self.blocking = "blocking" in self.flags
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
+
+    def _replace_with(self, other: CommandInfo) -> None:
+        # update in place so commands already pointing at this info see the update
+        for attribute in self.__slots__:
+            if attribute != "subcommands":
+                setattr(self, attribute, getattr(other, attribute))
+        _merge(self.subcommands, other.subcommands)
+
+    def keys(self, argv: Sequence[Any]) -> List[Any]:
+        """The keys in the arguments of a command including its name."""
+        if len(self.key_specs) == 1:
+            return _find_keys(self.key_specs[0], argv)
+        keys = []
+        for spec in self.key_specs:
+            keys.extend(_find_keys(spec, argv))
+        return keys
+
+
+def _upper(part) -> Optional[str]:
+    if isinstance(part, str):
+        return part.upper()
+    elif isinstance(part, bytes):
+        return part.decode(errors="replace").upper()
+    return None
+
+
+def _find_keys(spec: KeySpec, argv: Sequence[Any]) -> List[Any]:
+    # mirrors how redis itself applies key specs in `getKeysUsingKeySpecs`
+    begin, find, a, b, c = spec
+    argc = len(argv)
+    if isinstance(begin, int):
+        start = begin
+    else:
+        keyword, start_from = begin
+        if start_from >= 0:
+            positions: Iterable[int] = range(start_from, argc)
+        else:
+            positions = range(argc + start_from, 0, -1)
+        for position in positions:
+            if _upper(argv[position]) == keyword:
+                start = position + 1
+                break
+        else:
+            return []
+    if start >= argc:
+        return []
+
+    if find == "range":
+        last_key, step, limit = a, b, c
+        if last_key >= 0:
+            last = start + last_key
+        elif limit <= 1:
+            last = argc + last_key
+        else:  # e.g. the streams of `XREAD` are followed by as many ids
+            last = start + (argc - start) // limit + last_key
+        return list(argv[start : last + 1 : step])  # noqa: E203
+    else:
+        num_keys_index, first_key, step = a, b, c
+        try:
+            num_keys = int(argv[start + num_keys_index])
+        except (IndexError, ValueError):
+            return []
+        first = start + first_key
+        return list(argv[first : first + num_keys * step : step])  # noqa: E203
+
+
+def _merge(commands: Dict[str, CommandInfo], updates: Dict[str, CommandInfo]):
+    for name, info in updates.items():
+        if name in commands:
+            commands[name]._replace_with(info)
+        else:
+            commands[name] = info
+
+
+class CommandTable:
+    """Command infos by name for looking them up when creating commands."""
+
+    def __init__(self, infos: Iterable[CommandInfo] = ()):
+        self._commands: Dict[str, CommandInfo] = {info.name: info for info in infos}
+
+    @classmethod
+    def from_table(cls, table: Dict[str, tuple]) -> CommandTable:
+        """Create from a table in the format of the generated `command_table.py`."""
+        return cls(_from_entry(name, entry) for name, entry in table.items())
+
+    @classmethod
+    def from_reply(cls, reply) -> CommandTable:
+        """Create from the reply to `COMMAND` or `COMMAND INFO`."""
+        return cls(_parse_command_info(entry) for entry in reply if entry is not None)
+
+    def update(self, reply) -> None:
+        """Add or update commands from the reply to `COMMAND` or `COMMAND INFO`.
+
+        Commands created before keep seeing the updated info.
+        """
+        _merge(self._commands, CommandTable.from_reply(reply)._commands)
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __iter__(self):
+        return iter(self._commands.values())
+
+    def __contains__(self, name):
+        return name.upper() in self._commands
+
+    def __getitem__(self, name: str) -> CommandInfo:
+        return self._commands[name.upper()]
+
+    def lookup(self, name, subcommand=None) -> Optional[CommandInfo]:
+        """Info about a command and its subcommand or `None` for unknown commands."""
+        if isinstance(name, str):
+            info = self._commands.get(name.upper())
+        elif isinstance(name, bytes):
+            info = self._commands.get(name.decode(errors="replace").upper())
+        else:
+            return None
+        if info is None or not info.subcommands:
+            return info
+        subcommand = _upper(subcommand)
+        if subcommand is None:
+            return info
+        return info.subcommands.get(f"{info.name}|{subcommand}", info)
+
+
+def _from_entry(name: str, entry: tuple) -> CommandInfo:
+    arity, flags, key_specs, *subcommands = entry
+    return CommandInfo(
+        name,
+        arity,
+        flags.split(),
+        key_specs,
+        {
+            sub_name: _from_entry(sub_name, sub_entry)
+            for sub_name, sub_entry in (subcommands[0] if subcommands else {}).items()
+        },
+    )
+
+
+def _fields(value) -> Dict[str, Any]:
+    return {to_str(key): item for key, item in as_dict(value).items()}
+
+
+def _parse_key_spec(spec) -> Optional[KeySpec]:
+    spec = _fields(spec)
+    begin, find = _fields(spec["begin_search"]), _fields(spec["find_keys"])
+    begin_args, find_args = _fields(begin["spec"]), _fields(find["spec"])
+
+    begin_type = to_str(begin["type"])
+    if begin_type == "index":
+        begin_search: Union[int, Tuple[str, int]] = int(begin_args["index"])
+    elif begin_type == "keyword":
+        keyword = to_str(begin_args["keyword"]).upper()
+        begin_search = (keyword, int(begin_args["startfrom"]))
+    else:
+        return None  # keys can't be found from the spec alone
+
+    find_type = to_str(find["type"])
+    if find_type == "range":
+        fields = ("lastkey", "keystep", "limit")
+    elif find_type == "keynum":
+        fields = ("keynumidx", "firstkey", "keystep")
+    else:
+        return None
+    a, b, c = (int(find_args[field]) for field in fields)
+    return (begin_search, find_type, a, b, c)
+
+
+def _parse_command_info(entry) -> CommandInfo:
+    name, arity, flags, first, last, step, *rest = entry
+    name = to_str(name).upper()
+    flags = [to_str(flag).lower() for flag in flags]
+
+    if len(rest) >= 3:  # redis 7 and later report key specs and subcommands
+        _, _, specs, *subcommands = rest
+        key_specs = [_parse_key_spec(spec) for spec in specs]
+        subcommand_infos = [
+            _parse_command_info(sub) for sub in (subcommands[0] if subcommands else ())
+        ]
+    else:  # older versions only report the first key, last key and step
+        first, last, step = int(first), int(last), int(step)
+        last_key = last - first if last >= 0 else last
+        key_specs = [(first, "range", last_key, step, 0)] if first > 0 else []
+        subcommand_infos = []
+
+    return CommandInfo(
+        name,
+        int(arity),
+        flags,
+        [spec for spec in key_specs if spec is not None],
+        {info.name: info for info in subcommand_infos},
+    )
+
+
+def _literal(value) -> str:
+    # like `repr` but quoting strings the way black formats them
+    if isinstance(value, str):
+        return '"' + value + '"'
+    elif isinstance(value, tuple):
+        items = [_literal(item) for item in value]
+        return f"({items[0]},)" if len(items) == 1 else f"({', '.join(items)})"
+    return repr(value)
+
+
+def generate_table(table: CommandTable) -> str:
+    """Python source of a `command_table.py` module holding `table`."""
+
+    def entry(info, indent):
+        fields = [_literal(info.arity), _literal(" ".join(sorted(info.flags)))]
+        fields.append(_literal(info.key_specs))
+        if info.subcommands:
+            inner = " " * (indent + 4)
+            subcommands = "".join(
+                f"{inner}{_literal(name)}: {entry(sub, indent + 4)},\n"
+                for name, sub in sorted(info.subcommands.items())
+            )
+            fields.append("{\n" + subcommands + " " * indent + "}")
+        return f"({', '.join(fields)})"
+
+    lines = [
+        '"""Flags and key specs of redis commands generated from `COMMAND`.',
+        "",
+        "Generated by `python -m reddish._core.command_info`, don't edit by hand.",
+        '"""',
+        "# flake8: noqa",
+        "# name: (arity, flags, key specs[, subcommands])",
+        "# fmt: off",
+        "COMMANDS = {",
+    ]
+    for info in sorted(table, key=lambda info: info.name):
+        lines.append(f"    {_literal(info.name)}: {entry(info, 4)},")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+command_table = CommandTable.from_table(COMMANDS)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import socket
+    import sys
+
+    from reddish.clients.socket import Redis
+    from .command import Command
+
+    host, port = (sys.argv[1:] + ["localhost", "6379"])[:2]
+    with socket.create_connection((host, int(port))) as connection:
+        reply = Redis(connection).execute(Command("COMMAND"))
+    sys.stdout.write(generate_table(CommandTable.from_reply(reply)))
@@ -0,0 +1,345 @@
+"""Flags and key specs of redis commands generated from `COMMAND`.
+
+Generated by `python -m reddish._core.command_info`, don't edit by hand.
+"""
+# flake8: noqa
+# name: (arity, flags, key specs[, subcommands])
+# fmt: off
+COMMANDS = {
+    "ACL": (-2, "", (), {
+        "ACL|CAT": (-2, "loading noscript sentinel stale", ()),
+        "ACL|DELUSER": (-3, "admin loading noscript sentinel stale", ()),
+        "ACL|GETUSER": (3, "admin loading noscript sentinel stale", ()),
+        "ACL|LIST": (2, "admin loading noscript sentinel stale", ()),
+        "ACL|SETUSER": (-3, "admin loading noscript sentinel stale", ()),
+        "ACL|USERS": (2, "admin loading noscript sentinel stale", ()),
+        "ACL|WHOAMI": (2, "loading noscript sentinel stale", ()),
+    }),
+    "APPEND": (3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "ASKING": (1, "fast", ()),
+    "AUTH": (-2, "allow_busy fast loading no_auth noscript sentinel stale", ()),
+    "BGREWRITEAOF": (1, "admin no_async_loading noscript", ()),
+    "BGSAVE": (-1, "admin no_async_loading noscript", ()),
+    "BITCOUNT": (-2, "readonly", ((1, "range", 0, 1, 0),)),
+    "BITFIELD": (-2, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "BITFIELD_RO": (-2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "BITOP": (-4, "denyoom write", ((2, "range", 0, 1, 0), (3, "range", -1, 1, 0))),
+    "BITPOS": (-3, "readonly", ((1, "range", 0, 1, 0),)),
+    "BLMOVE": (6, "blocking denyoom write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "BLMPOP": (-5, "blocking movablekeys write", ((2, "keynum", 0, 1, 1),)),
+    "BLPOP": (-3, "blocking write", ((1, "range", -2, 1, 0),)),
+    "BRPOP": (-3, "blocking write", ((1, "range", -2, 1, 0),)),
+    "BRPOPLPUSH": (4, "blocking denyoom write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "BZMPOP": (-5, "blocking movablekeys write", ((2, "keynum", 0, 1, 1),)),
+    "BZPOPMAX": (-3, "blocking fast write", ((1, "range", -2, 1, 0),)),
+    "BZPOPMIN": (-3, "blocking fast write", ((1, "range", -2, 1, 0),)),
+    "CLIENT": (-2, "sentinel", (), {
+        "CLIENT|CACHING": (3, "loading noscript stale", ()),
+        "CLIENT|GETNAME": (2, "loading noscript stale", ()),
+        "CLIENT|ID": (2, "loading noscript stale", ()),
+        "CLIENT|INFO": (2, "loading noscript stale", ()),
+        "CLIENT|KILL": (-3, "admin loading noscript stale", ()),
+        "CLIENT|LIST": (-2, "admin loading noscript stale", ()),
+        "CLIENT|NO-EVICT": (3, "admin loading noscript stale", ()),
+        "CLIENT|NO-TOUCH": (3, "loading noscript stale", ()),
+        "CLIENT|PAUSE": (-3, "admin loading noscript stale", ()),
+        "CLIENT|REPLY": (3, "loading noscript stale", ()),
+        "CLIENT|SETINFO": (4, "loading noscript stale", ()),
+        "CLIENT|SETNAME": (3, "loading noscript stale", ()),
+        "CLIENT|TRACKING": (-3, "loading noscript stale", ()),
+        "CLIENT|TRACKINGINFO": (2, "loading noscript stale", ()),
+        "CLIENT|UNBLOCK": (-3, "loading noscript stale", ()),
+        "CLIENT|UNPAUSE": (2, "admin loading noscript stale", ()),
+    }),
+    "CLUSTER": (-2, "", (), {
+        "CLUSTER|COUNTKEYSINSLOT": (3, "stale", ()),
+        "CLUSTER|GETKEYSINSLOT": (4, "stale", ()),
+        "CLUSTER|INFO": (2, "stale", ()),
+        "CLUSTER|KEYSLOT": (3, "stale", ()),
+        "CLUSTER|MYID": (2, "stale", ()),
+        "CLUSTER|NODES": (2, "stale", ()),
+        "CLUSTER|REPLICAS": (3, "admin stale", ()),
+        "CLUSTER|SHARDS": (2, "loading stale", ()),
+        "CLUSTER|SLOTS": (2, "loading stale", ()),
+    }),
+    "COMMAND": (-1, "loading sentinel stale", (), {
+        "COMMAND|COUNT": (2, "loading sentinel stale", ()),
+        "COMMAND|DOCS": (-2, "loading sentinel stale", ()),
+        "COMMAND|GETKEYS": (-3, "loading sentinel stale", ()),
+        "COMMAND|INFO": (-2, "loading sentinel stale", ()),
+        "COMMAND|LIST": (-2, "loading sentinel stale", ()),
+    }),
+    "CONFIG": (-2, "", (), {
+        "CONFIG|GET": (-3, "admin loading noscript stale", ()),
+        "CONFIG|RESETSTAT": (2, "admin loading noscript stale", ()),
+        "CONFIG|REWRITE": (2, "admin loading noscript stale", ()),
+        "CONFIG|SET": (-4, "admin loading noscript stale", ()),
+    }),
+    "COPY": (-3, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "DBSIZE": (1, "fast readonly", ()),
+    "DEBUG": (-2, "admin loading noscript protected stale", ()),
+    "DECR": (2, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "DECRBY": (3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "DEL": (-2, "write", ((1, "range", -1, 1, 0),)),
+    "DISCARD": (1, "allow_busy fast loading noscript stale", ()),
+    "DUMP": (2, "readonly", ((1, "range", 0, 1, 0),)),
+    "ECHO": (2, "fast loading stale", ()),
+    "EVAL": (-3, "may_replicate movablekeys no_mandatory_keys noscript skip_monitor stale", ((2, "keynum", 0, 1, 1),)),
+    "EVALSHA": (-3, "may_replicate movablekeys no_mandatory_keys noscript skip_monitor stale", ((2, "keynum", 0, 1, 1),)),
+    "EVALSHA_RO": (-3, "movablekeys no_mandatory_keys noscript readonly skip_monitor stale", ((2, "keynum", 0, 1, 1),)),
+    "EVAL_RO": (-3, "movablekeys no_mandatory_keys noscript readonly skip_monitor stale", ((2, "keynum", 0, 1, 1),)),
+    "EXEC": (1, "loading noscript skip_slowlog stale", ()),
+    "EXISTS": (-2, "fast readonly", ((1, "range", -1, 1, 0),)),
+    "EXPIRE": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "EXPIREAT": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "EXPIRETIME": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "FAILOVER": (-1, "admin loading noscript stale", ()),
+    "FCALL": (-3, "may_replicate movablekeys no_mandatory_keys noscript skip_monitor stale", ((2, "keynum", 0, 1, 1),)),
+    "FCALL_RO": (-3, "movablekeys no_mandatory_keys noscript readonly skip_monitor stale", ((2, "keynum", 0, 1, 1),)),
+    "FLUSHALL": (-1, "write", ()),
+    "FLUSHDB": (-1, "write", ()),
+    "FUNCTION": (-2, "", (), {
+        "FUNCTION|DELETE": (3, "noscript write", ()),
+        "FUNCTION|DUMP": (2, "noscript", ()),
+        "FUNCTION|FLUSH": (-2, "noscript write", ()),
+        "FUNCTION|KILL": (2, "allow_busy noscript", ()),
+        "FUNCTION|LIST": (-2, "noscript", ()),
+        "FUNCTION|LOAD": (-3, "denyoom noscript write", ()),
+        "FUNCTION|RESTORE": (-3, "denyoom noscript write", ()),
+        "FUNCTION|STATS": (2, "allow_busy noscript", ()),
+    }),
+    "GEOADD": (-5, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "GEODIST": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "GEOHASH": (-2, "readonly", ((1, "range", 0, 1, 0),)),
+    "GEOPOS": (-2, "readonly", ((1, "range", 0, 1, 0),)),
+    "GEORADIUSBYMEMBER_RO": (-5, "readonly", ((1, "range", 0, 1, 0),)),
+    "GEORADIUS_RO": (-6, "readonly", ((1, "range", 0, 1, 0),)),
+    "GEOSEARCH": (-7, "readonly", ((1, "range", 0, 1, 0),)),
+    "GEOSEARCHSTORE": (-8, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "GET": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "GETBIT": (3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "GETDEL": (2, "fast write", ((1, "range", 0, 1, 0),)),
+    "GETEX": (-2, "fast write", ((1, "range", 0, 1, 0),)),
+    "GETRANGE": (4, "readonly", ((1, "range", 0, 1, 0),)),
+    "GETSET": (3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "HDEL": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "HELLO": (-1, "allow_busy fast loading no_auth noscript sentinel stale", ()),
+    "HEXISTS": (3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "HGET": (3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "HGETALL": (2, "readonly", ((1, "range", 0, 1, 0),)),
+    "HINCRBY": (4, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "HINCRBYFLOAT": (4, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "HKEYS": (2, "readonly", ((1, "range", 0, 1, 0),)),
+    "HLEN": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "HMGET": (-3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "HMSET": (-4, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "HRANDFIELD": (-2, "readonly", ((1, "range", 0, 1, 0),)),
+    "HSCAN": (-3, "readonly", ((1, "range", 0, 1, 0),)),
+    "HSET": (-4, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "HSETNX": (4, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "HSTRLEN": (3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "HVALS": (2, "readonly", ((1, "range", 0, 1, 0),)),
+    "INCR": (2, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "INCRBY": (3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "INCRBYFLOAT": (3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "INFO": (-1, "loading sentinel stale", ()),
+    "KEYS": (2, "readonly", ()),
+    "LASTSAVE": (1, "fast loading stale", ()),
+    "LATENCY": (-2, "", (), {
+        "LATENCY|DOCTOR": (2, "admin loading noscript stale", ()),
+        "LATENCY|HISTORY": (3, "admin loading noscript stale", ()),
+        "LATENCY|LATEST": (2, "admin loading noscript stale", ()),
+        "LATENCY|RESET": (-2, "admin loading noscript stale", ()),
+    }),
+    "LCS": (-3, "readonly", ((1, "range", 1, 1, 0),)),
+    "LINDEX": (3, "readonly", ((1, "range", 0, 1, 0),)),
+    "LINSERT": (5, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "LLEN": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "LMOVE": (5, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "LMPOP": (-4, "movablekeys write", ((1, "keynum", 0, 1, 1),)),
+    "LOLWUT": (-1, "fast readonly", ()),
+    "LPOP": (-2, "fast write", ((1, "range", 0, 1, 0),)),
+    "LPOS": (-3, "readonly", ((1, "range", 0, 1, 0),)),
+    "LPUSH": (-3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "LPUSHX": (-3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "LRANGE": (4, "readonly", ((1, "range", 0, 1, 0),)),
+    "LREM": (4, "write", ((1, "range", 0, 1, 0),)),
+    "LSET": (4, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "LTRIM": (4, "write", ((1, "range", 0, 1, 0),)),
+    "MEMORY": (-2, "", (), {
+        "MEMORY|DOCTOR": (2, "", ()),
+        "MEMORY|MALLOC-STATS": (2, "", ()),
+        "MEMORY|PURGE": (2, "", ()),
+        "MEMORY|STATS": (2, "", ()),
+        "MEMORY|USAGE": (-3, "readonly", ((2, "range", 0, 1, 0),)),
+    }),
+    "MGET": (-2, "fast readonly", ((1, "range", -1, 1, 0),)),
+    "MIGRATE": (-6, "write", ((3, "range", 0, 1, 0), (("KEYS", -2), "range", -1, 1, 0))),
+    "MODULE": (-2, "", (), {
+        "MODULE|LIST": (2, "admin noscript", ()),
+        "MODULE|LOAD": (-3, "admin no_async_loading noscript protected", ()),
+        "MODULE|UNLOAD": (3, "admin no_async_loading noscript protected", ()),
+    }),
+    "MONITOR": (1, "admin loading noscript stale", ()),
+    "MOVE": (3, "fast write", ((1, "range", 0, 1, 0),)),
+    "MSET": (-3, "denyoom write", ((1, "range", -1, 2, 0),)),
+    "MSETNX": (-3, "denyoom write", ((1, "range", -1, 2, 0),)),
+    "MULTI": (1, "allow_busy fast loading noscript stale", ()),
+    "OBJECT": (-2, "", (), {
+        "OBJECT|ENCODING": (3, "readonly", ((2, "range", 0, 1, 0),)),
+        "OBJECT|FREQ": (3, "readonly", ((2, "range", 0, 1, 0),)),
+        "OBJECT|HELP": (2, "loading stale", ()),
+        "OBJECT|IDLETIME": (3, "readonly", ((2, "range", 0, 1, 0),)),
+        "OBJECT|REFCOUNT": (3, "readonly", ((2, "range", 0, 1, 0),)),
+    }),
+    "PERSIST": (2, "fast write", ((1, "range", 0, 1, 0),)),
+    "PEXPIRE": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "PEXPIREAT": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "PEXPIRETIME": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "PFADD": (-2, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "PFCOUNT": (-2, "readonly", ((1, "range", -1, 1, 0),)),
+    "PFMERGE": (-2, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", -1, 1, 0))),
+    "PING": (-1, "fast sentinel", ()),
+    "PSETEX": (4, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "PSUBSCRIBE": (-2, "loading noscript pubsub stale", ()),
+    "PTTL": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "PUBLISH": (3, "fast loading may_replicate pubsub stale", ()),
+    "PUBSUB": (-2, "", (), {
+        "PUBSUB|CHANNELS": (-2, "loading pubsub stale", ()),
+        "PUBSUB|NUMPAT": (2, "loading pubsub stale", ()),
+        "PUBSUB|NUMSUB": (-2, "loading pubsub stale", ()),
+        "PUBSUB|SHARDCHANNELS": (-2, "loading pubsub stale", ()),
+        "PUBSUB|SHARDNUMSUB": (-2, "loading pubsub stale", ()),
+    }),
+    "PUNSUBSCRIBE": (-1, "loading noscript pubsub stale", ()),
+    "QUIT": (-1, "allow_busy fast loading no_auth noscript stale", ()),
+    "RANDOMKEY": (1, "readonly", ()),
+    "READONLY": (1, "fast loading stale", ()),
+    "READWRITE": (1, "fast loading stale", ()),
+    "RENAME": (3, "write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "RENAMENX": (3, "fast write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "REPLICAOF": (3, "admin no_async_loading noscript stale", ()),
+    "RESET": (1, "allow_busy fast loading no_auth noscript stale", ()),
+    "RESTORE": (-4, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "ROLE": (1, "fast loading noscript sentinel stale", ()),
+    "RPOP": (-2, "fast write", ((1, "range", 0, 1, 0),)),
+    "RPOPLPUSH": (3, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "RPUSH": (-3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "RPUSHX": (-3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "SADD": (-3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "SAVE": (1, "admin no_async_loading no_multi noscript", ()),
+    "SCAN": (-2, "readonly", ()),
+    "SCARD": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "SCRIPT": (-2, "", (), {
+        "SCRIPT|EXISTS": (-3, "noscript", ()),
+        "SCRIPT|FLUSH": (-2, "noscript", ()),
+        "SCRIPT|KILL": (2, "allow_busy noscript", ()),
+        "SCRIPT|LOAD": (3, "noscript stale", ()),
+    }),
+    "SDIFF": (-2, "readonly", ((1, "range", -1, 1, 0),)),
+    "SDIFFSTORE": (-3, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", -1, 1, 0))),
+    "SELECT": (2, "fast loading stale", ()),
+    "SET": (-3, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "SETBIT": (4, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "SETEX": (4, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "SETNX": (3, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "SETRANGE": (4, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "SHUTDOWN": (-1, "admin allow_busy loading no_multi noscript sentinel stale", ()),
+    "SINTER": (-2, "readonly", ((1, "range", -1, 1, 0),)),
+    "SINTERCARD": (-3, "movablekeys readonly", ((1, "keynum", 0, 1, 1),)),
+    "SINTERSTORE": (-3, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", -1, 1, 0))),
+    "SISMEMBER": (3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "SLAVEOF": (3, "admin no_async_loading noscript stale", ()),
+    "SLOWLOG": (-2, "", (), {
+        "SLOWLOG|GET": (-2, "admin loading noscript stale", ()),
+        "SLOWLOG|LEN": (2, "admin loading noscript stale", ()),
+        "SLOWLOG|RESET": (2, "admin loading noscript stale", ()),
+    }),
+    "SMEMBERS": (2, "readonly", ((1, "range", 0, 1, 0),)),
+    "SMISMEMBER": (-3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "SMOVE": (4, "fast write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "SORT": (-2, "denyoom movablekeys write", ((1, "range", 0, 1, 0),)),
+    "SORT_RO": (-2, "movablekeys readonly", ((1, "range", 0, 1, 0),)),
+    "SPOP": (-2, "fast write", ((1, "range", 0, 1, 0),)),
+    "SPUBLISH": (3, "fast loading may_replicate pubsub stale", ((1, "range", 0, 1, 0),)),
+    "SRANDMEMBER": (-2, "readonly", ((1, "range", 0, 1, 0),)),
+    "SREM": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "SSCAN": (-3, "readonly", ((1, "range", 0, 1, 0),)),
+    "SSUBSCRIBE": (-2, "loading noscript pubsub stale", ((1, "range", -1, 1, 0),)),
+    "STRLEN": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "SUBSCRIBE": (-2, "loading noscript pubsub stale", ()),
+    "SUBSTR": (4, "readonly", ((1, "range", 0, 1, 0),)),
+    "SUNION": (-2, "readonly", ((1, "range", -1, 1, 0),)),
+    "SUNIONSTORE": (-3, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", -1, 1, 0))),
+    "SUNSUBSCRIBE": (-1, "loading noscript pubsub stale", ((1, "range", -1, 1, 0),)),
+    "SWAPDB": (3, "fast write", ()),
+    "TIME": (1, "fast loading stale", ()),
+    "TOUCH": (-2, "fast readonly", ((1, "range", -1, 1, 0),)),
+    "TTL": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "TYPE": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "UNLINK": (-2, "fast write", ((1, "range", -1, 1, 0),)),
+    "UNSUBSCRIBE": (-1, "loading noscript pubsub stale", ()),
+    "UNWATCH": (1, "allow_busy fast loading noscript stale", ()),
+    "WAIT": (3, "blocking", ()),
+    "WAITAOF": (4, "blocking noscript", ()),
+    "WATCH": (-2, "allow_busy fast loading noscript stale", ((1, "range", -1, 1, 0),)),
+    "XACK": (-4, "fast write", ((1, "range", 0, 1, 0),)),
+    "XADD": (-5, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "XAUTOCLAIM": (-6, "fast write", ((1, "range", 0, 1, 0),)),
+    "XCLAIM": (-6, "fast write", ((1, "range", 0, 1, 0),)),
+    "XDEL": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "XGROUP": (-2, "", (), {
+        "XGROUP|CREATE": (-5, "denyoom write", ((2, "range", 0, 1, 0),)),
+        "XGROUP|CREATECONSUMER": (5, "denyoom write", ((2, "range", 0, 1, 0),)),
+        "XGROUP|DELCONSUMER": (5, "write", ((2, "range", 0, 1, 0),)),
+        "XGROUP|DESTROY": (4, "write", ((2, "range", 0, 1, 0),)),
+        "XGROUP|HELP": (2, "loading stale", ()),
+        "XGROUP|SETID": (-5, "write", ((2, "range", 0, 1, 0),)),
+    }),
+    "XINFO": (-2, "", (), {
+        "XINFO|CONSUMERS": (4, "readonly", ((2, "range", 0, 1, 0),)),
+        "XINFO|GROUPS": (3, "readonly", ((2, "range", 0, 1, 0),)),
+        "XINFO|HELP": (2, "loading stale", ()),
+        "XINFO|STREAM": (-3, "readonly", ((2, "range", 0, 1, 0),)),
+    }),
+    "XLEN": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "XPENDING": (-3, "readonly", ((1, "range", 0, 1, 0),)),
+    "XRANGE": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "XREAD": (-4, "blocking movablekeys readonly", ((("STREAMS", 1), "range", -1, 1, 2),)),
+    "XREADGROUP": (-7, "blocking movablekeys write", ((("STREAMS", 4), "range", -1, 1, 2),)),
+    "XREVRANGE": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "XSETID": (-3, "denyoom write", ((1, "range", 0, 1, 0),)),
+    "XTRIM": (-4, "write", ((1, "range", 0, 1, 0),)),
+    "ZADD": (-4, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "ZCARD": (2, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "ZCOUNT": (4, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "ZDIFF": (-3, "movablekeys readonly", ((1, "keynum", 0, 1, 1),)),
+    "ZDIFFSTORE": (-4, "denyoom movablekeys write", ((1, "range", 0, 1, 0), (2, "keynum", 0, 1, 1))),
+    "ZINCRBY": (4, "denyoom fast write", ((1, "range", 0, 1, 0),)),
+    "ZINTER": (-3, "movablekeys readonly", ((1, "keynum", 0, 1, 1),)),
+    "ZINTERCARD": (-3, "movablekeys readonly", ((1, "keynum", 0, 1, 1),)),
+    "ZINTERSTORE": (-4, "denyoom movablekeys write", ((1, "range", 0, 1, 0), (2, "keynum", 0, 1, 1))),
+    "ZLEXCOUNT": (4, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "ZMPOP": (-4, "movablekeys write", ((1, "keynum", 0, 1, 1),)),
+    "ZMSCORE": (-3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "ZPOPMAX": (-2, "fast write", ((1, "range", 0, 1, 0),)),
+    "ZPOPMIN": (-2, "fast write", ((1, "range", 0, 1, 0),)),
+    "ZRANDMEMBER": (-2, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZRANGE": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZRANGEBYLEX": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZRANGEBYSCORE": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZRANGESTORE": (-5, "denyoom write", ((1, "range", 0, 1, 0), (2, "range", 0, 1, 0))),
+    "ZRANK": (-3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "ZREM": (-3, "fast write", ((1, "range", 0, 1, 0),)),
+    "ZREMRANGEBYLEX": (4, "write", ((1, "range", 0, 1, 0),)),
+    "ZREMRANGEBYRANK": (4, "write", ((1, "range", 0, 1, 0),)),
+    "ZREMRANGEBYSCORE": (4, "write", ((1, "range", 0, 1, 0),)),
+    "ZREVRANGE": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZREVRANGEBYLEX": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZREVRANGEBYSCORE": (-4, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZREVRANK": (-3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "ZSCAN": (-3, "readonly", ((1, "range", 0, 1, 0),)),
+    "ZSCORE": (3, "fast readonly", ((1, "range", 0, 1, 0),)),
+    "ZUNION": (-3, "movablekeys readonly", ((1, "keynum", 0, 1, 1),)),
+    "ZUNIONSTORE": (-4, "denyoom movablekeys write", ((1, "range", 0, 1, 0), (2, "keynum", 0, 1, 1))),
+}
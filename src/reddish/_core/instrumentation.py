@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import threading
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .command import Command
+from .multiexec import MultiExec
+
+SUB_BUCKET_BITS = 5  # 32 buckets per power of two, i.e. about 3% precision
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# bucket boundaries in seconds for exporting latencies
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+
+
+_NAMES: Dict[object, str] = {}  # normalized command names by the name as sent
+
+
+def command_name(command) -> str:
+    """Name of a command for grouping metrics e.g. `GET` or `MULTI` for transactions."""
+    if isinstance(command, Command):
+        raw = command._command_name
+        name = _NAMES.get(raw)
+        if name is None:
+            name = (raw.decode() if isinstance(raw, bytes) else str(raw)).upper()
+            if len(_NAMES) < 1024:  # names may come from untrusted input
+                _NAMES[raw] = name
+        return name
+    if isinstance(command, MultiExec):
+        return "MULTI"
+    wrapped = getattr(command, "_command", None)  # e.g. loading scripts
+    return "UNKNOWN" if wrapped is None else command_name(wrapped)
+
+
+class BatchStats:
+    """What happened to a batch of commands sent over a connection.
+
+    Times are seconds from `time.perf_counter`. Reply bytes are the bytes
+    received while the batch was the oldest one waiting for replies.
+    """
+
+    __slots__ = (
+        "commands",
+        "started",
+        "encode_time",
+        "encoded_bytes",
+        "first_byte",
+        "reply_bytes",
+        "decode_time",
+        "completed",
+    )
+
+    def __init__(self, commands: Sequence, started: float):
+        self.commands = commands
+        self.started = started
+        self.encode_time = 0.0
+        self.encoded_bytes = 0
+        self.first_byte: Optional[float] = None
+        self.reply_bytes = 0
+        self.decode_time = 0.0
+        self.completed: Optional[float] = None
+
+    @property
+    def size(self) -> int:
+        """Number of commands in the batch."""
+        return len(self.commands)
+
+    @property
+    def command_names(self) -> List[str]:
+        return [command_name(command) for command in self.commands]
+
+    @property
+    def latency(self) -> float:
+        """Seconds from queueing the batch until its last reply was decoded."""
+        end = self.completed if self.completed is not None else perf_counter()
+        return end - self.started
+
+    @property
+    def io_time(self) -> float:
+        """Seconds not spent encoding or decoding e.g. waiting for redis."""
+        return self.latency - self.encode_time - self.decode_time
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(size={self.size}, "
+            f"encoded_bytes={self.encoded_bytes}, reply_bytes={self.reply_bytes}, "
+            f"latency={self.latency:.6f})"
+        )
+
+
+class Instrumentation:
+    """Hooks called by `RedisSansIO` for every batch of commands.
+
+    Subclass it and override the hooks of interest. Hooks are called while
+    sending and receiving so they should return quickly.
+    """
+
+    def on_send(self, batch: BatchStats) -> None:
+        """Called once the whole batch was encoded for sending."""
+
+    def on_first_byte(self, batch: BatchStats) -> None:
+        """Called when the first data arrived while waiting for the batch's replies."""
+
+    def on_complete(self, batch: BatchStats) -> None:
+        """Called once all replies of the batch were decoded."""
+
+
+class CombinedInstrumentation(Instrumentation):
+    """Calls the hooks of several instrumentations."""
+
+    def __init__(self, *instrumentations: Instrumentation):
+        self.instrumentations = instrumentations
+
+    def on_send(self, batch):
+        for instrumentation in self.instrumentations:
+            instrumentation.on_send(batch)
+
+    def on_first_byte(self, batch):
+        for instrumentation in self.instrumentations:
+            instrumentation.on_first_byte(batch)
+
+    def on_complete(self, batch):
+        for instrumentation in self.instrumentations:
+            instrumentation.on_complete(batch)
+
+
+class Histogram:
+    """Histogram with logarithmic buckets of constant relative precision like HDR.
+
+    Values are recorded as integers e.g. microseconds. Values below 64 get their
+    own bucket and larger ones share a bucket with values within about 3%.
+    """
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < 2 * SUB_BUCKETS:
+            return value
+        # keeps the leading bit and the `SUB_BUCKET_BITS` after it
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        return shift * SUB_BUCKETS + (value >> shift)
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        # highest value sharing the bucket
+        if index < 2 * SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        sub_bucket = index % SUB_BUCKETS + SUB_BUCKETS
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(0, int(value))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: Histogram) -> None:
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> int:
+        """The value below or at which `percent` of the recorded values are."""
+        if not self.count:
+            return 0
+        rank = max(1, round(percent / 100 * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)  # type: ignore
+        return self.max  # type: ignore
+
+    def cumulative_counts(self, bounds: Iterable[int]) -> List[int]:
+        """Number of values at or below each of the sorted `bounds`.
+
+        Values are counted by the upper bound of their bucket.
+        """
+        items = sorted(self._counts.items())
+        counts = []
+        seen = 0
+        position = 0
+        for bound in bounds:
+            while (
+                position < len(items) and self._upper_bound(items[position][0]) <= bound
+            ):
+                seen += items[position][1]
+                position += 1
+            counts.append(seen)
+        return counts
+
+
+class LatencyRecorder(Instrumentation):
+    """Records latencies per command name, batch sizes and bytes sent and received.
+
+    A command's latency is the latency of the batch it was sent in. The recorder
+    can be shared between connections and threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, Histogram] = {}  # in microseconds
+        self.batch_sizes = Histogram()
+        self.sent_bytes = 0
+        self.received_bytes = 0
+
+    def on_complete(self, batch):
+        latency = round(batch.latency * 1_000_000)
+        names: Dict[str, int] = {}
+        for command in batch.commands:
+            name = command_name(command)
+            names[name] = names.get(name, 0) + 1
+        with self._lock:
+            latencies = self.latencies
+            for name, count in names.items():
+                histogram = latencies.get(name)
+                if histogram is None:
+                    histogram = latencies[name] = Histogram()
+                histogram.record(latency, count)
+            self.batch_sizes.record(batch.size)
+            self.sent_bytes += batch.encoded_bytes
+            self.received_bytes += batch.reply_bytes
+
+    def percentile(self, name: str, percent: float) -> float:
+        """Latency in seconds of a command below which `percent` of them were."""
+        histogram = self.latencies.get(name.upper())
+        return 0.0 if histogram is None else histogram.percentile(percent) / 1_000_000
+
+    def snapshot(self) -> Tuple[Dict[str, Histogram], Histogram, int, int]:
+        """Copies of the recorded metrics taken at once."""
+        with self._lock:
+            latencies = {}
+            for name, histogram in self.latencies.items():
+                latencies[name] = Histogram()
+                latencies[name].merge(histogram)
+            batch_sizes = Histogram()
+            batch_sizes.merge(self.batch_sizes)
+            return latencies, batch_sizes, self.sent_bytes, self.received_bytes
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+def _histogram_lines(
+    name: str,
+    histogram: Histogram,
+    bounds: Sequence[float],
+    scale: float,
+    labels: str = "",
+) -> List[str]:
+    separator = "," if labels else ""
+    counts = histogram.cumulative_counts([bound * scale for bound in bounds])
+    lines = [
+        f'{name}_bucket{{{labels}{separator}le="{_format_bound(bound)}"}} {count}'
+        for bound, count in zip(bounds, counts)
+    ]
+    lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum / scale:g}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(
+    recorder: LatencyRecorder,
+    *,
+    prefix: str = "reddish",
+    latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+) -> str:
+    """Export the metrics of a `LatencyRecorder` in the Prometheus text format.
+
+    Args:
+        recorder: the recorder to export the metrics of.
+        prefix: prefix of the metric names.
+        latency_buckets: upper bounds in seconds of the latency buckets.
+
+    Returns:
+        The metrics e.g. for serving them at `/metrics`.
+    """
+    latencies, batch_sizes, sent_bytes, received_bytes = recorder.snapshot()
+    duration = f"{prefix}_command_duration_seconds"
+    lines = [
+        f"# HELP {duration} Latency of commands including the rest of their batch.",
+        f"# TYPE {duration} histogram",
+    ]
+    for name in sorted(latencies):
+        labels = f'command="{_escape(name)}"'
+        lines += _histogram_lines(
+            duration, latencies[name], latency_buckets, 1_000_000, labels
+        )
+    batch_size = f"{prefix}_batch_size"
+    lines += [
+        f"# HELP {batch_size} Number of commands sent in a batch.",
+        f"# TYPE {batch_size} histogram",
+        *_histogram_lines(batch_size, batch_sizes, BATCH_SIZE_BUCKETS, 1),
+        f"# HELP {prefix}_sent_bytes_total Bytes of encoded commands sent.",
+        f"# TYPE {prefix}_sent_bytes_total counter",
+        f"{prefix}_sent_bytes_total {sent_bytes}",
+        f"# HELP {prefix}_received_bytes_total Bytes of replies received.",
+        f"# TYPE {prefix}_received_bytes_total counter",
+        f"{prefix}_received_bytes_total {received_bytes}",
+    ]
+    return "\n".join(lines) + "\n"
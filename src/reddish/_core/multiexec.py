@@ -4,6 +4,7 @@ from outcome import capture, Error
 from hiredis import ReplyError, pack_command
 
 from .errors import CommandError, TransactionError
+from .utils import ZERO_COPY
 
 from typing import TypeVar, Generic
 
@@ -19,6 +20,8 @@ class MultiExec(
 ):  # must inherit from Generic[T] to be subscribable at runtime
     """A redis MULTI and EXEC transaction"""
 
+    __slots__ = ("_commands", "_encoded")
+
     _MULTI = pack_command((b"MULTI",))
     _EXEC = pack_command((b"EXEC",))
 
@@ -29,6 +32,8 @@ class MultiExec(
             *commands: Commands to include in the transaction
         """
         self._commands = commands
+        zero_copy = any(getattr(cmd, "_encoded", None) is ZERO_COPY for cmd in commands)
+        self._encoded = ZERO_COPY if zero_copy else None
 
     def _parse_response(self, *responses):
         assert (
@@ -63,10 +68,31 @@ class MultiExec(
         else:
             return [outcome.unwrap() for outcome in outcomes]
 
-    def __bytes__(self):
-        commands = b"".join(bytes(cmd) for cmd in self._commands)
+    def _segments(self):
+        """The encoded transaction in pieces that keep buffers as they are."""
+        segments = [self._MULTI]
+        for cmd in self._commands:
+            if cmd._encoded is ZERO_COPY:
+                segments += cmd._segments()
+            else:
+                segments.append(bytes(cmd))
+        segments.append(self._EXEC)
+        return segments
+
+    def _encode(self):
+        """The RESP encoding of the transaction without keeping it."""
+        commands = b"".join(cmd._encoded or cmd._encode() for cmd in self._commands)
         return b"%b%b%b" % (self._MULTI, commands, self._EXEC)
 
+    def __bytes__(self):
+        encoded = self._encoded
+        if encoded is ZERO_COPY:
+            return b"".join(self._segments())
+        if encoded is None:
+            commands = b"".join(bytes(cmd) for cmd in self._commands)
+            encoded = self._encoded = b"%b%b%b" % (self._MULTI, commands, self._EXEC)
+        return encoded
+
     def __repr__(self):
         commands = (repr(cmd) for cmd in self._commands)
         return f"{self.__class__.__name__}({', '.join(commands)})"
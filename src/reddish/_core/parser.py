@@ -1,12 +1,190 @@
-from pydantic import parse_obj_as, ValidationError
+from typing import Type, Any, TypeVar, Callable, Dict
+
+from pydantic import ValidationError
 from reddish._core.errors import ParseError
-from typing import Type, Any, TypeVar
+
+try:
+    from pydantic import TypeAdapter  # pydantic >= 2
+except ImportError:  # pydantic 1.x
+    TypeAdapter = None
+    from pydantic import create_model
 
 T = TypeVar("T")
 
 
+class _Unhandled(Exception):
+    """Raised by fast converters for values that need to be validated by pydantic."""
+
+
+_UNHANDLED = _Unhandled()
+
+
+def _to_int(value):
+    cls = type(value)
+    if cls is int:
+        return value
+    elif cls is bytes or cls is str:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise _UNHANDLED
+
+
+def _to_float(value):
+    cls = type(value)
+    if cls is float:
+        return value
+    elif cls is bytes or cls is str or cls is int:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise _UNHANDLED
+
+
+def _to_str(value):
+    cls = type(value)
+    if cls is str:
+        return value
+    elif cls is bytes:
+        try:
+            return value.decode()
+        except UnicodeDecodeError:
+            pass
+    raise _UNHANDLED
+
+
+def _to_bytes(value):
+    if type(value) is bytes:
+        return value
+    raise _UNHANDLED
+
+
+def _exactly(type_):
+    # values decoded natively by the reader e.g. RESP3 maps and booleans
+    def convert(value):
+        if type(value) is type_:
+            return value
+        raise _UNHANDLED
+
+    return convert
+
+
+_FAST_CONVERTERS: Dict[Any, Callable[[Any], Any]] = {
+    int: _to_int,
+    float: _to_float,
+    str: _to_str,
+    bytes: _to_bytes,
+    bool: _exactly(bool),
+    dict: _exactly(dict),
+    list: _exactly(list),
+}
+
+
+def _list_converter(convert_item):
+    def convert(value):
+        if type(value) is not list:
+            raise _UNHANDLED
+        return [convert_item(item) for item in value]
+
+    return convert
+
+
+def _dict_converter(convert_key, convert_value):
+    def convert(value):
+        if type(value) is not dict:
+            raise _UNHANDLED
+        return {convert_key(k): convert_value(v) for k, v in value.items()}
+
+    return convert
+
+
+def _model_converter(convert_reply):
+    # models of `reddish.models` converting replies themselves
+    def convert(value):
+        try:
+            return convert_reply(value)
+        except (ValueError, TypeError):
+            raise _UNHANDLED  # pydantic reports why the reply didn't fit
+
+    return convert
+
+
+def _fast_converter(type_):
+    """Converter for builtin types and reply models that can skip pydantic or `None`."""
+    try:
+        return _FAST_CONVERTERS[type_]
+    except (KeyError, TypeError):
+        pass
+
+    convert_reply = getattr(type_, "_convert_reply", None)
+    if isinstance(type_, type) and convert_reply is not None:
+        return _model_converter(convert_reply)
+
+    if TypeAdapter is not None:
+        # pydantic-core validates containers faster than a python loop could
+        return None
+
+    origin = getattr(type_, "__origin__", None)
+    args = getattr(type_, "__args__", None) or ()
+    if origin is list and len(args) == 1:
+        convert_item = _fast_converter(args[0])
+        if convert_item is not None:
+            return _list_converter(convert_item)
+    elif origin is dict and len(args) == 2:
+        convert_key, convert_value = (_fast_converter(arg) for arg in args)
+        if convert_key is not None and convert_value is not None:
+            return _dict_converter(convert_key, convert_value)
+    return None
+
+
+def _pydantic_validator(type_):
+    if TypeAdapter is not None:
+        return TypeAdapter(type_).validate_python
+    else:
+        model = create_model("ParsingModel", __root__=(type_, ...))
+        return lambda value: model(__root__=value).__root__
+
+
+def _build_validator(type_):
+    fast = _fast_converter(type_)
+    slow = None
+
+    def validate_slow(value):
+        nonlocal slow
+        if slow is None:
+            slow = _pydantic_validator(type_)
+        return slow(value)
+
+    if fast is None:
+        return validate_slow
+
+    def validate(value):
+        try:
+            return fast(value)
+        except _Unhandled:
+            return validate_slow(value)
+
+    return validate
+
+
+_validators: Dict[Any, Callable[[Any], Any]] = {}
+
+
+def get_validator(type_: Type[T]) -> Callable[[Any], T]:
+    """Validator for `type_` that is built once and reused afterwards."""
+    try:
+        return _validators[type_]
+    except KeyError:
+        validator = _validators[type_] = _build_validator(type_)
+    except TypeError:  # unhashable type e.g. `Annotated` with unhashable metadata
+        validator = _build_validator(type_)
+    return validator
+
+
 def parse(type_: Type[T], value: Any) -> T:
     try:
-        return parse_obj_as(type_, value)
+        return get_validator(type_)(value)
     except ValidationError as error:
         raise ParseError(value, type_) from error
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, List, NamedTuple, Optional, Set, Union
+
+import hiredis
+
+from .command import Args, Command
+from .errors import CommandError, ConnectionError
+from .sansio import AdaptiveReadBuffer, NOT_ENOUGH_DATA
+
+
+class Message(NamedTuple):
+    """A message published to a channel the subscriber is subscribed to.
+
+    `pattern` is the pattern the channel matched for messages received
+    through `psubscribe` and `None` otherwise.
+    """
+
+    channel: bytes
+    data: Any
+    pattern: Optional[bytes] = None
+
+
+# kinds of subscription confirmations and the set of subscriptions they change
+_SUBSCRIBED = {
+    b"subscribe": "channels",
+    b"psubscribe": "patterns",
+    b"ssubscribe": "shard_channels",
+}
+_UNSUBSCRIBED = {
+    b"unsubscribe": "channels",
+    b"punsubscribe": "patterns",
+    b"sunsubscribe": "shard_channels",
+}
+
+
+class SubscriberSansIO(AdaptiveReadBuffer):
+    """Sans-io state of a connection dedicated to receiving published messages.
+
+    The subscribe methods return the request to be sent. Subscriptions only
+    take effect once redis confirmed them which is tracked while receiving.
+    """
+
+    def __init__(self, reader=None):
+        super().__init__()
+        self._reader = reader or hiredis.Reader(notEnoughData=NOT_ENOUGH_DATA)
+        self._broken = False
+        # messages and errors decoded but not handed out yet in the order received
+        self._pending: Deque[Union[Message, CommandError]] = deque()
+        self.channels: Set[bytes] = set()
+        self.patterns: Set[bytes] = set()
+        self.shard_channels: Set[bytes] = set()
+
+    def mark_broken(self):
+        self._broken = True
+
+    @property
+    def broken(self) -> bool:
+        return self._broken
+
+    def subscribe(self, *channels: Union[str, bytes]) -> bytes:
+        return self._request("SUBSCRIBE", channels)
+
+    def psubscribe(self, *patterns: Union[str, bytes]) -> bytes:
+        return self._request("PSUBSCRIBE", patterns)
+
+    def ssubscribe(self, *channels: Union[str, bytes]) -> bytes:
+        return self._request("SSUBSCRIBE", channels)
+
+    def unsubscribe(self, *channels: Union[str, bytes]) -> bytes:
+        """Unsubscribe from `channels` or from all channels if none are given."""
+        return self._request("UNSUBSCRIBE", channels, allow_empty=True)
+
+    def punsubscribe(self, *patterns: Union[str, bytes]) -> bytes:
+        """Unsubscribe from `patterns` or from all patterns if none are given."""
+        return self._request("PUNSUBSCRIBE", patterns, allow_empty=True)
+
+    def sunsubscribe(self, *channels: Union[str, bytes]) -> bytes:
+        """Unsubscribe from shard `channels` or from all of them if none are given."""
+        return self._request("SUNSUBSCRIBE", channels, allow_empty=True)
+
+    def _request(self, name, channels, allow_empty=False) -> bytes:
+        if self._broken:
+            raise ConnectionError()
+        if not channels and not allow_empty:
+            raise ValueError(f"'{name}' requires at least one channel.")
+        return bytes(Command(f"{name} {{}}", Args(channels)))
+
+    def receive(self, data: Union[bytes, memoryview]) -> List[Message]:
+        """Feed data received from redis and return all messages completed by it.
+
+        Every message already in the reader is decoded at once so consumers can
+        process them in batches instead of going back to the connection for each.
+        An error reply is raised once the messages before it were returned, the
+        messages after it are returned by the following calls.
+        """
+        if self._broken:
+            raise ConnectionError()
+        reader = self._reader
+        reader.feed(data)
+        if data:
+            self._adapt_read_size(len(data))
+
+        pending = self._pending
+        while True:
+            frame = reader.gets()
+            if frame is NOT_ENOUGH_DATA:
+                break
+            if isinstance(frame, hiredis.ReplyError):
+                pending.append(CommandError(str(frame)))
+                continue
+
+            kind = frame[0]
+            if kind == b"message" or kind == b"smessage":
+                pending.append(Message(frame[1], frame[2]))
+            elif kind == b"pmessage":
+                pending.append(Message(frame[2], frame[3], frame[1]))
+            elif kind in _SUBSCRIBED:
+                getattr(self, _SUBSCRIBED[kind]).add(frame[1])
+            elif kind in _UNSUBSCRIBED:
+                subscriptions = getattr(self, _UNSUBSCRIBED[kind])
+                if frame[1] is None:  # wasn't subscribed to anything
+                    subscriptions.clear()
+                else:
+                    subscriptions.discard(frame[1])
+            # anything else e.g. a `pong` or an unrelated push is ignored
+
+        if pending and type(pending[0]) is CommandError:
+            raise pending.popleft()
+        messages = []
+        while pending and type(pending[0]) is not CommandError:
+            messages.append(pending.popleft())
+        return messages
+
+    def buffer_updated(self, nbytes: int) -> List[Message]:
+        """Like `receive` for `nbytes` of data read into the buffer from `get_buffer`."""
+        return self.receive(self._buffer[:nbytes])
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from itertools import cycle
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .command import Command
+from .multiexec import MultiExec
+
+Address = Tuple[str, int]
+CommandType = Union[Command, MultiExec]
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+BALANCING = (ROUND_ROBIN, LEAST_OUTSTANDING)
+
+INFO_REPLICATION = Command("INFO replication")
+
+
+def is_read_only(commands: Iterable[CommandType]) -> bool:
+    """Whether a batch only consists of read-only commands that replicas can serve.
+
+    Transactions and commands unknown to the command table go to the primary.
+    """
+    for command in commands:
+        if not isinstance(command, Command):
+            return False
+        info = command._info
+        if info is None or not info.readonly:
+            return False
+    return True
+
+
+class ReplicaOffset(NamedTuple):
+    address: Address
+    offset: int
+    online: bool
+
+
+class ReplicationInfo(NamedTuple):
+    role: str
+    offset: int  # of the replication stream of the primary
+    replicas: List[ReplicaOffset]
+
+    def replicas_within(self, max_lag: Optional[int]) -> List[Address]:
+        """Online replicas trailing the primary by at most `max_lag` bytes."""
+        return [
+            replica.address
+            for replica in self.replicas
+            if replica.online
+            and (max_lag is None or self.offset - replica.offset <= max_lag)
+        ]
+
+
+def parse_replication_info(info: Union[bytes, str]) -> ReplicationInfo:
+    """Parse the reply to `INFO replication` of a primary."""
+    if isinstance(info, bytes):
+        info = info.decode()
+    fields = {}
+    for line in info.splitlines():
+        name, colon, value = line.partition(":")
+        if colon and not name.startswith("#"):
+            fields[name.strip()] = value.strip()
+
+    replicas = []
+    for index in range(int(fields.get("connected_slaves", 0))):
+        replica = fields.get(f"slave{index}")
+        if replica is None:
+            continue
+        # e.g. ip=127.0.0.1,port=6380,state=online,offset=1234,lag=0
+        values = dict(item.partition("=")[::2] for item in replica.split(","))
+        replicas.append(
+            ReplicaOffset(
+                (values["ip"], int(values["port"])),
+                int(values.get("offset", 0)),
+                values.get("state") == "online",
+            )
+        )
+    return ReplicationInfo(
+        fields.get("role", "master"), int(fields.get("master_repl_offset", 0)), replicas
+    )
+
+
+class ReplicaSelector:
+    """Balances read-only batches across replicas.
+
+    `ROUND_ROBIN` takes turns while `LEAST_OUTSTANDING` picks the replica with
+    the fewest batches in flight as tracked by `started` and `finished`.
+    """
+
+    def __init__(self, replicas: Sequence[Address] = (), balancing: str = ROUND_ROBIN):
+        if balancing not in BALANCING:
+            raise ValueError(
+                f"Unknown balancing {balancing!r}, use one of {', '.join(BALANCING)}."
+            )
+        self._balancing = balancing
+        self._outstanding: Dict[Address, int] = {}
+        self._turns: Optional[Iterator[Address]] = None
+        self.replicas = replicas
+
+    @property
+    def replicas(self) -> List[Address]:
+        return list(self._outstanding)
+
+    @replicas.setter
+    def replicas(self, replicas: Sequence[Address]) -> None:
+        outstanding = self._outstanding
+        addresses = [(host, port) for host, port in replicas]
+        self._outstanding = {
+            address: outstanding.get(address, 0) for address in addresses
+        }
+        self._turns = cycle(list(self._outstanding)) if self._outstanding else None
+        self.degraded = False
+
+    def remove(self, address: Address) -> None:
+        """Stop selecting a replica e.g. because it is unreachable.
+
+        The selector stays `degraded` until its replicas are set again.
+        """
+        if address in self._outstanding:
+            self.replicas = [
+                replica for replica in self._outstanding if replica != address
+            ]
+            self.degraded = True
+
+    def select(self) -> Optional[Address]:
+        """The replica to send the next read-only batch to or `None` if there are none."""
+        if self._turns is None:
+            return None
+        if self._balancing == ROUND_ROBIN:
+            return next(self._turns)
+        outstanding = self._outstanding
+        # start from the next in turn so ties don't always favour the same replica
+        first = next(self._turns)
+        return min(
+            outstanding, key=lambda address: (outstanding[address], address != first)
+        )
+
+    def started(self, address: Address) -> None:
+        if address in self._outstanding:
+            self._outstanding[address] += 1
+
+    def finished(self, address: Address) -> None:
+        if self._outstanding.get(address, 0) > 0:
+            self._outstanding[address] -= 1
@@ -1,40 +1,100 @@
+from collections import deque
+from time import perf_counter
+
 import hiredis
-from outcome import capture, Error
+from outcome import capture, Error, Outcome
 
-from typing import Iterable, Any, Union
+from typing import Iterable, Iterator, Any, Union, Optional, Dict, Set, Tuple
 
-from .utils import partition
 from .errors import ConnectionError, PipelineError
 from .supported_commands import check_for_unsupported_commands
+from .cache import ClientSideCache, MISS, cached_keys
+from .script import Loading, with_loads
+from .instrumentation import BatchStats, Instrumentation
 
-from reddish._core.command import Command
+from reddish._core.command import Command, ZERO_COPY
 from reddish._core.multiexec import MultiExec
 
 NOT_ENOUGH_DATA = object()
 
+MIN_READ_SIZE = 4096
+MAX_READ_SIZE = 1 << 20
+SHRINK_AFTER = 16  # consecutive reads that filled less than a quarter of the buffer
+WRITE_CHUNK_SIZE = 1 << 16
+MAX_PUSHES = 1024  # push frames kept until they are popped, older ones are dropped
+
 CommandType = Union[Command, MultiExec]
 
 
 class ReplyBuffer:
-    def __init__(self, commands: Iterable[CommandType]):
-        self._commands = commands
-        self._expected_replies = [len(cmd) for cmd in commands]
-        self._buffer: list[Any] = []
+    __slots__ = (
+        "_commands",
+        "_index",
+        "_replies",
+        "_outcomes",
+        "_cache",
+        "_cached_replies",
+        "_cacheable",
+        "_owner",
+        "internal",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        commands: Iterable[CommandType],
+        cache: Optional[ClientSideCache] = None,
+        cached_replies: Optional[Dict[int, Any]] = None,
+        cacheable: Optional[Dict[int, Tuple[bytes, ...]]] = None,
+        internal: bool = False,
+        stats: Optional[BatchStats] = None,
+        owner: object = None,
+    ):
+        self._commands = tuple(commands)
+        self._index = 0  # of the command receiving replies
+        self._replies: list[Any] = []  # for the command receiving replies
+        self._outcomes: list[Outcome] = []  # not handed out yet
+        self._cache = cache
+        self._cached_replies = cached_replies or {}  # by index of the command
+        self._cacheable = cacheable or {}  # keys by index of the command
+        self._owner = owner  # of the replies put into the cache
+        self.internal = internal  # sent by `RedisSansIO` itself
+        self.stats = stats  # only with instrumentation
+        self._skip_cached()
 
     def append(self, reply: Any) -> None:
-        self._buffer.append(reply)
+        replies = self._replies
+        replies.append(reply)
+        index = self._index
+        command = self._commands[index]
+        if len(replies) == len(command):
+            if index in self._cacheable:
+                self._cache.set(command, self._cacheable[index], reply, self._owner)
+            self._outcomes.append(capture(command._parse_response, *replies))
+            self._replies = []
+            self._index = index + 1
+            self._skip_cached()
+
+    def _skip_cached(self) -> None:
+        # commands served from the cache get their outcome without any reply
+        cached_replies = self._cached_replies
+        while self._index in cached_replies:
+            index = self._index
+            reply = cached_replies.pop(index)
+            command = self._commands[index]
+            self._outcomes.append(capture(command._parse_response, reply))
+            self._index = index + 1
 
     @property
     def complete(self) -> bool:
-        return len(self._buffer) == sum(self._expected_replies)
+        return self._index == len(self._commands)
 
-    def parse_replies(self) -> Any:
-        replies = partition(self._buffer, self._expected_replies)
+    def pop_outcomes(self) -> list:
+        outcomes, self._outcomes = self._outcomes, []
+        return outcomes
 
-        outcomes = tuple(
-            capture(cmd._parse_response, *reply)
-            for cmd, reply in zip(self._commands, replies)
-        )
+    def parse_replies(self) -> Any:
+        outcomes = tuple(self.pop_outcomes())
 
         if any(isinstance(outcome, Error) for outcome in outcomes):
             raise PipelineError(outcomes)
@@ -42,51 +102,463 @@ class ReplyBuffer:
             return [outcome.unwrap() for outcome in outcomes]
 
 
+def _encode_in_chunks(
+    commands: Iterable[CommandType], chunk_size: int
+) -> Iterator[Union[bytes, memoryview]]:
+    chunk = []
+    size = 0
+    first = True  # nothing was yielded yet
+    for cmd in commands:
+        encoded = getattr(cmd, "_encoded", False)
+        if encoded is None:  # never encoded
+            data = cmd._encode()
+            if first and size + len(data) < chunk_size:
+                # requests that fit in a single chunk keep their encoding like
+                # `bytes(cmd)` while bulk loads don't hold a second copy of their
+                # data until the replies arrive
+                cmd._encoded = data
+            chunk.append(data)
+            size += len(data)
+        elif encoded is not ZERO_COPY:
+            data = bytes(cmd)
+            chunk.append(data)
+            size += len(data)
+        else:
+            # large buffers are passed on as they are instead of copying them
+            for segment in cmd._segments():
+                if len(segment) < chunk_size:
+                    chunk.append(segment)
+                    size += len(segment)
+                    continue
+                if chunk:
+                    yield b"".join(chunk)
+                    chunk = []
+                    size = 0
+                first = False
+                yield segment
+        if size >= chunk_size:
+            first = False
+            yield b"".join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield b"".join(chunk)
+
+
 class ProtocolError(Exception):
     pass
 
 
-class RedisSansIO:
-    def __init__(self, reader=None):
+PushNotification = getattr(hiredis, "PushNotification", None)  # hiredis >= 3.0
+
+
+class AdaptiveReadBuffer:
+    """Reusable buffer for reading from a connection that adapts to the reply sizes."""
+
+    def __init__(self):
+        self._buffer = memoryview(bytearray(MIN_READ_SIZE))
+        self._small_reads = 0
+
+    @property
+    def read_size(self) -> int:
+        """Number of bytes to read from the connection at once.
+
+        Grows while reads fill the whole buffer and shrinks again once replies get
+        smaller so large replies take fewer reads.
+        """
+        return len(self._buffer)
+
+    def get_buffer(self) -> memoryview:
+        """Reusable buffer for reading data from the connection into."""
+        return self._buffer
+
+    def _adapt_read_size(self, nbytes: int) -> None:
+        size = len(self._buffer)
+        if nbytes >= size and size < MAX_READ_SIZE:
+            self._buffer = memoryview(bytearray(2 * size))
+            self._small_reads = 0
+        elif nbytes < size // 4 and size > MIN_READ_SIZE:
+            self._small_reads += 1
+            if self._small_reads >= SHRINK_AFTER:
+                self._buffer = memoryview(bytearray(size // 2))
+                self._small_reads = 0
+        else:
+            self._small_reads = 0
+
+
+class RedisSansIO(AdaptiveReadBuffer):
+    def __init__(
+        self,
+        reader=None,
+        cache: Optional[ClientSideCache] = None,
+        protocol: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        """Sans-io state of a connection to redis.
+
+        Args:
+            reader: the `hiredis.Reader` to parse replies with.
+            cache: a `ClientSideCache` serving replies of read-only commands.
+            protocol: `2` for RESP2 or `3` for negotiating RESP3 with `HELLO 3`
+                before the first batch. Defaults to `3` with a cache and to `2`
+                otherwise.
+            instrumentation: hooks called for every batch e.g. a `LatencyRecorder`.
+        """
+        super().__init__()
+        if protocol is None:
+            protocol = 2 if cache is None else 3
+        if protocol not in (2, 3):
+            raise ValueError(f"Unknown protocol version '{protocol}'.")
+        if protocol == 3 and PushNotification is None:
+            raise RuntimeError("RESP3 requires 'hiredis>=3.0.0'")
+        if cache is not None and protocol != 3:
+            raise ValueError("Client side caching requires RESP3.")
         self._reader = reader or hiredis.Reader(notEnoughData=NOT_ENOUGH_DATA)
-        self._reply_buffer = None
+        self._protocol = protocol
+        self._cache = cache
+        self._cache_owner = object()  # marks cached replies read by this connection
+        # commands sent ahead of the first batch to set up the connection
+        self._handshake: Tuple[Command, ...] = ()
+        if protocol == 3:
+            self._handshake += (Command("HELLO 3"),)
+        if cache is not None:
+            self._handshake += (Command("CLIENT TRACKING ON"),)
+        self._pushes: deque[list] = deque(maxlen=MAX_PUSHES)  # awaiting `pop_pushes`
+        self._loaded_scripts: Set[str] = set()  # scripts and libraries, see `Script`
+        self._reply_buffers: deque[ReplyBuffer] = deque()  # awaiting replies
+        self._completed: deque[ReplyBuffer] = deque()  # awaiting `receive`
         self._broken = False
+        self._instrumentation = instrumentation
+        self._decoding_since: Optional[float] = None  # see `_batch_completed`
 
     def mark_broken(self):
         self._broken = True
+        if self._cache is not None:
+            # keys read over this connection are not tracked anymore
+            self._cache.clear()
+
+    @property
+    def broken(self) -> bool:
+        return self._broken
+
+    @property
+    def protocol(self) -> int:
+        return self._protocol
+
+    @property
+    def caching(self) -> bool:
+        """Whether replies may be served from a cache.
+
+        Clients should pass data that arrived while waiting for no replies to
+        `receive_pushes` before sending a batch so invalidations are handled
+        before the cache serves replies.
+        """
+        return self._cache is not None
+
+    def pop_pushes(self) -> list:
+        """Return push frames received since the last call, e.g. invalidations.
+
+        Push frames are only sent by redis with RESP3 and are kept apart from the
+        replies to commands. Invalidations handled by a cache are not included.
+        """
+        pushes = list(self._pushes)
+        self._pushes.clear()
+        return pushes
+
+    def buffer_updated(self, nbytes: int) -> Any:
+        """Like `receive` for `nbytes` of data read into the buffer from `get_buffer`."""
+        return self.receive(self._buffer[:nbytes])
+
+    @property
+    def in_flight(self) -> int:
+        """Number of sent batches whose replies have not been returned yet."""
+        return len(self._reply_buffers) + len(self._completed)
 
     def send(self, commands: Iterable[CommandType]) -> bytes:
+        """Queue a batch of commands and return the request to be sent.
+
+        More batches may be sent while replies for earlier batches are still
+        outstanding. Their replies are returned by `receive` in the same order.
+        """
+        instrumentation = self._instrumentation
+        handshake = self._handshake
+        if instrumentation is None:
+            to_send = self._queue(commands)
+            try:
+                return b"".join(bytes(cmd) for cmd in to_send)
+            except BaseException:
+                self._unqueue(to_send, handshake)
+                raise
+
+        stats = BatchStats(commands, perf_counter())
+        to_send = self._queue(commands, stats)
+        start = perf_counter()
+        try:
+            data = b"".join(bytes(cmd) for cmd in to_send)
+        except BaseException:
+            self._unqueue(to_send, handshake)
+            raise
+        stats.encode_time = perf_counter() - start
+        stats.encoded_bytes = len(data)
+        instrumentation.on_send(stats)
+        return data
+
+    def send_chunks(
+        self, commands: Iterable[CommandType], chunk_size: int = WRITE_CHUNK_SIZE
+    ) -> Iterator[Union[bytes, memoryview]]:
+        """Like `send` but encode the request lazily in chunks of about `chunk_size`.
+
+        The batch is queued immediately. Writing each chunk before requesting the
+        next one keeps memory bounded for very large batches.
+        """
+        handshake = self._handshake
+        if self._instrumentation is None:
+            to_send = self._queue(commands)
+            chunks = _encode_in_chunks(to_send, chunk_size)
+            return self._guarded_chunks(chunks, to_send, handshake)
+
+        stats = BatchStats(commands, perf_counter())
+        to_send = self._queue(commands, stats)
+        chunks = self._instrumented_chunks(
+            _encode_in_chunks(to_send, chunk_size), stats
+        )
+        return self._guarded_chunks(chunks, to_send, handshake)
+
+    def _guarded_chunks(
+        self,
+        chunks: Iterator[Union[bytes, memoryview]],
+        to_send: Iterable[CommandType],
+        handshake: Tuple[Command, ...],
+    ) -> Iterator[Union[bytes, memoryview]]:
+        written = False
+        try:
+            for chunk in chunks:
+                written = True
+                yield chunk
+        except BaseException:
+            if written:  # e.g. the request was only partly encoded
+                self._encoding_failed()
+            else:
+                self._unqueue(to_send, handshake)
+            raise
+
+    def _unqueue(self, to_send: Iterable[CommandType], handshake: Tuple) -> None:
+        # takes back the batch queued last e.g. when it failed to encode, nothing of
+        # it was written so the connection stays usable
+        reply_buffers = self._reply_buffers
+        reply_buffers.pop()
+        if handshake and not self._handshake:  # queued along with the batch
+            reply_buffers.pop()
+            self._handshake = handshake
+        for cmd in to_send:
+            if isinstance(cmd, Loading):
+                self._loaded_scripts.difference_update(cmd._load_ids)
+
+    def _encoding_failed(self) -> None:
+        # the queued batch won't be sent completely and no replies will arrive for it
+        self._reply_buffers.clear()
+        self._completed.clear()
+        self.mark_broken()
+
+    def _instrumented_chunks(
+        self, chunks: Iterator[Union[bytes, memoryview]], stats: BatchStats
+    ) -> Iterator[Union[bytes, memoryview]]:
+        while True:
+            start = perf_counter()
+            chunk = next(chunks, None)
+            stats.encode_time += perf_counter() - start
+            if chunk is None:
+                break
+            stats.encoded_bytes += len(chunk)
+            yield chunk
+        self._instrumentation.on_send(stats)  # type: ignore
+
+    def _queue(
+        self, commands: Iterable[CommandType], stats: Optional[BatchStats] = None
+    ) -> Iterable[CommandType]:
+        # queue a batch and return the commands that need to be sent to redis
         if self._broken:
             raise ConnectionError()
-        if self._reply_buffer is not None:
-            raise ProtocolError("Cannot send more commands")
         for cmd in commands:
             check_for_unsupported_commands(cmd)
-        self._reply_buffer = ReplyBuffer(commands)
-        return b"".join(bytes(cmd) for cmd in commands)
 
-    def receive(self, data: bytes) -> Any:
-        reply_buffer = self._reply_buffer
+        if self._handshake:
+            handshake, self._handshake = self._handshake, ()
+            self._reply_buffers.append(ReplyBuffer(handshake, internal=True))
+            return (*handshake, *self._queue(commands, stats))
+
+        commands = with_loads(commands, self._loaded_scripts)
+        cache = self._cache
+        if cache is None:
+            self._reply_buffers.append(ReplyBuffer(commands, stats=stats))
+            self._collect_completed()  # a batch without commands needs no replies
+            return commands
+
+        to_send = []
+        cached_replies = {}
+        cacheable = {}
+        for index, cmd in enumerate(commands):
+            keys = cached_keys(cmd)
+            if keys is not None:
+                reply = cache.get(cmd, self._cache_owner)
+                if reply is not MISS:
+                    cached_replies[index] = reply
+                    continue
+                cacheable[index] = keys
+            to_send.append(cmd)
+        self._reply_buffers.append(
+            ReplyBuffer(
+                commands,
+                cache,
+                cached_replies,
+                cacheable,
+                stats=stats,
+                owner=self._cache_owner,
+            )
+        )
+        self._collect_completed()  # e.g. all replies were served from the cache
+        return to_send
+
+    def receive(self, data: Union[bytes, memoryview]) -> Any:
+        """Feed data received from redis and return the replies of the oldest batch.
+
+        Returns `NOT_ENOUGH_DATA` if no batch is complete yet. As `data` may complete
+        more than a single batch, call `receive(b"")` to get the replies of further
+        completed batches.
+        """
+        self._feed(data)
+
+        if self._completed:
+            return self._completed.popleft().parse_replies()
+        else:
+            return NOT_ENOUGH_DATA
+
+    def receive_pushes(self, data: Union[bytes, memoryview]) -> None:
+        """Feed data that arrived while no replies were expected e.g. invalidations.
 
+        Data is passed on to the batches in flight if there are any.
+        """
+        if self.in_flight:
+            self._feed(data)
+            return
         if self._broken:
             raise ConnectionError()
-        if reply_buffer is None:
+        reader = self._reader
+        reader.feed(data)
+        while True:
+            reply = reader.gets()
+            if reply is NOT_ENOUGH_DATA:
+                return
+            if type(reply) is not PushNotification:
+                self.mark_broken()
+                raise ProtocolError("Received a reply but no commands were queued")
+            self._handle_push(reply)
+
+    def receive_outcomes(self, data: Union[bytes, memoryview]) -> list:
+        """Feed data received from redis and return outcomes for the oldest batch.
+
+        Unlike `receive`, which waits for the replies of the whole batch, this
+        returns an `Outcome` for every command whose reply arrived since the last
+        call (possibly none). The batch is done once outcomes for all of its
+        commands have been returned.
+        """
+        self._feed(data)
+
+        if self._completed:
+            return self._completed.popleft().pop_outcomes()
+        elif self._reply_buffers[0].internal:
+            return []  # still setting up the connection
+        else:
+            return self._reply_buffers[0].pop_outcomes()
+
+    def receive_all_outcomes(self, data: Union[bytes, memoryview]) -> list:
+        """Like `receive_outcomes` but return the outcomes of all batches in order.
+
+        This suits streaming commands where many batches are in flight at once.
+        """
+        self._feed(data)
+
+        outcomes = []
+        completed = self._completed
+        while completed:
+            outcomes += completed.popleft().pop_outcomes()
+        reply_buffers = self._reply_buffers
+        if reply_buffers and not reply_buffers[0].internal:
+            outcomes += reply_buffers[0].pop_outcomes()
+        return outcomes
+
+    def _feed(self, data: Union[bytes, memoryview]) -> None:
+        if self._broken:
+            raise ConnectionError()
+        if not self.in_flight:
             raise ProtocolError(
                 "Cannot receive replies because no commands where queued"
             )
         reader = self._reader
         reader.feed(data)
+        if data:
+            self._adapt_read_size(len(data))
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            self._decoding_started(data)
 
+        reply_buffers = self._reply_buffers
         while True:
             reply = reader.gets()
             if reply is NOT_ENOUGH_DATA:
                 break  # no more complete replies in the reader
+            elif type(reply) is PushNotification:
+                self._handle_push(reply)  # may arrive at any time
             else:
-                reply_buffer.append(reply)
+                assert reply_buffers, "received a reply but no commands were queued"
+                reply_buffers[0].append(reply)
+                self._collect_completed()
+
+        if instrumentation is not None:
+            self._decoding_finished()
+
+    def _decoding_started(self, data: Union[bytes, memoryview]) -> None:
+        self._decoding_since = now = perf_counter()
+        stats = self._reply_buffers[0].stats if self._reply_buffers else None
+        if stats is not None and data:
+            stats.reply_bytes += len(data)
+            if stats.first_byte is None:
+                stats.first_byte = now
+                self._instrumentation.on_first_byte(stats)  # type: ignore
+
+    def _decoding_finished(self) -> None:
+        stats = self._reply_buffers[0].stats if self._reply_buffers else None
+        if stats is not None:
+            stats.decode_time += perf_counter() - self._decoding_since
+        self._decoding_since = None
 
-        if reply_buffer.complete:
-            assert not reader.has_data(), "reader has more data but shouldnt"
-            self._reply_buffer = None
-            return reply_buffer.parse_replies()
+    def _batch_completed(self, stats: BatchStats) -> None:
+        stats.completed = now = perf_counter()
+        if self._decoding_since is not None:
+            # the rest of the data being decoded counts towards the next batch
+            stats.decode_time += now - self._decoding_since
+            self._decoding_since = now
+        self._instrumentation.on_complete(stats)  # type: ignore
+
+    def _collect_completed(self):
+        reply_buffers = self._reply_buffers
+        while reply_buffers and reply_buffers[0].complete:
+            reply_buffer = reply_buffers.popleft()
+            if reply_buffer.internal:
+                try:
+                    reply_buffer.parse_replies()
+                except PipelineError as error:
+                    self.mark_broken()
+                    raise ConnectionError(
+                        "Setting up the connection failed."
+                    ) from error
+            else:
+                self._completed.append(reply_buffer)
+                if reply_buffer.stats is not None:
+                    self._batch_completed(reply_buffer.stats)
+
+    def _handle_push(self, push) -> None:
+        if push[0] == b"invalidate" and self._cache is not None:
+            self._cache.invalidate(push[1])
         else:
-            return NOT_ENOUGH_DATA
+            self._pushes.append(push)
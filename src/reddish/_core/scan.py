@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional, Set, Union
+
+from .command import Command
+
+SCAN, HSCAN, SSCAN, ZSCAN = "SCAN", "HSCAN", "SSCAN", "ZSCAN"
+PAIRWISE = frozenset({HSCAN, ZSCAN})  # reply fields and values or members and scores
+
+Key = Union[str, bytes]
+
+
+class ScanSansIO:
+    """Walks a keyspace or a collection page by page with a command of the SCAN family.
+
+    The `COUNT` of the next page is adapted such that a page takes about
+    `target_latency` seconds from sending the command to receiving the reply.
+    Redis may return an element more than once during a full iteration which
+    are left out by remembering all elements seen so far unless `dedupe` is false.
+    """
+
+    def __init__(
+        self,
+        command: str = SCAN,
+        key: Optional[Key] = None,
+        *,
+        match: Optional[Key] = None,
+        type: Optional[str] = None,
+        count: int = 100,
+        target_latency: Optional[float] = 0.005,
+        max_count: int = 10_000,
+        dedupe: bool = True,
+    ):
+        command = command.upper()
+        if command not in (SCAN, HSCAN, SSCAN, ZSCAN):
+            raise ValueError(f"'{command}' is not a command of the SCAN family.")
+        if (command == SCAN) == (key is not None):
+            raise ValueError(
+                f"'{command}' requires a key."
+                if key is None
+                else "'SCAN' iterates over the keyspace and takes no key."
+            )
+        if type is not None and command != SCAN:
+            raise ValueError("Only 'SCAN' can filter by type.")
+        if count < 1 or max_count < count:
+            raise ValueError("'count' must be between 1 and 'max_count'.")
+
+        template = (
+            f"{command} {{key}} {{cursor}}" if key is not None else "SCAN {cursor}"
+        )
+        fields = {"key": key} if key is not None else {}
+        if match is not None:
+            template += " MATCH {match}"
+            fields["match"] = match
+        if type is not None:
+            template += " TYPE {type}"
+            fields["type"] = type
+        self._template = Command.template(template + " COUNT {count}")
+        self._fields = fields
+        self._pairwise = command in PAIRWISE
+
+        self.cursor: Union[int, bytes] = 0
+        self.count = count
+        self.done = False
+        self._target_latency = target_latency
+        self._max_count = max_count
+        self._seen: Optional[Set[Any]] = set() if dedupe else None
+
+    def next_command(self) -> Command:
+        """The command requesting the next page."""
+        if self.done:
+            raise RuntimeError("The scan is already complete.")
+        return self._template(cursor=self.cursor, count=self.count, **self._fields)
+
+    def page(self, reply, elapsed: Optional[float] = None) -> List[Any]:
+        """Process the reply to the last command and return the elements of its page.
+
+        Args:
+            reply: the reply to the command from `next_command`.
+            elapsed: seconds it took to receive the reply for adapting `COUNT`.
+
+        Returns:
+            The elements of the page not seen before. For `HSCAN` and `ZSCAN` these
+            are `(field, value)` and `(member, score)` tuples.
+        """
+        cursor, elements = reply
+        self.cursor = cursor
+        self.done = cursor in (b"0", "0", 0)
+        if elapsed is not None:
+            self._adapt(elapsed)
+
+        if self._pairwise:
+            elements = list(zip(elements[::2], elements[1::2]))
+        seen = self._seen
+        if seen is None:
+            return elements
+        # pairs are told apart by the field or member only, scores may change
+        pairwise = self._pairwise
+        fresh = []
+        for element in elements:
+            marker = element[0] if pairwise else element
+            if marker not in seen:
+                seen.add(marker)
+                fresh.append(element)
+        return fresh
+
+    def _adapt(self, elapsed: float) -> None:
+        target = self._target_latency
+        if target is None:
+            return
+        # scale toward the target but at most by a factor of 2 per page to
+        # keep a single slow or fast page from throwing it off
+        factor = target / elapsed if elapsed > 0 else 2.0
+        factor = min(2.0, max(0.5, factor))
+        self.count = min(self._max_count, max(1, round(self.count * factor)))
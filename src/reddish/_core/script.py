@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import re
+from hashlib import sha1
+from typing import Any, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from outcome import Error, Value
+from hiredis import ReplyError
+
+from .command import Args, Command, _compile
+from .errors import CommandError, PipelineError
+from .multiexec import MultiExec
+
+CommandType = Union[Command, MultiExec]
+Part = Union[int, float, str, bytes]
+
+_LIBRARY_NAME = re.compile(r"^#!\w+.*\bname=(\S+)")
+
+
+class ScriptCommand(Command):
+    """Calls a script or function that may need to be loaded into redis first."""
+
+    __slots__ = ("_load", "_load_id")
+
+    _load: Command  # loads the script or library
+    _load_id: str  # tells different scripts and libraries apart
+
+    @classmethod
+    def _create(cls, template, load, load_id, *args):
+        compiled, supported, info = _compile(template)
+        new = cls._from_template(compiled, supported, info, args, {})
+        new._load = load
+        new._load_id = load_id
+        return new
+
+    def _not_loaded(self, error: BaseException) -> bool:
+        # whether an error means that redis doesn't know the script or function
+        if not isinstance(error, CommandError):
+            return False
+        if self._load_id.startswith("function:"):
+            return error.code == "ERR" and error.message.startswith(
+                "Function not found"
+            )
+        return error.code == "NOSCRIPT"
+
+
+class Script:
+    """A Lua script executed with `EVALSHA` to avoid sending it every time.
+
+    Connections load the script with `SCRIPT LOAD` in the same request as its
+    first call. If redis lost the script in the meantime e.g. after `SCRIPT FLUSH`,
+    calls failing with `NOSCRIPT` are retried after loading it again.
+    """
+
+    def __init__(self, source: Union[str, bytes]):
+        """Create a script from its Lua source.
+
+        Args:
+            source: the Lua source of the script
+        """
+        if isinstance(source, str):
+            source = source.encode()
+        self.source = source
+        self.sha = sha1(source).hexdigest()
+        self._load = Command("SCRIPT LOAD {}", source)
+
+    def __call__(
+        self, keys: Sequence[Part] = (), args: Sequence[Part] = ()
+    ) -> ScriptCommand:
+        """Create a command calling the script.
+
+        Args:
+            keys: keys the script accesses available as `KEYS` in the script
+            args: further arguments available as `ARGV` in the script
+
+        Returns:
+            A command that can be executed like any other.
+        """
+        return ScriptCommand._create(
+            "EVALSHA {} {} {} {}",
+            self._load,
+            self.sha,
+            self.sha,
+            len(keys),
+            Args(keys),
+            Args(args),
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(sha={self.sha!r})"
+
+
+class Library:
+    """A library of redis functions loaded on demand and called with `FCALL`.
+
+    Connections load the library with `FUNCTION LOAD REPLACE` in the same request
+    as the first call of one of its functions. Calls failing because the function
+    is unknown to redis e.g. after `FUNCTION FLUSH` are retried after loading the
+    library again.
+    """
+
+    def __init__(self, code: Union[str, bytes]):
+        """Create a library from its code.
+
+        Args:
+            code: the code of the library starting with a shebang naming it
+                e.g. `#!lua name=mylib`
+        """
+        if isinstance(code, str):
+            code = code.encode()
+        match = _LIBRARY_NAME.match(code.decode(errors="replace"))
+        if match is None:
+            raise ValueError(
+                "The library code has to start with '#!<engine> name=<name>'."
+            )
+        self.name = match.group(1)
+        self.code = code
+        self._load = Command("FUNCTION LOAD REPLACE {}", code)
+        self._load_id = f"function:{sha1(code).hexdigest()}"
+
+    def fcall(
+        self, function: str, keys: Sequence[Part] = (), args: Sequence[Part] = ()
+    ) -> ScriptCommand:
+        """Create a command calling a function of the library.
+
+        Args:
+            function: name of the function
+            keys: keys the function accesses
+            args: further arguments to the function
+
+        Returns:
+            A command that can be executed like any other.
+        """
+        return self._call("FCALL", function, keys, args)
+
+    def fcall_ro(
+        self, function: str, keys: Sequence[Part] = (), args: Sequence[Part] = ()
+    ) -> ScriptCommand:
+        """Like `fcall` with `FCALL_RO` for functions flagged as `no-writes`."""
+        return self._call("FCALL_RO", function, keys, args)
+
+    def _call(self, name, function, keys, args):
+        return ScriptCommand._create(
+            f"{name} {{}} {{}} {{}} {{}}",
+            self._load,
+            self._load_id,
+            function,
+            len(keys),
+            Args(keys),
+            Args(args),
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(name={self.name!r})"
+
+
+class Loading:
+    """A command preceded by loading the scripts and libraries of some calls."""
+
+    __slots__ = ("_load_ids", "_loads", "_command")
+
+    _supported = True  # checked when its command was sent for the first time
+
+    def __init__(self, calls: Sequence[ScriptCommand], command: CommandType):
+        self._load_ids = [call._load_id for call in calls]
+        self._loads = [call._load for call in calls]
+        self._command = command
+
+    def _parse_response(self, *replies):
+        num_loads = len(self._loads)
+        for reply in replies[:num_loads]:
+            if isinstance(reply, ReplyError):
+                raise CommandError(str(reply))  # e.g. the script doesn't compile
+        return self._command._parse_response(*replies[num_loads:])
+
+    def __len__(self):
+        return len(self._loads) + len(self._command)
+
+    def __bytes__(self):
+        return b"".join([*(bytes(load) for load in self._loads), bytes(self._command)])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._command!r})"
+
+
+def _script_commands(command: Any) -> Iterable[ScriptCommand]:
+    if isinstance(command, ScriptCommand):
+        yield command
+    elif isinstance(command, MultiExec):
+        for cmd in command:
+            if isinstance(cmd, ScriptCommand):
+                yield cmd
+
+
+def with_loads(
+    commands: Sequence[CommandType], loaded: Set[str]
+) -> Sequence[CommandType]:
+    """Precede commands calling scripts or functions not in `loaded` by loading them.
+
+    Args:
+        commands: the batch of commands to be sent.
+        loaded: ids of the scripts and libraries loaded over the connection,
+            updated with the ones loaded by the returned commands.
+    """
+    prepared = None
+    for index, command in enumerate(commands):
+        if isinstance(command, Loading):
+            loaded.update(command._load_ids)  # e.g. retried calls
+            continue
+        calls = []
+        for call in _script_commands(command):
+            if call._load_id not in loaded:
+                loaded.add(call._load_id)
+                calls.append(call)
+        if calls:
+            if prepared is None:
+                prepared = list(commands)
+            prepared[index] = Loading(calls, command)
+    return commands if prepared is None else prepared
+
+
+class ScriptRetry:
+    """Script and function calls of a batch to be executed again after loading them.
+
+    Only calls outside of transactions are retried as the other commands of a
+    transaction were executed already. Retried calls are executed after all other
+    commands of the batch.
+    """
+
+    def __init__(self, outcomes: Sequence[Any], indices: List[int], commands):
+        self._outcomes = list(outcomes)
+        self._indices = indices
+        retried = []
+        reloaded = set()
+        for index in indices:
+            call = commands[index]
+            if call._load_id in reloaded:
+                retried.append(call)
+            else:
+                reloaded.add(call._load_id)
+                retried.append(Loading([call], call))
+        self.commands: Tuple[CommandType, ...] = tuple(retried)
+
+    @classmethod
+    def from_error(
+        cls, commands: Sequence[CommandType], error: PipelineError
+    ) -> Optional[ScriptRetry]:
+        """The calls to retry or `None` if none of them failed for not being loaded."""
+        outcomes = error.outcomes
+        indices = [
+            index
+            for index, (command, outcome) in enumerate(zip(commands, outcomes))
+            if isinstance(command, ScriptCommand)
+            and isinstance(outcome, Error)
+            and command._not_loaded(outcome.error)
+        ]
+        return cls(outcomes, indices, commands) if indices else None
+
+    def resolve(self, replies: Union[List[Any], PipelineError]) -> List[Any]:
+        """Combine the replies of the retried calls with the rest of the batch.
+
+        Args:
+            replies: replies of the retried calls or the error raised for them
+
+        Returns:
+            The replies of the whole batch.
+        """
+        if isinstance(replies, PipelineError):
+            retried = list(replies.outcomes)
+        else:
+            retried = [Value(reply) for reply in replies]
+        outcomes = self._outcomes
+        for index, outcome in zip(self._indices, retried):
+            outcomes[index] = outcome
+        if any(isinstance(outcome, Error) for outcome in outcomes):
+            raise PipelineError(tuple(outcomes))
+        return [outcome.unwrap() for outcome in outcomes]
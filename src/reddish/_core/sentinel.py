@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+from outcome import Error, Outcome
+
+from .command import Command
+from .errors import CommandError, PipelineError
+from .pubsub import Message
+from .utils import to_str
+
+Address = Tuple[str, int]
+Connection = TypeVar("Connection")
+
+SWITCH_MASTER = "+switch-master"
+ROLE = Command("ROLE")
+
+
+def get_primary_address(service_name: str) -> Command:
+    return Command("SENTINEL GET-MASTER-ADDR-BY-NAME {}", service_name)
+
+
+def parse_address(reply) -> Optional[Address]:
+    """The address in the reply to `SENTINEL GET-MASTER-ADDR-BY-NAME`."""
+    if not reply:
+        return None  # the sentinel doesn't monitor the service
+    host, port = reply
+    return to_str(host), int(port)
+
+
+def parse_switch_master(message: Message, service_name: str) -> Optional[Address]:
+    """The new primary announced by a `+switch-master` message for the service."""
+    # e.g. "mymaster 127.0.0.1 6379 127.0.0.1 6380"
+    fields = to_str(message.data).split()
+    if len(fields) != 5 or fields[0] != service_name:
+        return None
+    _, _, _, host, port = fields
+    return host, int(port)
+
+
+def is_primary(role_reply) -> bool:
+    """Whether the reply to `ROLE` is from a primary."""
+    return to_str(role_reply[0]) == "master"
+
+
+def failed_over(error: Union[BaseException, Outcome]) -> bool:
+    """Whether an error or outcome suggests the server stopped being the primary."""
+    if isinstance(error, Error):
+        error = error.error
+    if isinstance(error, PipelineError):
+        return any(failed_over(outcome) for outcome in error.outcomes)
+    return isinstance(error, CommandError) and error.code == "READONLY"
+
+
+class PrimaryConnections(Generic[Connection]):
+    """Connection to the current primary and older ones still draining.
+
+    Connections are retired when the primary changes. Batches in flight on
+    a retired connection are allowed to finish before it is closed while new
+    batches already use a connection to the new primary.
+    """
+
+    def __init__(self):
+        self.address: Optional[Address] = None
+        self.current: Optional[Connection] = None
+        self._in_flight: Dict[Connection, int] = {}
+        self._retired: List[Connection] = []
+
+    def connected(self, connection: Connection) -> None:
+        self.current = connection
+        self._in_flight[connection] = 0
+
+    def started(self, connection: Connection) -> None:
+        self._in_flight[connection] += 1
+
+    def finished(self, connection: Connection) -> List[Connection]:
+        """Count a batch as done and return retired connections to close."""
+        self._in_flight[connection] -= 1
+        return self._drained()
+
+    def switch(self, address: Optional[Address]) -> List[Connection]:
+        """Move on to a new primary and return retired connections to close.
+
+        `None` retires the current connection without knowing the new primary.
+        """
+        if address is not None and address == self.address:
+            return []
+        self.address = address
+        if self.current is not None:
+            self._retired.append(self.current)
+            self.current = None
+        return self._drained()
+
+    def retire(self, connection: Connection) -> List[Connection]:
+        """Stop using a connection e.g. because it broke."""
+        if connection is self.current:
+            self.current = None
+            self._retired.append(connection)
+        return self._drained()
+
+    def _drained(self) -> List[Connection]:
+        drained = [conn for conn in self._retired if not self._in_flight.get(conn)]
+        for connection in drained:
+            self._retired.remove(connection)
+            self._in_flight.pop(connection, None)
+        return drained
+
+    def close(self) -> List[Any]:
+        """All connections, draining or not, to close."""
+        connections = list(self._in_flight)
+        self._in_flight.clear()
+        self._retired.clear()
+        self.current = None
+        return connections
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Union
+
+from .sansio import RedisSansIO
+
+
+class StreamWindow:
+    """Keeps up to `window` commands of a stream in flight over a connection.
+
+    The window is refilled with a single batch once a quarter of it is free so
+    commands are sent in reasonably sized batches without waiting for round trips
+    between them.
+    """
+
+    def __init__(self, redis: RedisSansIO, window: int):
+        if window < 1:
+            raise ValueError("The window has to hold at least one command.")
+        self._redis = redis
+        self._window = window
+        self._refill_at = max(1, window // 4)
+        self.in_flight = 0  # commands sent whose outcomes were not returned yet
+        self.exhausted = False  # no more commands to send
+
+    @property
+    def wanted(self) -> int:
+        """Number of commands to send next or `0` if replies should be read first."""
+        if self.exhausted:
+            return 0
+        free = self._window - self.in_flight
+        return free if free >= self._refill_at else 0
+
+    @property
+    def done(self) -> bool:
+        return self.exhausted and not self.in_flight
+
+    def send_chunks(self, commands: List[Any]) -> Iterator[Union[bytes, memoryview]]:
+        """Queue the next commands of the stream and return the request in chunks.
+
+        Fewer commands than `wanted` mark the end of the stream.
+        """
+        if len(commands) < self.wanted:
+            self.exhausted = True
+        if not commands:
+            return iter(())
+        self.in_flight += len(commands)
+        return self._redis.send_chunks(commands)
+
+    def receive(self, data: Union[bytes, memoryview]) -> list:
+        """Feed data received from redis and return the outcomes arrived so far."""
+        if not self._redis.in_flight:
+            return []
+        return self.received(self._redis.receive_all_outcomes(data))
+
+    def received(self, outcomes: list) -> list:
+        """Count outcomes decoded elsewhere e.g. by a protocol as returned."""
+        self.in_flight -= len(outcomes)
+        return outcomes
+
+
+def take(commands: Iterator[Any], count: int) -> List[Any]:
+    return list(islice(commands, count))
+
+
+async def take_async(
+    commands: Union[Iterator[Any], AsyncIterator[Any]], count: int
+) -> List[Any]:
+    if not hasattr(commands, "__anext__"):
+        return take(commands, count)  # type: ignore
+    taken = []
+    while len(taken) < count:
+        try:
+            taken.append(await commands.__anext__())  # type: ignore
+        except StopAsyncIteration:
+            break
+    return taken
+
+
+def iterate(commands: Union[Iterable[Any], Any]) -> Any:
+    """Iterator over a sync or async iterable of commands."""
+    if hasattr(commands, "__aiter__"):
+        return commands.__aiter__()
+    return iter(commands)
@@ -16,21 +16,41 @@ UNSUPPORTED_COMMANDS = (
 def disallow_client_tracking(command):
     subcommand = get_subcommand(command, 1)
     if subcommand == "TRACKING":
-        raise UnsupportedCommandError("The 'CLIENT TRACKING' command is not supported.")
+        raise UnsupportedCommandError(
+            "The 'CLIENT TRACKING' command is not supported."
+            " Use a `ClientSideCache` for client side caching instead."
+        )
 
 
 UNSUPPORTED_SUBCOMMANDS = {"CLIENT": disallow_client_tracking}
 
 
+def command_support(name):
+    """Whether a command is supported judging by its name alone.
+
+    Returns `None` if that depends on the subcommand.
+    """
+    name = name.upper()
+    if name in UNSUPPORTED_COMMANDS:
+        return False
+    elif name in UNSUPPORTED_SUBCOMMANDS:
+        return None
+    else:
+        return True
+
+
 def check_for_unsupported_commands(command):
     if isinstance(command, MultiExec):
         for sub_command in command:
             check_for_unsupported_commands(sub_command)
+    elif command._supported:
+        return  # settled when the command's template was compiled
     else:
         name = command._command_name.upper()
         if name in UNSUPPORTED_COMMANDS:
+            hint = " Use a `Subscriber` instead." if name.endswith("SUBSCRIBE") else ""
             raise UnsupportedCommandError(
-                f"'{command._command_name}' is not supported."
+                f"'{command._command_name}' is not supported.{hint}"
             )
         elif name in UNSUPPORTED_SUBCOMMANDS:
             check = UNSUPPORTED_SUBCOMMANDS[name]
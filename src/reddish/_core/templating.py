@@ -1,5 +1,7 @@
+from functools import lru_cache
+from operator import itemgetter
 from string import Formatter
-from typing import Generator, Union, Tuple, Set, Any
+from typing import Generator, Union, Tuple, Set, Any, Dict, Optional
 
 
 FormatInfo = Tuple[str, Union[int, str, None], Union[str, None], Union[str, None]]
@@ -63,42 +65,118 @@ def format_error_message(
         assert False, "malformed info about missing arguments encountered"
 
 
-def apply_template(format_string: str, *args: Any, **kwargs: Any) -> list:
-    missing_positional_args = 0
-    missing_keyword_args = set()
-
-    data = []
-    for literal_text, field, spec, conversion in parse_command_template(format_string):
-        # extract literal commands
-        for command in literal_text.strip().split(" "):
-            if command:
-                data.append(command)
-
-        # process templated field
-        if field is not None:
-            if spec != "" or conversion is not None:
-                raise ValueError(
-                    f"{format_original_field(field, spec, conversion)} is not valid as placeholder"
-                )
-
-            if isinstance(field, int):  # positonal argument
-                try:
-                    value = args[field]
-                except IndexError:
-                    missing_positional_args += 1
-                    continue
-            else:  # keyword argument
-                try:
-                    value = kwargs[field]
-                except KeyError:
-                    missing_keyword_args.add(field)
-                    continue
-
-            data.append(value)
-
-    if missing_positional_args or missing_keyword_args:
-        raise TypeError(
+class CompiledTemplate:
+    """A command template that is parsed once and applied to data repeatedly."""
+
+    def __init__(self, format_string: str):
+        self.format_string = format_string
+
+        literals = []
+        positional_fields = []  # (part index, position)
+        keyword_fields = []  # (part index, name)
+        num_parts = 0
+
+        for literal_text, field, spec, conversion in parse_command_template(
+            format_string
+        ):
+            for command in literal_text.strip().split(" "):
+                if command:
+                    literals.append((num_parts, command))
+                    num_parts += 1
+
+            if field is not None:
+                if spec != "" or conversion is not None:
+                    raise ValueError(
+                        f"{format_original_field(field, spec, conversion)} is not valid as placeholder"
+                    )
+                if isinstance(field, int):
+                    positional_fields.append((num_parts, field))
+                else:
+                    keyword_fields.append((num_parts, field))
+                num_parts += 1
+
+        self.num_parts = num_parts
+        self.command_name: Optional[str] = (
+            literals[0][1] if literals and literals[0][0] == 0 else None
+        )
+        self.subcommand_name: Optional[str] = (
+            literals[1][1] if len(literals) > 1 and literals[1][0] == 1 else None
+        )
+        self.field_indices = tuple(
+            sorted(index for index, _ in positional_fields + keyword_fields)
+        )
+        self._positional_fields = tuple(positional_fields)
+        self._keyword_fields = tuple(keyword_fields)
+        self._literals = tuple(literal for _, literal in literals)
+        self._num_positional = (
+            max((pos for _, pos in positional_fields), default=-1) + 1
+        )
+        self._keywords = tuple(dict.fromkeys(name for _, name in keyword_fields))
+
+        # data gets laid out as (*literals, *keyword values, *positional values)
+        # so the parts of the command can be picked from it in a single call
+        keyword_offset = len(literals)
+        positional_offset = keyword_offset + len(self._keywords)
+        keyword_index = {name: i for i, name in enumerate(self._keywords)}
+        indices = [0] * num_parts
+        for i, (index, _) in enumerate(literals):
+            indices[index] = i
+        for index, name in keyword_fields:
+            indices[index] = keyword_offset + keyword_index[name]
+        for index, position in positional_fields:
+            indices[index] = positional_offset + position
+
+        if num_parts == 1:
+            self._pick = lambda values, i=indices[0]: (values[i],)
+        elif num_parts == 0:
+            self._pick = lambda values: ()
+        else:
+            self._pick = itemgetter(*indices)
+
+    def apply(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+        if len(args) < self._num_positional:
+            raise self._missing_arguments(args, kwargs)
+        try:
+            keyword_values = tuple([kwargs[name] for name in self._keywords])
+        except KeyError:
+            raise self._missing_arguments(args, kwargs) from None
+        return self._pick(self._literals + keyword_values + args)
+
+    def arguments(self, parts: Tuple[Any, ...]) -> Tuple[list, Dict[str, Any]]:
+        """Recover the positional and keyword arguments that produced `parts`."""
+        args = [None] * self._num_positional
+        for index, position in self._positional_fields:
+            args[position] = parts[index]
+        kwargs = {name: parts[index] for index, name in self._keyword_fields}
+        return args, kwargs
+
+    def unused_arguments(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+        """The arguments that no field of the template takes, `None` if there are none."""
+        if len(args) <= self._num_positional and len(kwargs) <= len(self._keywords):
+            return None  # all of them are used as `apply` found every field
+        unused_kwargs = {
+            name: value for name, value in kwargs.items() if name not in self._keywords
+        }
+        return args[self._num_positional :], unused_kwargs  # noqa: E203
+
+    def _missing_arguments(self, args, kwargs) -> TypeError:
+        missing_positional_args = sum(
+            1 for _, position in self._positional_fields if position >= len(args)
+        )
+        missing_keyword_args = {
+            name for _, name in self._keyword_fields if name not in kwargs
+        }
+        return TypeError(
             format_error_message(missing_positional_args, missing_keyword_args)
         )
 
-    return data
+
+@lru_cache(maxsize=1024)
+def compile_template(format_string: str) -> CompiledTemplate:
+    return CompiledTemplate(format_string)
+
+
+def apply_template(format_string: str, *args: Any, **kwargs: Any) -> list:
+    return list(compile_template(format_string).apply(args, kwargs))
@@ -3,6 +3,9 @@ from __future__ import annotations
 from itertools import islice
 from typing import Iterable, Generator, Tuple, Union
 
+# marks commands holding buffers which are encoded in segments instead of cached
+ZERO_COPY = object()
+
 
 def partition(
     iterable: Iterable, lenghts: Iterable[int]
@@ -26,3 +29,14 @@ def get_subcommand(command, index: int) -> Union[str, None]:
             return part.upper()
         else:
             return None
+
+
+def as_dict(value) -> dict:
+    # RESP3 maps arrive as dicts, RESP2 as flat lists of pairs
+    if isinstance(value, dict):
+        return value
+    return dict(zip(value[::2], value[1::2]))
+
+
+def to_str(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
@@ -1,6 +1,16 @@
 from reddish._core.command import Command
 from reddish._core.multiexec import MultiExec
-from typing import Union, TypeVar, overload, Any
+from typing import (
+    Union,
+    TypeVar,
+    overload,
+    Any,
+    Iterable,
+    Iterator,
+    AsyncIterable,
+    AsyncIterator,
+)
+from outcome import Outcome
 
 T = TypeVar("T", covariant=True)
 
@@ -63,6 +73,14 @@ class SyncRedis:
         self,
         *commands: CommandType[T],
     ) -> tuple[T, ...]: ...
+    #
+
+    def execute_iter(self, *commands: CommandType[Any]) -> Iterator[Outcome[Any]]: ...
+    #
+
+    def execute_stream(
+        self, commands: Iterable[CommandType[Any]], window: int = ...
+    ) -> Iterator[Outcome[Any]]: ...
 
 class AsyncRedis:
     async def execute(self, command: CommandType[T]) -> T: ...
@@ -115,3 +133,15 @@ class AsyncRedis:
         self,
         *commands: CommandType[T],
     ) -> tuple[T, ...]: ...
+    #
+
+    def execute_iter(
+        self, *commands: CommandType[Any]
+    ) -> AsyncIterator[Outcome[Any]]: ...
+    #
+
+    def execute_stream(
+        self,
+        commands: Iterable[CommandType[Any]] | AsyncIterable[CommandType[Any]],
+        window: int = ...,
+    ) -> AsyncIterator[Outcome[Any]]: ...
@@ -1,5 +1,16 @@
 import anyio
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
 from reddish.clients._client_stubs import AsyncRedis
 
 class Redis(AsyncRedis):
-    def __init__(self, stream: anyio.abc.ByteStream) -> None: ...  # type: ignore
+    def __init__(
+        self,
+        stream: anyio.abc.ByteStream,  # type: ignore
+        *,
+        autopipeline: bool = ...,
+        flush_interval: float = ...,
+        cache: ClientSideCache | None = ...,
+        protocol: int | None = ...,
+        instrumentation: Instrumentation | None = ...,
+    ) -> None: ...
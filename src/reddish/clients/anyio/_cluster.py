@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+try:
+    import anyio
+except ImportError:
+    raise ImportError("Execute 'pip install reddish[anyio]' to enable anyio support")
+
+from outcome import Value
+
+from reddish._core.cluster import ClusterPipeline, SlotMap
+from reddish._core.command import Command
+from reddish._core.errors import CommandError, ConnectionError, PipelineError
+from reddish._core.stream import iterate, take_async
+from ._client import Redis
+
+
+class RedisCluster:
+    def __init__(self, connect, startup_nodes, *, max_redirects=5):
+        """Redis cluster client routing commands to the nodes serving their keys.
+
+        Args:
+            connect: async function taking a host and a port and returning a
+                `anyio.abc.ByteStream` connected to that node e.g. `anyio.connect_tcp`.
+            startup_nodes: `(host, port)` addresses of cluster nodes used for
+                discovering the cluster.
+            max_redirects: number of times a command follows `MOVED` or `ASK`
+                redirects before its error is returned.
+        """
+        self._connect = connect
+        self._startup_nodes = [tuple(address) for address in startup_nodes]
+        if not self._startup_nodes:
+            raise ValueError("At least one startup node is required.")
+        self._max_redirects = max_redirects
+        self._nodes: dict[tuple[str, int], Redis] = {}
+        self._slot_map = SlotMap()
+        self._refresh_lock = anyio.Lock()
+        # held while connecting to a node so concurrent callers share the connection
+        self._connect_locks: dict[tuple[str, int], anyio.Lock] = {}
+
+    async def __aenter__(self):
+        await self.refresh()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connections to all nodes."""
+        nodes = list(self._nodes.values())
+        self._nodes.clear()
+        for node in nodes:
+            node._redis.mark_broken()
+            await node._stream.aclose()
+
+    async def _node(self, address):
+        node = self._nodes.get(address)
+        if node is None or node._redis.broken:
+            lock = self._connect_locks.setdefault(address, anyio.Lock())
+            async with lock:
+                node = self._nodes.get(address)  # e.g. connected while waiting
+                if node is None or node._redis.broken:
+                    node = Redis(await self._connect(*address))
+                    self._nodes[address] = node
+        return node
+
+    async def refresh(self):
+        """Refresh the slot map from `CLUSTER SHARDS`."""
+        async with self._refresh_lock:
+            for address in [*self._slot_map.nodes, *self._startup_nodes]:
+                try:
+                    node = await self._node(address)
+                    shards = await node.execute(Command("CLUSTER SHARDS"))
+                except (OSError, ConnectionError, CommandError):
+                    continue
+                self._slot_map = SlotMap.from_shards(shards)
+                for stale in self._nodes.keys() - set(self._slot_map.nodes):
+                    await self._nodes.pop(stale)._stream.aclose()
+                return
+        raise ConnectionError("None of the cluster nodes are reachable.")
+
+    async def _execute_on(self, pipeline, address, commands):
+        try:
+            node = await self._node(address)
+            replies = await node.execute_many(*commands)
+        except PipelineError as error:
+            pipeline.feed(address, error.outcomes)
+        except (OSError, ConnectionError):
+            pipeline.moved = True  # the node may have failed over
+            pipeline.fail(address, ConnectionError())
+        else:
+            pipeline.feed(address, [Value(reply) for reply in replies])
+
+    async def _execute_pipeline(self, commands):
+        if not self._slot_map.nodes:
+            await self.refresh()
+
+        pipeline = ClusterPipeline(self._slot_map, commands, self._max_redirects)
+        while not pipeline.done:
+            requests = pipeline.requests()
+            if len(requests) == 1:
+                ((address, node_commands),) = requests.items()
+                await self._execute_on(pipeline, address, node_commands)
+            else:
+                async with anyio.create_task_group() as task_group:
+                    for address, node_commands in requests.items():
+                        task_group.start_soon(
+                            self._execute_on, pipeline, address, node_commands
+                        )
+
+        if pipeline.moved:
+            try:
+                await self.refresh()
+            except ConnectionError:
+                pass  # refreshed again after the next redirect
+        return pipeline
+
+    async def execute_many(self, *commands):
+        """Execute multiple redis commands at once on the nodes serving their keys.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Returns:
+            Responses from redis as received or parsed into the types
+            provided to the commands in the order of the commands.
+        """
+
+        return (await self._execute_pipeline(commands)).replies()
+
+    async def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command in the order of the commands once
+            all nodes replied.
+        """
+
+        for outcome in (await self._execute_pipeline(commands)).outcomes:
+            yield outcome
+
+    async def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands in batches of `window` commands.
+
+        Args:
+            commands: An iterable or async iterable of the commands to be executed.
+            window: The number of commands per batch.
+
+        Yields:
+            An `Outcome` for each command in order once all nodes replied to
+            its batch.
+        """
+
+        commands = iterate(commands)
+        while True:
+            batch = await take_async(commands, window)
+            if not batch:
+                return
+            for outcome in (await self._execute_pipeline(batch)).outcomes:
+                yield outcome
+
+    async def execute(self, command):
+        """Execute a single redis command on the node serving its keys.
+
+        Args:
+            command: The command to be executed.
+
+        Returns:
+            Response from redis as received or parsed into the type
+            provided to the command.
+        """
+
+        return (await self.execute_many(command))[0]
@@ -0,0 +1,120 @@
+import time
+from contextlib import asynccontextmanager
+
+try:
+    import anyio
+except ImportError:
+    raise ImportError("Execute 'pip install reddish[anyio]' to enable anyio support")
+
+from reddish._core.scan import HSCAN, SCAN, SSCAN, ZSCAN, ScanSansIO
+
+
+async def _fetch_pages(redis, scan, send):
+    while not scan.done:
+        start = time.perf_counter()
+        reply = await redis.execute(scan.next_command())
+        page = scan.page(reply, time.perf_counter() - start)
+        try:
+            # the next page is requested as soon as this one was taken
+            await send.send(page)
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+            return  # the iteration was abandoned
+    await send.aclose()
+
+
+async def _elements(receive):
+    async for page in receive:
+        for element in page:
+            yield element
+
+
+@asynccontextmanager
+async def _walk(redis, scan):
+    send, receive = anyio.create_memory_object_stream(0)
+    async with anyio.create_task_group() as tasks:
+        tasks.start_soon(_fetch_pages, redis, scan, send)
+        try:
+            yield _elements(receive)
+        finally:
+            # lets a page in flight arrive instead of breaking the connection
+            receive.close()
+
+
+def scan(redis, match=None, *, type=None, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the keys in the keyspace with `SCAN`.
+
+    The next page is requested before the elements of the current one are
+    handed out and its `COUNT` is adapted toward `target_latency`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        match: glob-style pattern the keys have to match.
+        type: type of values the keys have to hold e.g. `"hash"`.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out keys returned more than once. This
+            remembers all keys seen so far.
+
+    Returns:
+        An async context manager for an async iterator over the keys.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(SCAN, match=match, type=type, **options))
+
+
+def hscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the fields and values of a hash with `HSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the hash.
+        match: glob-style pattern the fields have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out fields returned more than once.
+
+    Returns:
+        An async context manager for an async iterator over `(field, value)` tuples.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(HSCAN, key, match=match, **options))
+
+
+def sscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the members of a set with `SSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the set.
+        match: glob-style pattern the members have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out members returned more than once.
+
+    Returns:
+        An async context manager for an async iterator over the members.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(SSCAN, key, match=match, **options))
+
+
+def zscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the members and scores of a sorted set with `ZSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the sorted set.
+        match: glob-style pattern the members have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out members returned more than once.
+
+    Returns:
+        An async context manager for an async iterator over `(member, score)` tuples.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(ZSCAN, key, match=match, **options))
@@ -0,0 +1,39 @@
+from typing import Any, Optional, Union, AsyncContextManager, AsyncIterator
+from reddish.clients._client_stubs import AsyncRedis
+
+def scan(
+    redis: AsyncRedis,
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    type: Optional[str] = ...,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> AsyncContextManager[AsyncIterator[Any]]: ...
+def hscan(
+    redis: AsyncRedis,
+    key: Union[str, bytes],
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> AsyncContextManager[AsyncIterator[tuple[Any, Any]]]: ...
+def sscan(
+    redis: AsyncRedis,
+    key: Union[str, bytes],
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> AsyncContextManager[AsyncIterator[Any]]: ...
+def zscan(
+    redis: AsyncRedis,
+    key: Union[str, bytes],
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> AsyncContextManager[AsyncIterator[tuple[Any, Any]]]: ...
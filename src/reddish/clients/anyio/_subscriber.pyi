@@ -0,0 +1,24 @@
+import anyio
+from typing import AsyncIterator, Union
+from reddish._core.pubsub import Message
+
+class Subscriber:
+    def __init__(self, stream: anyio.abc.ByteStream) -> None: ...
+    async def __aenter__(self) -> Subscriber: ...
+    async def __aexit__(self, *exc_info: object) -> None: ...
+    async def close(self) -> None: ...
+    @property
+    def channels(self) -> frozenset[bytes]: ...
+    @property
+    def patterns(self) -> frozenset[bytes]: ...
+    @property
+    def shard_channels(self) -> frozenset[bytes]: ...
+    async def subscribe(self, *channels: Union[str, bytes]) -> None: ...
+    async def psubscribe(self, *patterns: Union[str, bytes]) -> None: ...
+    async def ssubscribe(self, *channels: Union[str, bytes]) -> None: ...
+    async def unsubscribe(self, *channels: Union[str, bytes]) -> None: ...
+    async def punsubscribe(self, *patterns: Union[str, bytes]) -> None: ...
+    async def sunsubscribe(self, *channels: Union[str, bytes]) -> None: ...
+    async def get_messages(self) -> list[Message]: ...
+    def __aiter__(self) -> AsyncIterator[Message]: ...
+    async def __anext__(self) -> Message: ...
@@ -1,7 +1,16 @@
 import asyncio
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
 from reddish.clients._client_stubs import AsyncRedis
 
 class Redis(AsyncRedis):
     def __init__(
-        self, streams: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        self,
+        streams: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        *,
+        autopipeline: bool = ...,
+        flush_interval: float = ...,
+        cache: ClientSideCache | None = ...,
+        protocol: int | None = ...,
+        instrumentation: Instrumentation | None = ...,
     ) -> None: ...
@@ -0,0 +1,251 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections import deque
+
+from reddish._core.errors import ConnectionError
+from ._client import Redis
+
+
+class _PooledConnection:
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.last_used = time.monotonic()
+
+    @property
+    def usable(self) -> bool:
+        redis = self.redis
+        return not (
+            redis._redis.broken or redis._reader.at_eof() or redis._writer.is_closing()
+        )
+
+    def close(self) -> None:
+        self.redis._redis.mark_broken()
+        self.redis._writer.close()
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect,
+        *,
+        min_size=1,
+        max_size=10,
+        idle_timeout=None,
+        cache=None,
+        protocol=None,
+        instrumentation=None,
+    ):
+        """Pool of redis connections for executing commands concurrently.
+
+        Args:
+            connect: coroutine function returning a `(StreamReader, StreamWriter)`
+                pair connected to a redis server.
+            min_size: number of connections that are kept open while idle.
+            max_size: maximum number of connections open at the same time.
+            idle_timeout: seconds after which idle connections exceeding `min_size`
+                are closed or `None` to keep them open indefinitely.
+            cache: a `ClientSideCache` shared by all connections of the pool.
+            protocol: the RESP version used by the connections, see `Redis`.
+            instrumentation: hooks called for the batches of all connections.
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(
+                "'min_size' and 'max_size' must satisfy 0 <= min_size <= max_size"
+                " and max_size >= 1"
+            )
+        self._connect = connect
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._cache = cache
+        self._protocol = protocol
+        self._instrumentation = instrumentation
+
+        self._idle: deque[_PooledConnection] = deque()  # oldest on the left
+        self._waiters: deque[asyncio.Future] = deque()
+        self._size = 0  # open connections and connections being opened
+        self._closed = False
+
+    async def __aenter__(self):
+        await self.fill()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def fill(self):
+        """Open connections until the pool holds at least `min_size` of them."""
+        while self._size < self._min_size:
+            self._size += 1
+            try:
+                connection = await self._open()
+            except BaseException:
+                self._size -= 1
+                raise
+            self._release(connection)
+
+    def close(self):
+        """Close all idle connections and those in use once they are returned."""
+        self._closed = True
+        while self._idle:
+            self._discard(self._idle.pop())
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(ConnectionError("Connection pool closed."))
+
+    async def _open(self):
+        return _PooledConnection(
+            Redis(
+                await self._connect(),
+                cache=self._cache,
+                protocol=self._protocol,
+                instrumentation=self._instrumentation,
+            )
+        )
+
+    def _discard(self, connection):
+        self._size -= 1
+        connection.close()
+
+    def _evict_idle(self):
+        if self._idle_timeout is None:
+            return
+        deadline = time.monotonic() - self._idle_timeout
+        idle = self._idle
+        while idle and self._size > self._min_size and idle[0].last_used < deadline:
+            self._discard(idle.popleft())
+
+    async def _acquire(self):
+        if self._closed:
+            raise ConnectionError("Connection pool closed.")
+        self._evict_idle()
+
+        while self._idle:
+            connection = self._idle.pop()  # most recently used first
+            if connection.usable:
+                return connection
+            self._discard(connection)
+
+        if self._size < self._max_size and not self._waiters:
+            self._size += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                connection = await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._hand_back(waiter.result())
+                else:
+                    self._waiters.remove(waiter)
+                raise
+            if connection is not None:
+                return connection
+            # no connection was handed over but a slot for opening a new one
+
+        try:
+            return await self._open()
+        except BaseException:
+            self._size -= 1
+            self._notify()
+            raise
+
+    def _hand_back(self, connection):
+        if connection is None:  # an unused slot for opening a connection
+            self._size -= 1
+            self._notify()
+        else:
+            self._release(connection)
+
+    def _release(self, connection):
+        if self._closed or not connection.usable:
+            self._discard(connection)
+            self._notify()
+            return
+
+        connection.last_used = time.monotonic()
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(connection)
+                return
+        self._idle.append(connection)
+        self._evict_idle()
+
+    def _notify(self):
+        # wake the longest waiting caller if there is room for a new connection
+        while self._waiters and self._size < self._max_size:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._size += 1
+                waiter.set_result(None)
+                return
+
+    async def execute_many(self, *commands):
+        """Execute multiple redis commands at once on a pooled connection.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Returns:
+            Responses from redis as received or parsed into the types
+            provided to the commands.
+        """
+
+        connection = await self._acquire()
+        try:
+            return await connection.redis.execute_many(*commands)
+        finally:
+            self._release(connection)
+
+    async def execute_iter(self, *commands):
+        """Execute multiple redis commands at once on a pooled connection and
+        iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command as soon as its reply arrived.
+        """
+
+        connection = await self._acquire()
+        try:
+            async for outcome in connection.redis.execute_iter(*commands):
+                yield outcome
+        finally:
+            self._release(connection)
+
+    async def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands on a pooled connection keeping up to `window`
+        of them in flight.
+
+        Args:
+            commands: An iterable or async iterable of the commands to be executed.
+            window: The maximum number of commands sent but not yet replied to.
+
+        Yields:
+            An `Outcome` for each command in order as soon as its reply arrived.
+        """
+
+        connection = await self._acquire()
+        try:
+            async for outcome in connection.redis.execute_stream(commands, window):
+                yield outcome
+        finally:
+            self._release(connection)
+
+    async def execute(self, command):
+        """Execute a single redis command on a pooled connection.
+
+        Args:
+            command: The command to be executed.
+
+        Returns:
+            Response from redis as received or parsed into the type
+            provided to the command.
+        """
+
+        return (await self.execute_many(command))[0]
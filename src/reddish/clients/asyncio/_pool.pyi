@@ -0,0 +1,24 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
+from reddish.clients._client_stubs import AsyncRedis
+
+class ConnectionPool(AsyncRedis):
+    def __init__(
+        self,
+        connect: Callable[
+            [], Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        ],
+        *,
+        min_size: int = ...,
+        max_size: int = ...,
+        idle_timeout: float | None = ...,
+        cache: ClientSideCache | None = ...,
+        protocol: int | None = ...,
+        instrumentation: Instrumentation | None = ...,
+    ) -> None: ...
+    async def __aenter__(self) -> ConnectionPool: ...
+    async def __aexit__(self, *exc_info: Any) -> None: ...
+    async def fill(self) -> None: ...
+    def close(self) -> None: ...
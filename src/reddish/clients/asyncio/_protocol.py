@@ -0,0 +1,377 @@
+from __future__ import annotations
+import asyncio
+import select
+from collections import deque
+from typing import Any, Optional, Union
+
+from reddish._core.sansio import RedisSansIO, NOT_ENOUGH_DATA
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
+from reddish._core.errors import ConnectionError, PipelineError
+from reddish._core.script import ScriptRetry
+from reddish._core.stream import StreamWindow, iterate, take_async
+
+
+class _Outcomes:
+    """Outcomes handed from the protocol to an iterating caller."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._outcomes: list = []
+        self._waiter: Optional[asyncio.Future] = None
+        self._exception: Optional[BaseException] = None
+
+    def put(self, outcomes: list) -> None:
+        self._outcomes += outcomes
+        self._wake()
+
+    def fail(self, exception: BaseException) -> None:
+        self._exception = exception
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def get(self) -> list:
+        """Outcomes arrived since the last call waiting for at least one."""
+        while not self._outcomes:
+            if self._exception is not None:
+                raise self._exception
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        outcomes, self._outcomes = self._outcomes, []
+        return outcomes
+
+
+class _Batch:
+    """A batch sent to redis waiting for its replies or outcomes."""
+
+    __slots__ = ("future", "outcomes", "remaining")
+
+    def __init__(
+        self,
+        future: Optional[asyncio.Future] = None,
+        outcomes: Optional[_Outcomes] = None,
+        remaining: int = 0,
+    ) -> None:
+        self.future = future  # resolved with the replies of the whole batch
+        self.outcomes = outcomes  # or receiving outcomes as they arrive
+        self.remaining = remaining
+
+
+class RedisProtocol(asyncio.BufferedProtocol):
+    """Protocol reading replies straight into the buffer of a `RedisSansIO`.
+
+    Replies are decoded in the transport's callbacks and the futures of completed
+    batches are resolved without waking up the callers in between. Create it with
+    `loop.create_connection(RedisProtocol, host, port)` and pass the returned
+    `(transport, protocol)` pair to `ProtocolRedis`.
+    """
+
+    def __init__(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._transport: Optional[asyncio.Transport] = None
+        self._redis = RedisSansIO()
+        self._batches: deque[_Batch] = deque()  # in the order they were sent
+        self._paused = False
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._receive_waiter: Optional[asyncio.Future] = None
+        self._exception: Optional[BaseException] = None
+        # held while writing a batch so requests of concurrent callers don't mix
+        self._write_lock = asyncio.Lock()
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def connection_lost(self, exc):
+        self._fail(ConnectionError() if exc is None else ConnectionError(str(exc)))
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def get_buffer(self, sizehint):
+        return self._redis.get_buffer()
+
+    def buffer_updated(self, nbytes):
+        try:
+            self._deliver(self._redis.get_buffer()[:nbytes])
+        except Exception:
+            pass  # the connection was closed and the callers were notified
+        self._wake_receiver()
+
+    def _wake_receiver(self) -> None:
+        waiter = self._receive_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def eof_received(self):
+        self._fail(ConnectionError())
+        return False
+
+    def _deliver(self, data: Union[bytes, memoryview]) -> None:
+        try:
+            self._hand_out(data)
+        except Exception as error:
+            self._fail(error)
+            self._transport.close()  # type: ignore
+            raise
+
+    def _hand_out(self, data: Union[bytes, memoryview]) -> None:
+        # resolve the futures of completed batches and pass on outcomes as they arrive
+        redis = self._redis
+        batches = self._batches
+        if not batches:
+            redis.receive_pushes(data)  # e.g. invalidations pushed by redis
+            return
+        while batches:
+            batch = batches[0]
+            if batch.outcomes is None:
+                try:
+                    replies = redis.receive(data)
+                except PipelineError as error:
+                    replies = error
+                if replies is NOT_ENOUGH_DATA:
+                    return
+                batches.popleft()
+                future = batch.future
+                if future is None or future.done():  # e.g. cancelled while waiting
+                    pass
+                elif isinstance(replies, PipelineError):
+                    future.set_exception(replies)
+                else:
+                    future.set_result(replies)
+            else:
+                outcomes = redis.receive_outcomes(data)
+                if outcomes:
+                    batch.remaining -= len(outcomes)
+                    batch.outcomes.put(outcomes)
+                if batch.remaining:
+                    return
+                batches.popleft()
+            data = b""
+
+    def _fail(self, exception: BaseException) -> None:
+        if self._exception is None:
+            self._exception = exception
+        self._redis.mark_broken()
+        batches, self._batches = self._batches, deque()
+        for batch in batches:
+            if batch.outcomes is not None:
+                batch.outcomes.fail(ConnectionError())
+            elif batch.future is not None and not batch.future.done():
+                batch.future.set_exception(ConnectionError())
+        self.resume_writing()  # wake up a writer waiting to drain
+        self._wake_receiver()
+
+    async def _send(self, commands, batch: _Batch, send_chunks=None) -> None:
+        async with self._write_lock:
+            if self._redis.caching:
+                await self._receive_pending()
+            if self._exception is not None:
+                raise ConnectionError()
+            transport = self._transport
+            send_chunks = send_chunks or self._redis.send_chunks
+            chunks = send_chunks(commands)  # queues the batch
+            self._batches.append(batch)
+            try:
+                for chunk in chunks:
+                    transport.write(chunk)  # type: ignore
+                    if self._paused:
+                        await self._drain()
+            except BaseException:
+                # the request was only partly written
+                self._fail(ConnectionError())
+                transport.close()  # type: ignore
+                raise
+        self._deliver(b"")  # e.g. served from the client side cache
+
+    async def _receive_pending(self) -> None:
+        # Data that reached the socket e.g. invalidations is handed out before the
+        # cache serves replies. TLS buffers data where it can't be checked for,
+        # `ClientSideCache.ttl` bounds how long invalidations may be missed then.
+        transport: asyncio.Transport = self._transport  # type: ignore
+        sock = transport.get_extra_info("socket")
+        if sock is None or transport.get_extra_info("sslcontext") is not None:
+            return
+        while self._exception is None and select.select([sock], [], [], 0)[0]:
+            self._receive_waiter = self._loop.create_future()
+            try:
+                await self._receive_waiter
+            finally:
+                self._receive_waiter = None
+
+    async def _drain(self) -> None:
+        while self._paused and self._exception is None:
+            self._drain_waiter = self._loop.create_future()
+            try:
+                await self._drain_waiter
+            finally:
+                self._drain_waiter = None
+        if self._exception is not None:
+            raise ConnectionError()
+
+    async def send_and_receive(self, commands) -> Any:
+        batch = _Batch(future=self._loop.create_future())
+        await self._send(commands, batch)
+        return await batch.future  # type: ignore
+
+    async def send_for_outcomes(
+        self, commands, outcomes: _Outcomes, send_chunks=None
+    ) -> None:
+        batch = _Batch(outcomes=outcomes, remaining=len(commands))
+        await self._send(commands, batch, send_chunks)
+
+
+class ProtocolRedis:
+    def __init__(
+        self,
+        connection: tuple[asyncio.BaseTransport, RedisProtocol],
+        *,
+        cache: Optional[ClientSideCache] = None,
+        protocol: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        """Redis client for executing commands over an `asyncio.BufferedProtocol`.
+
+        Unlike `Redis` it skips streams: replies are read into a reused buffer and
+        decoded in the transport's callbacks. Commands of concurrent callers are
+        sent right away and their replies are matched up in order so no caller
+        waits for the round trip of another. Works with the default event loop as
+        well as uvloop.
+
+        Args:
+            connection: a `(transport, RedisProtocol)` pair connected to a redis
+                server e.g. from `loop.create_connection(RedisProtocol, host, port)`.
+            cache: a `ClientSideCache` serving replies of read-only commands
+                locally. It can be shared between connections.
+            protocol: `3` to negotiate RESP3 which decodes maps, doubles and
+                booleans into native python types or `2` for RESP2. Defaults to
+                RESP3 with a cache and RESP2 otherwise.
+            instrumentation: hooks called for every batch of commands e.g. a
+                `LatencyRecorder`.
+        """
+        transport, redis_protocol = connection
+        if not isinstance(redis_protocol, RedisProtocol):
+            raise TypeError(
+                f"'{repr(connection)}' is not a pair of `(Transport, RedisProtocol)`."
+            )
+        if redis_protocol._redis.in_flight:
+            raise ValueError("The connection is already in use by another client.")
+        redis_protocol._redis = RedisSansIO(
+            cache=cache, protocol=protocol, instrumentation=instrumentation
+        )
+        self._transport = transport
+        self._protocol = redis_protocol
+        self._redis = redis_protocol._redis
+
+    async def _execute_many(self, commands):
+        protocol = self._protocol
+        try:
+            return await protocol.send_and_receive(commands)
+        except PipelineError as error:
+            # scripts redis lost e.g. after `SCRIPT FLUSH` are loaded again
+            retry = ScriptRetry.from_error(commands, error)
+            if retry is None:
+                raise
+        try:
+            replies = await protocol.send_and_receive(retry.commands)
+        except PipelineError as error:
+            replies = error
+        return retry.resolve(replies)
+
+    async def execute_many(self, *commands):
+        """Execute multiple redis commands at once.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Returns:
+            Responses from redis as received or parsed into the types
+            provided to the commands.
+        """
+
+        return await self._execute_many(commands)
+
+    async def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command as soon as its reply arrived. Calling
+            `.unwrap()` on it returns the reply as received or parsed into the
+            type provided to the command or raises the command's error.
+
+        Stopping the iteration early leaves the connection usable, the remaining
+        replies are read and dropped.
+        """
+
+        outcomes = _Outcomes(self._protocol._loop)
+        await self._protocol.send_for_outcomes(commands, outcomes)
+        remaining = len(commands)
+        while remaining:
+            arrived = await outcomes.get()
+            remaining -= len(arrived)
+            for outcome in arrived:
+                yield outcome
+
+    async def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands keeping up to `window` of them in flight.
+
+        Suits bulk loads: commands are taken from the iterable as replies arrive so
+        memory stays bounded and no round trips are wasted between batches.
+
+        Args:
+            commands: An iterable or async iterable of the commands to be executed.
+            window: The maximum number of commands sent but not yet replied to.
+
+        Yields:
+            An `Outcome` for each command in order as soon as its reply arrived.
+
+        Stopping the iteration early leaves the connection usable, the replies
+        in flight are read and dropped.
+        """
+
+        protocol = self._protocol
+        stream_window = StreamWindow(self._redis, window)
+        outcomes = _Outcomes(protocol._loop)
+        commands = iterate(commands)
+
+        while not stream_window.done:
+            wanted = stream_window.wanted
+            if wanted:
+                batch = await take_async(commands, wanted)
+                if batch:
+                    await protocol.send_for_outcomes(
+                        batch, outcomes, stream_window.send_chunks
+                    )
+                else:
+                    stream_window.send_chunks(batch)  # marks the end of the stream
+                continue
+            for outcome in stream_window.received(await outcomes.get()):
+                yield outcome
+
+    async def execute(self, command):
+        """Execute a single redis command.
+
+        Args:
+            command: The command to be executed.
+
+        Returns:
+            Response from redis as received or parsed into the type
+            provided to the command.
+        """
+
+        return (await self.execute_many(command))[0]
@@ -0,0 +1,17 @@
+import asyncio
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
+from reddish.clients._client_stubs import AsyncRedis
+
+class RedisProtocol(asyncio.BufferedProtocol):
+    def __init__(self) -> None: ...
+
+class ProtocolRedis(AsyncRedis):
+    def __init__(
+        self,
+        connection: tuple[asyncio.BaseTransport, RedisProtocol],
+        *,
+        cache: ClientSideCache | None = ...,
+        protocol: int | None = ...,
+        instrumentation: Instrumentation | None = ...,
+    ) -> None: ...
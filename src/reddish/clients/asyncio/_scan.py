@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+from reddish._core.scan import HSCAN, SCAN, SSCAN, ZSCAN, ScanSansIO
+
+
+async def _fetch(redis, command):
+    start = time.perf_counter()
+    reply = await redis.execute(command)
+    return reply, time.perf_counter() - start
+
+
+def _discard(task):
+    # a page requested ahead of an abandoned iteration isn't waited for
+    if not task.cancelled():
+        task.exception()
+
+
+async def _walk(redis, scan):
+    pending = asyncio.ensure_future(_fetch(redis, scan.next_command()))
+    try:
+        while pending is not None:
+            page = scan.page(*await pending)
+            # the next page is on its way while the caller consumes this one
+            pending = (
+                None
+                if scan.done
+                else asyncio.ensure_future(_fetch(redis, scan.next_command()))
+            )
+            for element in page:
+                yield element
+    finally:
+        if pending is not None and not pending.done():
+            pending.add_done_callback(_discard)
+
+
+def scan(redis, match=None, *, type=None, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the keys in the keyspace with `SCAN`.
+
+    The next page is requested before the elements of the current one are
+    handed out and its `COUNT` is adapted toward `target_latency`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        match: glob-style pattern the keys have to match.
+        type: type of values the keys have to hold e.g. `"hash"`.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out keys returned more than once. This
+            remembers all keys seen so far.
+
+    Returns:
+        An async iterator over the keys.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(SCAN, match=match, type=type, **options))
+
+
+def hscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the fields and values of a hash with `HSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the hash.
+        match: glob-style pattern the fields have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out fields returned more than once.
+
+    Returns:
+        An async iterator over `(field, value)` tuples.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(HSCAN, key, match=match, **options))
+
+
+def sscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the members of a set with `SSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the set.
+        match: glob-style pattern the members have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out members returned more than once.
+
+    Returns:
+        An async iterator over the members.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(SSCAN, key, match=match, **options))
+
+
+def zscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the members and scores of a sorted set with `ZSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the sorted set.
+        match: glob-style pattern the members have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out members returned more than once.
+
+    Returns:
+        An async iterator over `(member, score)` tuples.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(ZSCAN, key, match=match, **options))
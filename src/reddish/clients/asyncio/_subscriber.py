@@ -0,0 +1,134 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+
+from reddish._core.pubsub import SubscriberSansIO, Message
+from reddish._core.errors import ConnectionError
+
+
+class Subscriber:
+    def __init__(
+        self, streams: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+    ) -> None:
+        """Subscriber receiving messages published to channels.
+
+        The subscriber owns its connection which can't be used for executing
+        other commands. Channels can be added and removed at any time, also
+        while iterating over messages.
+
+        Args:
+            streams: a `(StreamReader, StreamWriter)` pair connected to a redis server.
+        """
+        reader, writer = streams
+        if not isinstance(reader, asyncio.StreamReader) and isinstance(
+            writer, asyncio.StreamWriter
+        ):
+            raise TypeError(
+                f"'{repr(streams)}' is not an pair of `(StreamReader, StreamWriter)`."
+            )
+        self._reader, self._writer = (reader, writer)
+        self._write_lock = asyncio.Lock()
+        self._read_lock = asyncio.Lock()
+        self._subscriber = SubscriberSansIO()
+        self._messages: deque[Message] = deque()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connection of the subscriber."""
+        self._subscriber.mark_broken()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+
+    @property
+    def channels(self) -> frozenset[bytes]:
+        """Channels the subscriber is subscribed to as confirmed by redis."""
+        return frozenset(self._subscriber.channels)
+
+    @property
+    def patterns(self) -> frozenset[bytes]:
+        """Patterns the subscriber is subscribed to as confirmed by redis."""
+        return frozenset(self._subscriber.patterns)
+
+    @property
+    def shard_channels(self) -> frozenset[bytes]:
+        """Shard channels the subscriber is subscribed to as confirmed by redis."""
+        return frozenset(self._subscriber.shard_channels)
+
+    async def subscribe(self, *channels):
+        """Subscribe to messages published to `channels`."""
+        await self._send(self._subscriber.subscribe(*channels))
+
+    async def psubscribe(self, *patterns):
+        """Subscribe to messages published to channels matching glob-style `patterns`."""
+        await self._send(self._subscriber.psubscribe(*patterns))
+
+    async def ssubscribe(self, *channels):
+        """Subscribe to messages published to shard `channels`."""
+        await self._send(self._subscriber.ssubscribe(*channels))
+
+    async def unsubscribe(self, *channels):
+        """Unsubscribe from `channels` or from all channels if none are given."""
+        await self._send(self._subscriber.unsubscribe(*channels))
+
+    async def punsubscribe(self, *patterns):
+        """Unsubscribe from `patterns` or from all patterns if none are given."""
+        await self._send(self._subscriber.punsubscribe(*patterns))
+
+    async def sunsubscribe(self, *channels):
+        """Unsubscribe from shard `channels` or from all of them if none are given."""
+        await self._send(self._subscriber.sunsubscribe(*channels))
+
+    async def _send(self, request):
+        async with self._write_lock:
+            try:
+                self._writer.write(request)
+                await self._writer.drain()
+            except OSError:
+                self._subscriber.mark_broken()
+                raise ConnectionError()
+
+    async def get_messages(self):
+        """Wait for messages and return all messages received so far.
+
+        Returns:
+            A list of at least one `Message`.
+        """
+        if self._messages:
+            messages = list(self._messages)
+            self._messages.clear()
+            return messages
+
+        subscriber = self._subscriber
+        messages = subscriber.receive(b"")  # e.g. messages after an error reply
+        if messages:
+            return messages
+        async with self._read_lock:
+            try:
+                while True:
+                    data = await self._reader.read(subscriber.read_size)
+                    if data == b"":
+                        subscriber.mark_broken()
+                        raise ConnectionError()
+                    messages = subscriber.receive(data)
+                    if messages:
+                        return messages
+            except OSError:
+                subscriber.mark_broken()
+                raise ConnectionError()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Message:
+        messages = self._messages
+        if not messages:
+            messages.extend(await self.get_messages())
+        return messages.popleft()
@@ -1,2 +1,7 @@
 # flake8: noqa: F401
 from ._client import Redis as Redis
+from ._subscriber import Subscriber as Subscriber
+from ._cluster import RedisCluster as RedisCluster
+from ._replicated import ReplicatedRedis as ReplicatedRedis
+from ._sentinel import SentinelRedis as SentinelRedis
+from ._scan import scan as scan, hscan as hscan, sscan as sscan, zscan as zscan
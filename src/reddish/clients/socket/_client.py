@@ -1,15 +1,36 @@
+import select
 import socket
+import ssl
 import threading
+from typing import Optional
 from reddish._core.sansio import RedisSansIO, NOT_ENOUGH_DATA
-from reddish._core.errors import ConnectionError
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
+from reddish._core.errors import ConnectionError, PipelineError
+from reddish._core.script import ScriptRetry
+from reddish._core.stream import StreamWindow, take
 
 
 class Redis:
-    def __init__(self, stream: socket.socket):
+    def __init__(
+        self,
+        stream: socket.socket,
+        *,
+        cache: Optional[ClientSideCache] = None,
+        protocol: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
         """Redis client for executing commands.
 
         Args:
             stream: a `socket.socket` connected to a redis server.
+            cache: a `ClientSideCache` serving replies of read-only commands
+                locally. It can be shared between connections.
+            protocol: `3` to negotiate RESP3 which decodes maps, doubles and
+                booleans into native python types or `2` for RESP2. Defaults to
+                RESP3 with a cache and RESP2 otherwise.
+            instrumentation: hooks called for every batch of commands e.g. a
+                `LatencyRecorder`.
         """
 
         if not isinstance(stream, socket.socket):
@@ -20,7 +41,9 @@ class Redis:
             raise TypeError(f"'{repr(stream)}' is not connected") from None
         self._stream = stream
         self._lock = threading.Lock()
-        self._redis = RedisSansIO()
+        self._redis = RedisSansIO(
+            cache=cache, protocol=protocol, instrumentation=instrumentation
+        )
 
     def execute_many(self, *commands):
         """Execute multiple redis commands at once.
@@ -33,26 +56,154 @@ class Redis:
             provided to the commands.
         """
 
+        with self._lock:
+            try:
+                return self._send_and_receive(commands)
+            except PipelineError as error:
+                # scripts redis lost e.g. after `SCRIPT FLUSH` are loaded again
+                retry = ScriptRetry.from_error(commands, error)
+                if retry is None:
+                    raise
+            try:
+                replies = self._send_and_receive(retry.commands)
+            except PipelineError as error:
+                replies = error
+            return retry.resolve(replies)
+
+    def _send_and_receive(self, commands):
+        redis = self._redis
+        stream = self._stream
+
+        try:
+            self._receive_pushes()
+            for chunk in redis.send_chunks(commands):
+                stream.sendall(chunk)
+
+            replies = redis.receive(b"")  # e.g. served from the client side cache
+            while replies is NOT_ENOUGH_DATA:
+                nbytes = stream.recv_into(redis.get_buffer())
+                if nbytes == 0:
+                    raise ConnectionError()
+                replies = redis.buffer_updated(nbytes)
+            return replies
+        except OSError:
+            redis.mark_broken()
+            raise ConnectionError()
+
+    def _receive_pushes(self):
+        # invalidations pending on the connection are handled before the cache
+        # serves replies
+        redis = self._redis
+        stream = self._stream
+        if not redis.caching:
+            return
+        if stream.fileno() == -1:
+            raise ConnectionError()
+        pending = getattr(stream, "pending", None)  # decrypted data of `ssl` sockets
+        while (pending is not None and pending()) or select.select([stream], [], [], 0)[
+            0
+        ]:
+            timeout = stream.gettimeout()
+            stream.settimeout(0)
+            try:
+                nbytes = stream.recv_into(redis.get_buffer())
+            except (BlockingIOError, ssl.SSLWantReadError):
+                return  # e.g. a TLS record without any data
+            finally:
+                stream.settimeout(timeout)
+            if nbytes == 0:
+                raise ConnectionError()
+            redis.receive_pushes(redis.get_buffer()[:nbytes])
+
+    def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command as soon as its reply arrived. Calling
+            `.unwrap()` on it returns the reply as received or parsed into the
+            type provided to the command or raises the command's error.
+
+        The connection is reserved for the iteration. If it is stopped before all
+        outcomes were received the connection can't be used anymore.
+        """
+
         redis = self._redis
         stream = self._stream
+        remaining = 0
 
         with self._lock:
             try:
-                request = redis.send(commands)
-                stream.sendall(request)
+                self._receive_pushes()
+                chunks = redis.send_chunks(commands)
+                remaining = len(commands)
+                for chunk in chunks:
+                    stream.sendall(chunk)
 
-                while True:
-                    data = stream.recv(4096)
-                    if data == b"":
+                for outcome in redis.receive_outcomes(b""):  # e.g. from the cache
+                    remaining -= 1
+                    yield outcome
+
+                while remaining:
+                    nbytes = stream.recv_into(redis.get_buffer())
+                    if nbytes == 0:
                         raise ConnectionError()
-                    replies = redis.receive(data)
-                    if replies is NOT_ENOUGH_DATA:
-                        continue
+                    for outcome in redis.receive_outcomes(redis.get_buffer()[:nbytes]):
+                        remaining -= 1
+                        yield outcome
+            except OSError:
+                redis.mark_broken()
+                raise ConnectionError()
+            finally:
+                if remaining:  # replies left unread
+                    redis.mark_broken()
+
+    def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands keeping up to `window` of them in flight.
+
+        Suits bulk loads: commands are taken from the iterable as replies arrive so
+        memory stays bounded and no round trips are wasted between batches.
+
+        Args:
+            commands: An iterable of the commands to be executed.
+            window: The maximum number of commands sent but not yet replied to.
+
+        Yields:
+            An `Outcome` for each command in order as soon as its reply arrived.
+
+        The connection is reserved for the iteration. If it is stopped before all
+        outcomes were received the connection can't be used anymore.
+        """
+
+        redis = self._redis
+        stream = self._stream
+        stream_window = StreamWindow(redis, window)
+        commands = iter(commands)
+
+        with self._lock:
+            try:
+                while not stream_window.done:
+                    wanted = stream_window.wanted
+                    if wanted:
+                        batch = take(commands, wanted)
+                        self._receive_pushes()
+                        for chunk in stream_window.send_chunks(batch):
+                            stream.sendall(chunk)
+                        outcomes = stream_window.receive(b"")  # e.g. from the cache
                     else:
-                        return replies
+                        nbytes = stream.recv_into(redis.get_buffer())
+                        if nbytes == 0:
+                            raise ConnectionError()
+                        outcomes = stream_window.receive(redis.get_buffer()[:nbytes])
+                    yield from outcomes
             except OSError:
                 redis.mark_broken()
                 raise ConnectionError()
+            finally:
+                if stream_window.in_flight:  # replies left unread
+                    redis.mark_broken()
 
     def execute(self, command):
         """Execute a single redis command.
@@ -1,5 +1,14 @@
 import socket
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
 from reddish.clients._client_stubs import SyncRedis
 
 class Redis(SyncRedis):
-    def __init__(self, stream: socket.socket) -> None: ...
+    def __init__(
+        self,
+        stream: socket.socket,
+        *,
+        cache: ClientSideCache | None = ...,
+        protocol: int | None = ...,
+        instrumentation: Instrumentation | None = ...,
+    ) -> None: ...
@@ -0,0 +1,196 @@
+from __future__ import annotations
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from outcome import Value
+
+from reddish._core.cluster import ClusterPipeline, SlotMap
+from reddish._core.command import Command
+from reddish._core.errors import CommandError, ConnectionError, PipelineError
+from reddish._core.stream import take
+from ._client import Redis
+
+
+class RedisCluster:
+    def __init__(self, connect, startup_nodes, *, max_redirects=5):
+        """Redis cluster client routing commands to the nodes serving their keys.
+
+        Args:
+            connect: function taking a host and a port and returning a
+                `socket.socket` connected to that node.
+            startup_nodes: `(host, port)` addresses of cluster nodes used for
+                discovering the cluster.
+            max_redirects: number of times a command follows `MOVED` or `ASK`
+                redirects before its error is returned.
+        """
+        self._connect = connect
+        self._startup_nodes = [tuple(address) for address in startup_nodes]
+        if not self._startup_nodes:
+            raise ValueError("At least one startup node is required.")
+        self._max_redirects = max_redirects
+        self._nodes: dict[tuple[str, int], Redis] = {}
+        self._slot_map = SlotMap()
+        self._refresh_lock = threading.Lock()
+        self._nodes_lock = threading.Lock()
+        # held while connecting to a node so concurrent callers share the connection
+        self._connect_locks: dict[tuple[str, int], threading.Lock] = {}
+        self._pipeline_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None  # created on demand
+
+    def __enter__(self):
+        self.refresh()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the connections to all nodes."""
+        with self._nodes_lock:
+            for node in self._nodes.values():
+                node._redis.mark_broken()
+                node._stream.close()
+            self._nodes.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _node(self, address):
+        with self._nodes_lock:
+            node = self._nodes.get(address)
+            if node is not None and not node._redis.broken:
+                return node
+            lock = self._connect_locks.setdefault(address, threading.Lock())
+        # other nodes stay available while connecting to this one
+        with lock:
+            with self._nodes_lock:
+                node = self._nodes.get(address)  # e.g. connected while waiting
+            if node is None or node._redis.broken:
+                node = Redis(self._connect(*address))
+                with self._nodes_lock:
+                    self._nodes[address] = node
+            return node
+
+    def refresh(self):
+        """Refresh the slot map from `CLUSTER SHARDS`."""
+        with self._refresh_lock:
+            for address in [*self._slot_map.nodes, *self._startup_nodes]:
+                try:
+                    node = self._node(address)
+                    shards = node.execute(Command("CLUSTER SHARDS"))
+                except (OSError, ConnectionError, CommandError):
+                    continue
+                self._slot_map = SlotMap.from_shards(shards)
+                with self._nodes_lock:
+                    for stale in self._nodes.keys() - set(self._slot_map.nodes):
+                        self._nodes.pop(stale)._stream.close()
+                return
+        raise ConnectionError("None of the cluster nodes are reachable.")
+
+    def _execute_on(self, pipeline, address, commands):
+        try:
+            node = self._node(address)
+            replies = node.execute_many(*commands)
+        except PipelineError as error:
+            outcomes = error.outcomes
+        except (OSError, ConnectionError):
+            outcomes = None
+        else:
+            outcomes = [Value(reply) for reply in replies]
+
+        with self._pipeline_lock:  # pipelines run in threads for multiple nodes
+            if outcomes is None:
+                pipeline.moved = True  # the node may have failed over
+                pipeline.fail(address, ConnectionError())
+            else:
+                pipeline.feed(address, outcomes)
+
+    def _execute_pipeline(self, commands):
+        if not self._slot_map.nodes:
+            self.refresh()
+
+        pipeline = ClusterPipeline(self._slot_map, commands, self._max_redirects)
+        while not pipeline.done:
+            requests = pipeline.requests()
+            if len(requests) == 1:
+                ((address, node_commands),) = requests.items()
+                self._execute_on(pipeline, address, node_commands)
+            else:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        thread_name_prefix="reddish-cluster"
+                    )
+                futures = [
+                    self._executor.submit(
+                        self._execute_on, pipeline, address, node_commands
+                    )
+                    for address, node_commands in requests.items()
+                ]
+                for future in futures:
+                    future.result()
+
+        if pipeline.moved:
+            try:
+                self.refresh()
+            except ConnectionError:
+                pass  # refreshed again after the next redirect
+        return pipeline
+
+    def execute_many(self, *commands):
+        """Execute multiple redis commands at once on the nodes serving their keys.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Returns:
+            Responses from redis as received or parsed into the types
+            provided to the commands in the order of the commands.
+        """
+
+        return (self._execute_pipeline(commands)).replies()
+
+    def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command in the order of the commands once
+            all nodes replied.
+        """
+
+        for outcome in (self._execute_pipeline(commands)).outcomes:
+            yield outcome
+
+    def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands in batches of `window` commands.
+
+        Args:
+            commands: An iterable of the commands to be executed.
+            window: The number of commands per batch.
+
+        Yields:
+            An `Outcome` for each command in order once all nodes replied to
+            its batch.
+        """
+
+        commands = iter(commands)
+        while True:
+            batch = take(commands, window)
+            if not batch:
+                return
+            yield from self._execute_pipeline(batch).outcomes
+
+    def execute(self, command):
+        """Execute a single redis command on the node serving its keys.
+
+        Args:
+            command: The command to be executed.
+
+        Returns:
+            Response from redis as received or parsed into the type
+            provided to the command.
+        """
+
+        return (self.execute_many(command))[0]
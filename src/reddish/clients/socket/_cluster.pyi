@@ -0,0 +1,16 @@
+import socket
+from typing import Any, Callable, Iterable
+from reddish.clients._client_stubs import SyncRedis
+
+class RedisCluster(SyncRedis):
+    def __init__(
+        self,
+        connect: Callable[[str, int], socket.socket],
+        startup_nodes: Iterable[tuple[str, int]],
+        *,
+        max_redirects: int = ...,
+    ) -> None: ...
+    def __enter__(self) -> RedisCluster: ...
+    def __exit__(self, *exc_info: Any) -> None: ...
+    def close(self) -> None: ...
+    def refresh(self) -> None: ...
@@ -0,0 +1,197 @@
+from __future__ import annotations
+import threading
+import time
+
+from reddish._core.errors import ConnectionError
+from reddish._core.replication import (
+    INFO_REPLICATION,
+    ROUND_ROBIN,
+    ReplicaSelector,
+    is_read_only,
+    parse_replication_info,
+)
+from ._client import Redis
+
+
+class ReplicatedRedis:
+    def __init__(
+        self,
+        connect,
+        primary,
+        *,
+        replicas=None,
+        balancing=ROUND_ROBIN,
+        max_lag=None,
+        lag_check_interval=1.0,
+    ):
+        """Redis client sending read-only batches to replicas and everything else
+        to the primary.
+
+        Args:
+            connect: function taking a host and a port and returning a
+                `socket.socket` connected to that server.
+            primary: `(host, port)` address of the primary.
+            replicas: `(host, port)` addresses of the replicas. Defaults to the
+                replicas reported by the primary's `INFO replication`.
+            balancing: `"round_robin"` to take turns or `"least_outstanding"` to
+                pick the replica with the fewest batches in flight.
+            max_lag: number of bytes of the replication stream a replica may trail
+                the primary by to still serve reads. Replicas are read from
+                regardless of their lag by default.
+            lag_check_interval: seconds after which the replication offsets are
+                checked again before reading from a replica if `max_lag` is set
+                and after which unreachable replicas are tried again.
+        """
+        self._connect = connect
+        self._primary = tuple(primary)
+        self._static_replicas = replicas
+        self._selector = ReplicaSelector(replicas or (), balancing)
+        self._max_lag = max_lag
+        self._lag_check_interval = lag_check_interval
+        self._checked_at = None  # when the replicas were last refreshed
+        self._nodes: dict[tuple[str, int], Redis] = {}
+        self._refresh_lock = threading.Lock()
+        self._nodes_lock = threading.Lock()
+        self._selector_lock = threading.Lock()
+
+    def __enter__(self):
+        self.refresh()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the connections to the primary and all replicas."""
+        with self._nodes_lock:
+            for node in self._nodes.values():
+                node._redis.mark_broken()
+                node._stream.close()
+            self._nodes.clear()
+
+    @property
+    def replicas(self):
+        """Addresses of the replicas currently serving reads."""
+        return self._selector.replicas
+
+    def _node(self, address):
+        with self._nodes_lock:
+            node = self._nodes.get(address)
+            if node is None or node._redis.broken:
+                node = Redis(self._connect(*address))
+                self._nodes[address] = node
+            return node
+
+    def refresh(self):
+        """Refresh the replicas serving reads from the primary's `INFO replication`."""
+        with self._refresh_lock:
+            primary = self._node(self._primary)
+            info = parse_replication_info(primary.execute(INFO_REPLICATION))
+            eligible = info.replicas_within(self._max_lag)
+            if self._static_replicas is None:
+                replicas = eligible
+            elif self._max_lag is None:
+                replicas = self._static_replicas
+            else:
+                replicas = [
+                    address
+                    for address in self._static_replicas
+                    if tuple(address) in eligible
+                ]
+            with self._selector_lock:
+                self._selector.replicas = replicas
+            self._checked_at = time.monotonic()
+
+    def _needs_refresh(self):
+        if self._checked_at is None:
+            return self._static_replicas is None or self._max_lag is not None
+        if self._max_lag is None and not self._selector.degraded:
+            return False
+        # removed replicas are tried again once they are listed by a refresh
+        return time.monotonic() - self._checked_at > self._lag_check_interval
+
+    def _replica(self):
+        if self._needs_refresh():
+            self.refresh()
+        with self._selector_lock:
+            address = self._selector.select()
+            if address is not None:
+                self._selector.started(address)
+            return address
+
+    def _finished(self, address, failed=False):
+        with self._selector_lock:
+            self._selector.finished(address)
+            if failed:
+                self._selector.remove(address)  # until the next refresh
+
+    def execute_many(self, *commands):
+        """Execute multiple redis commands at once on a replica if all of them are
+        read-only and on the primary otherwise.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Returns:
+            Responses from redis as received or parsed into the types
+            provided to the commands.
+        """
+
+        address = self._replica() if is_read_only(commands) else None
+        if address is not None:
+            try:
+                replies = self._node(address).execute_many(*commands)
+            except (OSError, ConnectionError):
+                self._finished(address, failed=True)
+            else:
+                self._finished(address)
+                return replies
+
+        return self._node(self._primary).execute_many(*commands)
+
+    def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command as soon as its reply arrived.
+        """
+
+        address = self._replica() if is_read_only(commands) else None
+        if address is None:
+            yield from self._node(self._primary).execute_iter(*commands)
+            return
+        try:
+            yield from self._node(address).execute_iter(*commands)
+        finally:
+            self._finished(address)
+
+    def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands on the primary keeping up to `window`
+        of them in flight.
+
+        Args:
+            commands: An iterable of the commands to be executed.
+            window: The maximum number of commands sent but not yet replied to.
+
+        Yields:
+            An `Outcome` for each command in order as soon as its reply arrived.
+        """
+
+        yield from self._node(self._primary).execute_stream(commands, window)
+
+    def execute(self, command):
+        """Execute a single redis command on a replica if it is read-only and on the
+        primary otherwise.
+
+        Args:
+            command: The command to be executed.
+
+        Returns:
+            Response from redis as received or parsed into the type
+            provided to the command.
+        """
+
+        return (self.execute_many(command))[0]
@@ -0,0 +1,21 @@
+import socket
+from typing import Any, Literal, Optional, Callable, Iterable
+from reddish.clients._client_stubs import SyncRedis
+
+class ReplicatedRedis(SyncRedis):
+    def __init__(
+        self,
+        connect: Callable[[str, int], socket.socket],
+        primary: tuple[str, int],
+        *,
+        replicas: Optional[Iterable[tuple[str, int]]] = ...,
+        balancing: Literal["round_robin", "least_outstanding"] = ...,
+        max_lag: Optional[int] = ...,
+        lag_check_interval: float = ...,
+    ) -> None: ...
+    def __enter__(self) -> ReplicatedRedis: ...
+    def __exit__(self, *exc_info: Any) -> None: ...
+    def close(self) -> None: ...
+    def refresh(self) -> None: ...
+    @property
+    def replicas(self) -> list[tuple[str, int]]: ...
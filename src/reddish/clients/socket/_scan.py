@@ -0,0 +1,99 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from reddish._core.scan import HSCAN, SCAN, SSCAN, ZSCAN, ScanSansIO
+
+
+def _walk(redis, scan):
+    def fetch(command):
+        start = time.perf_counter()
+        reply = redis.execute(command)
+        return reply, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="reddish-scan") as pool:
+        pending = pool.submit(fetch, scan.next_command())
+        while pending is not None:
+            page = scan.page(*pending.result())
+            # the next page is on its way while the caller consumes this one
+            pending = None if scan.done else pool.submit(fetch, scan.next_command())
+            yield from page
+
+
+def scan(redis, match=None, *, type=None, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the keys in the keyspace with `SCAN`.
+
+    The next page is requested before the elements of the current one are
+    handed out and its `COUNT` is adapted toward `target_latency`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        match: glob-style pattern the keys have to match.
+        type: type of values the keys have to hold e.g. `"hash"`.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out keys returned more than once. This
+            remembers all keys seen so far.
+
+    Returns:
+        An iterator over the keys.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(SCAN, match=match, type=type, **options))
+
+
+def hscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the fields and values of a hash with `HSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the hash.
+        match: glob-style pattern the fields have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out fields returned more than once.
+
+    Returns:
+        An iterator over `(field, value)` tuples.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(HSCAN, key, match=match, **options))
+
+
+def sscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the members of a set with `SSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the set.
+        match: glob-style pattern the members have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out members returned more than once.
+
+    Returns:
+        An iterator over the members.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(SSCAN, key, match=match, **options))
+
+
+def zscan(redis, key, match=None, *, count=100, target_latency=0.005, dedupe=True):
+    """Iterate over the members and scores of a sorted set with `ZSCAN`.
+
+    Args:
+        redis: client to execute the commands with e.g. `Redis`.
+        key: key of the sorted set.
+        match: glob-style pattern the members have to match.
+        count: `COUNT` of the first page.
+        target_latency: seconds a page should take to arrive. `None` keeps
+            `count` for all pages.
+        dedupe: whether to leave out members returned more than once.
+
+    Returns:
+        An iterator over `(member, score)` tuples.
+    """
+    options = dict(count=count, target_latency=target_latency, dedupe=dedupe)
+    return _walk(redis, ScanSansIO(ZSCAN, key, match=match, **options))
@@ -0,0 +1,39 @@
+from typing import Any, Optional, Union, Iterator
+from reddish.clients._client_stubs import SyncRedis
+
+def scan(
+    redis: SyncRedis,
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    type: Optional[str] = ...,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> Iterator[Any]: ...
+def hscan(
+    redis: SyncRedis,
+    key: Union[str, bytes],
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> Iterator[tuple[Any, Any]]: ...
+def sscan(
+    redis: SyncRedis,
+    key: Union[str, bytes],
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> Iterator[Any]: ...
+def zscan(
+    redis: SyncRedis,
+    key: Union[str, bytes],
+    match: Optional[Union[str, bytes]] = ...,
+    *,
+    count: int = ...,
+    target_latency: Optional[float] = ...,
+    dedupe: bool = ...,
+) -> Iterator[tuple[Any, Any]]: ...
@@ -0,0 +1,278 @@
+from __future__ import annotations
+import socket
+import threading
+
+from reddish._core.errors import CommandError, ConnectionError, PipelineError
+from reddish._core.sentinel import (
+    ROLE,
+    SWITCH_MASTER,
+    PrimaryConnections,
+    failed_over,
+    get_primary_address,
+    is_primary,
+    parse_address,
+    parse_switch_master,
+)
+from ._client import Redis
+from ._subscriber import Subscriber
+
+
+class SentinelRedis:
+    def __init__(self, connect, sentinels, service_name, *, retry_interval=0.1):
+        """Redis client following the primary of a service monitored by sentinels.
+
+        The primary is discovered from the sentinels and new batches move to a new
+        primary as soon as a sentinel announces a failover with `+switch-master`.
+        Batches already in flight on the old primary are allowed to finish.
+
+        Args:
+            connect: function taking a host and a port and returning a
+                `socket.socket` connected to that server.
+            sentinels: `(host, port)` addresses of the sentinels.
+            service_name: name of the monitored primary e.g. `"mymaster"`.
+            retry_interval: seconds to wait before trying to reach the sentinels
+                again after losing the connection to all of them.
+        """
+        self._connect = connect
+        self._sentinels = [tuple(address) for address in sentinels]
+        if not self._sentinels:
+            raise ValueError("At least one sentinel is required.")
+        self._service_name = service_name
+        self._retry_interval = retry_interval
+        self._connections: PrimaryConnections[Redis] = PrimaryConnections()
+        self._lock = threading.Lock()  # guards the connections
+        self._discover_lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._subscriber: Subscriber | None = None
+        self._watcher: threading.Thread | None = None
+        self._watch_error: Exception | None = None
+
+    def __enter__(self):
+        self.discover()
+        self._watcher = threading.Thread(
+            target=self._watch, name="reddish-sentinel", daemon=True
+        )
+        self._watcher.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop following failovers and close all connections."""
+        self._closed.set()
+        subscriber = self._subscriber
+        if subscriber is not None:
+            try:
+                subscriber._stream.shutdown(socket.SHUT_RDWR)  # wakes up the watcher
+            except OSError:
+                pass
+            subscriber.close()
+        with self._lock:
+            self._close(self._connections.close())
+
+    @staticmethod
+    def _close(nodes):
+        for node in nodes:
+            node._redis.mark_broken()
+            node._stream.close()
+
+    def _switch(self, address):
+        with self._lock:
+            self._close(self._connections.switch(address))
+
+    @property
+    def watch_error(self):
+        """The last error watching the sentinels for failovers ran into or `None`.
+
+        Watching goes on with the next sentinel, the error is cleared once one of
+        them is subscribed to again.
+        """
+        return self._watch_error
+
+    @property
+    def primary(self):
+        """Address of the current primary or `None` if it is unknown."""
+        return self._connections.address
+
+    def discover(self):
+        """Ask the sentinels for the address of the current primary.
+
+        Returns:
+            The `(host, port)` address of the primary.
+        """
+        with self._discover_lock:
+            for index, address in enumerate(self._sentinels):
+                try:
+                    sentinel = Redis(self._connect(*address))
+                    try:
+                        reply = sentinel.execute(
+                            get_primary_address(self._service_name)
+                        )
+                    finally:
+                        self._close([sentinel])
+                except (OSError, ConnectionError, PipelineError):
+                    continue
+                primary = parse_address(reply)
+                if primary is None:
+                    continue
+                # ask the sentinel that answered first next time
+                self._sentinels.insert(0, self._sentinels.pop(index))
+                self._switch(primary)
+                return primary
+        raise ConnectionError(
+            f"None of the sentinels knows the primary of '{self._service_name}'."
+        )
+
+    def _watch(self):
+        while not self._closed.is_set():
+            for address in list(self._sentinels):
+                try:
+                    with Subscriber(self._connect(*address)) as subscriber:
+                        self._subscriber = subscriber
+                        if self._closed.is_set():
+                            return
+                        subscriber.subscribe(SWITCH_MASTER)
+                        # failovers may have been missed while not subscribed
+                        self.discover()
+                        self._watch_error = None
+                        for message in subscriber:
+                            primary = parse_switch_master(message, self._service_name)
+                            if primary is not None:
+                                self._switch(primary)
+                except (OSError, ConnectionError, CommandError, PipelineError) as error:
+                    if self._closed.is_set():
+                        return
+                    # e.g. a sentinel not monitoring the service, try the others
+                    self._watch_error = error
+                    continue
+            self._closed.wait(self._retry_interval)
+
+    def _primary_node(self):
+        connections = self._connections
+        with self._lock:
+            node = connections.current
+            if node is not None and not node._redis.broken:
+                connections.started(node)
+                return node
+
+        with self._connect_lock:
+            with self._lock:
+                if node is not None:
+                    self._close(connections.retire(node))
+                node = connections.current  # e.g. connected while waiting
+                if node is not None:
+                    connections.started(node)
+                    return node
+            for _ in range(2):
+                address = connections.address or self.discover()
+                node = Redis(self._connect(*address))
+                try:
+                    role = node.execute(ROLE)
+                except BaseException:
+                    self._close([node])
+                    raise
+                with self._lock:
+                    if connections.address == address and is_primary(role):
+                        connections.connected(node)
+                        connections.started(node)
+                        return node
+                    self._close([node])  # failed over in the meantime
+                    self._close(connections.switch(None))
+        raise ConnectionError(
+            f"Couldn't connect to the primary of '{self._service_name}'."
+        )
+
+    def _failed(self, node):
+        # the primary broke or was demoted, find out where it went for new batches
+        with self._lock:
+            if node is self._connections.current:
+                self._close(self._connections.switch(None))
+
+    def _finished(self, node):
+        with self._lock:
+            self._close(self._connections.finished(node))
+
+    def execute_many(self, *commands):
+        """Execute multiple redis commands at once on the primary.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Returns:
+            Responses from redis as received or parsed into the types
+            provided to the commands.
+        """
+
+        node = self._primary_node()
+        try:
+            return node.execute_many(*commands)
+        except (OSError, ConnectionError):
+            self._failed(node)
+            raise
+        except PipelineError as error:
+            if failed_over(error):
+                self._failed(node)
+            raise
+        finally:
+            self._finished(node)
+
+    def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command as soon as its reply arrived.
+        """
+
+        node = self._primary_node()
+        try:
+            for outcome in node.execute_iter(*commands):
+                if failed_over(outcome):
+                    self._failed(node)
+                yield outcome
+        except (OSError, ConnectionError):
+            self._failed(node)
+            raise
+        finally:
+            self._finished(node)
+
+    def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands on the primary keeping up to `window`
+        of them in flight.
+
+        Args:
+            commands: An iterable of the commands to be executed.
+            window: The maximum number of commands sent but not yet replied to.
+
+        Yields:
+            An `Outcome` for each command in order as soon as its reply arrived.
+        """
+
+        node = self._primary_node()
+        try:
+            for outcome in node.execute_stream(commands, window):
+                if failed_over(outcome):
+                    self._failed(node)
+                yield outcome
+        except (OSError, ConnectionError):
+            self._failed(node)
+            raise
+        finally:
+            self._finished(node)
+
+    def execute(self, command):
+        """Execute a single redis command on the primary.
+
+        Args:
+            command: The command to be executed.
+
+        Returns:
+            Response from redis as received or parsed into the type
+            provided to the command.
+        """
+
+        return (self.execute_many(command))[0]
@@ -0,0 +1,21 @@
+import socket
+from typing import Any, Optional, Callable, Iterable
+from reddish.clients._client_stubs import SyncRedis
+
+class SentinelRedis(SyncRedis):
+    def __init__(
+        self,
+        connect: Callable[[str, int], socket.socket],
+        sentinels: Iterable[tuple[str, int]],
+        service_name: str,
+        *,
+        retry_interval: float = ...,
+    ) -> None: ...
+    def __enter__(self) -> SentinelRedis: ...
+    def __exit__(self, *exc_info: Any) -> None: ...
+    def close(self) -> None: ...
+    def discover(self) -> tuple[str, int]: ...
+    @property
+    def watch_error(self) -> Optional[Exception]: ...
+    @property
+    def primary(self) -> Optional[tuple[str, int]]: ...
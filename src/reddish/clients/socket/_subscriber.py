@@ -0,0 +1,125 @@
+from __future__ import annotations
+import socket
+import threading
+from collections import deque
+
+from reddish._core.pubsub import SubscriberSansIO, Message
+from reddish._core.errors import ConnectionError
+
+
+class Subscriber:
+    def __init__(self, stream: socket.socket) -> None:
+        """Subscriber receiving messages published to channels.
+
+        The subscriber owns its connection which can't be used for executing
+        other commands. Channels can be added and removed at any time, also
+        while iterating over messages.
+
+        Args:
+            stream: a `socket.socket` connected to a redis server.
+        """
+        if not isinstance(stream, socket.socket):
+            raise TypeError(
+                f"'{repr(stream)}' is not an instance of '{repr(socket.socket)}'"
+            )
+        self._stream = stream
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._subscriber = SubscriberSansIO()
+        self._messages: deque[Message] = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the connection of the subscriber."""
+        self._subscriber.mark_broken()
+        self._stream.close()
+
+    @property
+    def channels(self) -> frozenset[bytes]:
+        """Channels the subscriber is subscribed to as confirmed by redis."""
+        return frozenset(self._subscriber.channels)
+
+    @property
+    def patterns(self) -> frozenset[bytes]:
+        """Patterns the subscriber is subscribed to as confirmed by redis."""
+        return frozenset(self._subscriber.patterns)
+
+    @property
+    def shard_channels(self) -> frozenset[bytes]:
+        """Shard channels the subscriber is subscribed to as confirmed by redis."""
+        return frozenset(self._subscriber.shard_channels)
+
+    def subscribe(self, *channels):
+        """Subscribe to messages published to `channels`."""
+        self._send(self._subscriber.subscribe(*channels))
+
+    def psubscribe(self, *patterns):
+        """Subscribe to messages published to channels matching glob-style `patterns`."""
+        self._send(self._subscriber.psubscribe(*patterns))
+
+    def ssubscribe(self, *channels):
+        """Subscribe to messages published to shard `channels`."""
+        self._send(self._subscriber.ssubscribe(*channels))
+
+    def unsubscribe(self, *channels):
+        """Unsubscribe from `channels` or from all channels if none are given."""
+        self._send(self._subscriber.unsubscribe(*channels))
+
+    def punsubscribe(self, *patterns):
+        """Unsubscribe from `patterns` or from all patterns if none are given."""
+        self._send(self._subscriber.punsubscribe(*patterns))
+
+    def sunsubscribe(self, *channels):
+        """Unsubscribe from shard `channels` or from all of them if none are given."""
+        self._send(self._subscriber.sunsubscribe(*channels))
+
+    def _send(self, request):
+        with self._write_lock:
+            try:
+                self._stream.sendall(request)
+            except OSError:
+                self._subscriber.mark_broken()
+                raise ConnectionError()
+
+    def get_messages(self):
+        """Wait for messages and return all messages received so far.
+
+        Returns:
+            A list of at least one `Message`.
+        """
+        if self._messages:
+            messages = list(self._messages)
+            self._messages.clear()
+            return messages
+
+        subscriber = self._subscriber
+        messages = subscriber.receive(b"")  # e.g. messages after an error reply
+        if messages:
+            return messages
+        with self._read_lock:
+            try:
+                while True:
+                    nbytes = self._stream.recv_into(subscriber.get_buffer())
+                    if nbytes == 0:
+                        subscriber.mark_broken()
+                        raise ConnectionError()
+                    messages = subscriber.buffer_updated(nbytes)
+                    if messages:
+                        return messages
+            except OSError:
+                subscriber.mark_broken()
+                raise ConnectionError()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Message:
+        messages = self._messages
+        if not messages:
+            messages.extend(self.get_messages())
+        return messages.popleft()
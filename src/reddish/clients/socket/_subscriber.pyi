@@ -0,0 +1,24 @@
+import socket
+from typing import Iterator, Union
+from reddish._core.pubsub import Message
+
+class Subscriber:
+    def __init__(self, stream: socket.socket) -> None: ...
+    def __enter__(self) -> Subscriber: ...
+    def __exit__(self, *exc_info: object) -> None: ...
+    def close(self) -> None: ...
+    @property
+    def channels(self) -> frozenset[bytes]: ...
+    @property
+    def patterns(self) -> frozenset[bytes]: ...
+    @property
+    def shard_channels(self) -> frozenset[bytes]: ...
+    def subscribe(self, *channels: Union[str, bytes]) -> None: ...
+    def psubscribe(self, *patterns: Union[str, bytes]) -> None: ...
+    def ssubscribe(self, *channels: Union[str, bytes]) -> None: ...
+    def unsubscribe(self, *channels: Union[str, bytes]) -> None: ...
+    def punsubscribe(self, *patterns: Union[str, bytes]) -> None: ...
+    def sunsubscribe(self, *channels: Union[str, bytes]) -> None: ...
+    def get_messages(self) -> list[Message]: ...
+    def __iter__(self) -> Iterator[Message]: ...
+    def __next__(self) -> Message: ...
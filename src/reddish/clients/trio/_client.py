@@ -2,23 +2,116 @@ try:
     import trio
 except ImportError:
     raise ImportError("Execute 'pip install reddish[trio]' to enable trio support")
+import select
+from typing import Optional
 from reddish._core.sansio import RedisSansIO, NOT_ENOUGH_DATA
-from reddish._core.errors import ConnectionError
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
+from reddish._core.autopipeline import AutoPipeline
+from reddish._core.errors import ConnectionError, PipelineError
+from reddish._core.script import ScriptRetry
+from reddish._core.stream import StreamWindow, iterate, take_async
 
 
 class Redis:
-    def __init__(self, stream: trio.abc.Stream) -> None:
+    def __init__(
+        self,
+        stream: trio.abc.Stream,
+        *,
+        autopipeline: bool = False,
+        flush_interval: float = 0.0,
+        cache: Optional[ClientSideCache] = None,
+        protocol: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
         """Redis client for executing commands.
 
         Args:
             stream: a `trio.abc.Stream` connected to a redis server.
+            autopipeline: coalesce commands of concurrent callers into a single
+                pipeline instead of executing them one after another.
+            flush_interval: seconds to wait for more concurrent commands before
+                sending an automatic pipeline. The default of `0` only waits for
+                commands issued in the same event loop iteration.
+            cache: a `ClientSideCache` serving replies of read-only commands
+                locally. It can be shared between connections.
+            protocol: `3` to negotiate RESP3 which decodes maps, doubles and
+                booleans into native python types or `2` for RESP2. Defaults to
+                RESP3 with a cache and RESP2 otherwise.
+            instrumentation: hooks called for every batch of commands e.g. a
+                `LatencyRecorder`.
         """
 
         if not isinstance(stream, trio.abc.Stream):
             raise TypeError(f"'{repr(stream)}' is not an instance of 'trio.abc.Stream'")
         self._stream = stream
         self._lock = trio.Lock()
-        self._redis = RedisSansIO()
+        self._redis = RedisSansIO(
+            cache=cache, protocol=protocol, instrumentation=instrumentation
+        )
+        self._pipeline = AutoPipeline() if autopipeline else None
+        self._flush_interval = flush_interval
+
+    async def _execute_many(self, commands):
+        try:
+            return await self._send_and_receive(commands)
+        except PipelineError as error:
+            # scripts redis lost e.g. after `SCRIPT FLUSH` are loaded again
+            retry = ScriptRetry.from_error(commands, error)
+            if retry is None:
+                raise
+        try:
+            replies = await self._send_and_receive(retry.commands)
+        except PipelineError as error:
+            replies = error
+        return retry.resolve(replies)
+
+    async def _send_and_receive(self, commands):
+        redis = self._redis
+        stream = self._stream
+
+        try:
+            await self._receive_pushes()
+            for chunk in redis.send_chunks(commands):
+                await stream.send_all(chunk)
+
+            replies = redis.receive(b"")  # e.g. served from the client side cache
+            while replies is NOT_ENOUGH_DATA:
+                data = await stream.receive_some(redis.read_size)
+                if data == b"":
+                    raise ConnectionError()
+                replies = redis.receive(data)
+            return replies
+        except (trio.BrokenResourceError, trio.ClosedResourceError):
+            redis.mark_broken()
+            raise ConnectionError()
+        except trio.Cancelled:
+            redis.mark_broken()
+            raise
+
+    async def _execute_pipelined(self, commands):
+        pipeline = self._pipeline
+        request = pipeline.add(commands)
+
+        try:
+            async with self._lock:
+                if not request.done:  # no earlier caller took this request along
+                    await trio.sleep(self._flush_interval)
+                    batch = pipeline.take()
+                    try:
+                        replies = await self._execute_many(batch.commands)
+                    except PipelineError as error:
+                        batch.resolve(error.outcomes)
+                    except BaseException:
+                        batch.fail()
+                        raise
+                    else:
+                        batch.resolve_replies(replies)
+        except BaseException:
+            pipeline.discard(request)
+            raise
+
+        return request.unwrap()
 
     async def execute_many(self, *commands):
         """Execute multiple redis commands at once.
@@ -31,29 +124,115 @@ class Redis:
             provided to the commands.
         """
 
+        if self._pipeline is not None:
+            return await self._execute_pipelined(commands)
+
+        async with self._lock:
+            return await self._execute_many(commands)
+
+    async def _receive_pushes(self):
+        # invalidations pending on the connection are handled before the cache
+        # serves replies
+        redis = self._redis
+        stream = self._stream
+        if not redis.caching or not isinstance(stream, trio.SocketStream):
+            return  # e.g. data buffered by TLS streams can't be checked for
+        while select.select([stream.socket], [], [], 0)[0]:
+            data = await stream.receive_some(redis.read_size)
+            if data == b"":
+                raise ConnectionError()
+            redis.receive_pushes(data)
+
+    async def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command as soon as its reply arrived. Calling
+            `.unwrap()` on it returns the reply as received or parsed into the
+            type provided to the command or raises the command's error.
+
+        The connection is reserved for the iteration. If it is stopped before all
+        outcomes were received the connection can't be used anymore.
+        """
+
         redis = self._redis
         stream = self._stream
+        remaining = 0
 
         async with self._lock:
             try:
-                request = redis.send(commands)
-                await stream.send_all(request)
+                await self._receive_pushes()
+                chunks = redis.send_chunks(commands)
+                remaining = len(commands)
+                for chunk in chunks:
+                    await stream.send_all(chunk)
 
-                while True:
-                    data = await stream.receive_some()
+                for outcome in redis.receive_outcomes(b""):  # e.g. from the cache
+                    remaining -= 1
+                    yield outcome
+
+                while remaining:
+                    data = await stream.receive_some(redis.read_size)
                     if data == b"":
                         raise ConnectionError()
-                    replies = redis.receive(data)
-                    if replies is NOT_ENOUGH_DATA:
-                        continue
-                    else:
-                        return replies
+                    for outcome in redis.receive_outcomes(data):
+                        remaining -= 1
+                        yield outcome
             except (trio.BrokenResourceError, trio.ClosedResourceError):
                 redis.mark_broken()
                 raise ConnectionError()
-            except trio.Cancelled:
+            finally:
+                if remaining:  # replies left unread
+                    redis.mark_broken()
+
+    async def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands keeping up to `window` of them in flight.
+
+        Suits bulk loads: commands are taken from the iterable as replies arrive so
+        memory stays bounded and no round trips are wasted between batches.
+
+        Args:
+            commands: An iterable or async iterable of the commands to be executed.
+            window: The maximum number of commands sent but not yet replied to.
+
+        Yields:
+            An `Outcome` for each command in order as soon as its reply arrived.
+
+        The connection is reserved for the iteration. If it is stopped before all
+        outcomes were received the connection can't be used anymore.
+        """
+
+        redis = self._redis
+        stream = self._stream
+        stream_window = StreamWindow(redis, window)
+        commands = iterate(commands)
+
+        async with self._lock:
+            try:
+                while not stream_window.done:
+                    wanted = stream_window.wanted
+                    if wanted:
+                        batch = await take_async(commands, wanted)
+                        await self._receive_pushes()
+                        for chunk in stream_window.send_chunks(batch):
+                            await stream.send_all(chunk)
+                        outcomes = stream_window.receive(b"")  # e.g. from the cache
+                    else:
+                        data = await stream.receive_some(redis.read_size)
+                        if data == b"":
+                            raise ConnectionError()
+                        outcomes = stream_window.receive(data)
+                    for outcome in outcomes:
+                        yield outcome
+            except (trio.BrokenResourceError, trio.ClosedResourceError):
                 redis.mark_broken()
-                raise
+                raise ConnectionError()
+            finally:
+                if stream_window.in_flight:  # replies left unread
+                    redis.mark_broken()
 
     async def execute(self, command):
         """Execute a single redis command.
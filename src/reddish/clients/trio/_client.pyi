@@ -1,5 +1,16 @@
 import trio
+from reddish._core.cache import ClientSideCache
+from reddish._core.instrumentation import Instrumentation
 from reddish.clients._client_stubs import AsyncRedis
 
 class Redis(AsyncRedis):
-    def __init__(self, stream: trio.abc.Stream) -> None: ...
+    def __init__(
+        self,
+        stream: trio.abc.Stream,
+        *,
+        autopipeline: bool = ...,
+        flush_interval: float = ...,
+        cache: ClientSideCache | None = ...,
+        protocol: int | None = ...,
+        instrumentation: Instrumentation | None = ...,
+    ) -> None: ...
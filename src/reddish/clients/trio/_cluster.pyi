@@ -0,0 +1,16 @@
+import trio
+from typing import Any, Awaitable, Callable, Iterable
+from reddish.clients._client_stubs import AsyncRedis
+
+class RedisCluster(AsyncRedis):
+    def __init__(
+        self,
+        connect: Callable[[str, int], Awaitable[trio.abc.Stream]],
+        startup_nodes: Iterable[tuple[str, int]],
+        *,
+        max_redirects: int = ...,
+    ) -> None: ...
+    async def __aenter__(self) -> RedisCluster: ...
+    async def __aexit__(self, *exc_info: Any) -> None: ...
+    async def close(self) -> None: ...
+    async def refresh(self) -> None: ...
@@ -0,0 +1,21 @@
+import trio
+from typing import Any, Literal, Optional, Awaitable, Callable, Iterable
+from reddish.clients._client_stubs import AsyncRedis
+
+class ReplicatedRedis(AsyncRedis):
+    def __init__(
+        self,
+        connect: Callable[[str, int], Awaitable[trio.abc.Stream]],
+        primary: tuple[str, int],
+        *,
+        replicas: Optional[Iterable[tuple[str, int]]] = ...,
+        balancing: Literal["round_robin", "least_outstanding"] = ...,
+        max_lag: Optional[int] = ...,
+        lag_check_interval: float = ...,
+    ) -> None: ...
+    async def __aenter__(self) -> ReplicatedRedis: ...
+    async def __aexit__(self, *exc_info: Any) -> None: ...
+    async def close(self) -> None: ...
+    async def refresh(self) -> None: ...
+    @property
+    def replicas(self) -> list[tuple[str, int]]: ...
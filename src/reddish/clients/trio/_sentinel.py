@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+try:
+    import trio
+except ImportError:
+    raise ImportError("Execute 'pip install reddish[trio]' to enable trio support")
+
+from reddish._core.errors import CommandError, ConnectionError, PipelineError
+from reddish._core.sentinel import (
+    ROLE,
+    SWITCH_MASTER,
+    PrimaryConnections,
+    failed_over,
+    get_primary_address,
+    is_primary,
+    parse_address,
+    parse_switch_master,
+)
+from ._client import Redis
+from ._subscriber import Subscriber
+
+
+class SentinelRedis:
+    def __init__(self, connect, sentinels, service_name, *, retry_interval=0.1):
+        """Redis client following the primary of a service monitored by sentinels.
+
+        The primary is discovered from the sentinels and new batches move to a new
+        primary as soon as a sentinel announces a failover with `+switch-master`.
+        Batches already in flight on the old primary are allowed to finish.
+
+        Args:
+            connect: async function taking a host and a port and returning a
+                `trio.abc.Stream` connected to that server e.g. `trio.open_tcp_stream`.
+            sentinels: `(host, port)` addresses of the sentinels.
+            service_name: name of the monitored primary e.g. `"mymaster"`.
+            retry_interval: seconds to wait before trying to reach the sentinels
+                again after losing the connection to all of them.
+        """
+        self._connect = connect
+        self._sentinels = [tuple(address) for address in sentinels]
+        if not self._sentinels:
+            raise ValueError("At least one sentinel is required.")
+        self._service_name = service_name
+        self._retry_interval = retry_interval
+        self._connections: PrimaryConnections[Redis] = PrimaryConnections()
+        self._discover_lock = trio.Lock()
+        self._connect_lock = trio.Lock()
+        self._tasks = None  # watching for failovers while entered
+        self._unclosed: list[Redis] = []  # retired while not entered
+        self._watch_error: Exception | None = None
+
+    async def __aenter__(self):
+        await self.discover()
+        self._tasks_manager = trio.open_nursery()
+        self._tasks = await self._tasks_manager.__aenter__()
+        self._tasks.start_soon(self._watch)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Stop following failovers and close all connections."""
+        tasks, self._tasks = self._tasks, None
+        if tasks is not None:
+            tasks.cancel_scope.cancel()
+            await self._tasks_manager.__aexit__(None, None, None)
+        nodes = [*self._unclosed, *self._connections.close()]
+        self._unclosed.clear()
+        for node in nodes:
+            node._redis.mark_broken()
+            await node._stream.aclose()
+
+    def _close(self, nodes):
+        # closing streams has to be awaited so it's left to a background task
+        for node in nodes:
+            node._redis.mark_broken()
+            if self._tasks is not None:
+                self._tasks.start_soon(node._stream.aclose)
+            else:
+                self._unclosed.append(node)
+
+    @property
+    def watch_error(self):
+        """The last error watching the sentinels for failovers ran into or `None`.
+
+        Watching goes on with the next sentinel, the error is cleared once one of
+        them is subscribed to again.
+        """
+        return self._watch_error
+
+    @property
+    def primary(self):
+        """Address of the current primary or `None` if it is unknown."""
+        return self._connections.address
+
+    async def discover(self):
+        """Ask the sentinels for the address of the current primary.
+
+        Returns:
+            The `(host, port)` address of the primary.
+        """
+        async with self._discover_lock:
+            for index, address in enumerate(self._sentinels):
+                try:
+                    stream = await self._connect(*address)
+                    try:
+                        reply = await Redis(stream).execute(
+                            get_primary_address(self._service_name)
+                        )
+                    finally:
+                        await stream.aclose()
+                except (OSError, ConnectionError, PipelineError):
+                    continue
+                primary = parse_address(reply)
+                if primary is None:
+                    continue
+                # ask the sentinel that answered first next time
+                self._sentinels.insert(0, self._sentinels.pop(index))
+                self._close(self._connections.switch(primary))
+                return primary
+        raise ConnectionError(
+            f"None of the sentinels knows the primary of '{self._service_name}'."
+        )
+
+    async def _watch(self):
+        while True:
+            for address in list(self._sentinels):
+                try:
+                    async with Subscriber(await self._connect(*address)) as subscriber:
+                        await subscriber.subscribe(SWITCH_MASTER)
+                        # failovers may have been missed while not subscribed
+                        await self.discover()
+                        self._watch_error = None
+                        async for message in subscriber:
+                            primary = parse_switch_master(message, self._service_name)
+                            if primary is not None:
+                                self._close(self._connections.switch(primary))
+                except (OSError, ConnectionError, CommandError, PipelineError) as error:
+                    # e.g. a sentinel not monitoring the service, try the others
+                    self._watch_error = error
+                    continue
+            await trio.sleep(self._retry_interval)
+
+    async def _primary_node(self):
+        connections = self._connections
+        node = connections.current
+        if node is not None and not node._redis.broken:
+            return node
+
+        async with self._connect_lock:
+            if node is not None:
+                self._close(connections.retire(node))
+            node = connections.current  # e.g. connected while waiting for the lock
+            if node is not None:
+                return node
+            for _ in range(2):
+                address = connections.address or await self.discover()
+                node = Redis(await self._connect(*address))
+                try:
+                    role = await node.execute(ROLE)
+                except BaseException:
+                    await node._stream.aclose()
+                    raise
+                if connections.address == address and is_primary(role):
+                    connections.connected(node)
+                    return node
+                await node._stream.aclose()  # failed over in the meantime
+                self._close(connections.switch(None))
+        raise ConnectionError(
+            f"Couldn't connect to the primary of '{self._service_name}'."
+        )
+
+    def _failed(self, node):
+        # the primary broke or was demoted, find out where it went for new batches
+        if node is self._connections.current:
+            self._close(self._connections.switch(None))
+
+    async def execute_many(self, *commands):
+        """Execute multiple redis commands at once on the primary.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Returns:
+            Responses from redis as received or parsed into the types
+            provided to the commands.
+        """
+
+        node = await self._primary_node()
+        self._connections.started(node)
+        try:
+            return await node.execute_many(*commands)
+        except (OSError, ConnectionError):
+            self._failed(node)
+            raise
+        except PipelineError as error:
+            if failed_over(error):
+                self._failed(node)
+            raise
+        finally:
+            self._close(self._connections.finished(node))
+
+    async def execute_iter(self, *commands):
+        """Execute multiple redis commands at once and iterate over their outcomes.
+
+        Args:
+            *commands: The commands to be executed.
+
+        Yields:
+            An `Outcome` for each command as soon as its reply arrived.
+        """
+
+        node = await self._primary_node()
+        self._connections.started(node)
+        try:
+            async for outcome in node.execute_iter(*commands):
+                if failed_over(outcome):
+                    self._failed(node)
+                yield outcome
+        except (OSError, ConnectionError):
+            self._failed(node)
+            raise
+        finally:
+            self._close(self._connections.finished(node))
+
+    async def execute_stream(self, commands, window=1000):
+        """Execute a stream of redis commands on the primary keeping up to `window`
+        of them in flight.
+
+        Args:
+            commands: An iterable or async iterable of the commands to be executed.
+            window: The maximum number of commands sent but not yet replied to.
+
+        Yields:
+            An `Outcome` for each command in order as soon as its reply arrived.
+        """
+
+        node = await self._primary_node()
+        self._connections.started(node)
+        try:
+            async for outcome in node.execute_stream(commands, window):
+                if failed_over(outcome):
+                    self._failed(node)
+                yield outcome
+        except (OSError, ConnectionError):
+            self._failed(node)
+            raise
+        finally:
+            self._close(self._connections.finished(node))
+
+    async def execute(self, command):
+        """Execute a single redis command on the primary.
+
+        Args:
+            command: The command to be executed.
+
+        Returns:
+            Response from redis as received or parsed into the type
+            provided to the command.
+        """
+
+        return (await self.execute_many(command))[0]
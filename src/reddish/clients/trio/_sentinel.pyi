@@ -0,0 +1,21 @@
+import trio
+from typing import Any, Optional, Awaitable, Callable, Iterable
+from reddish.clients._client_stubs import AsyncRedis
+
+class SentinelRedis(AsyncRedis):
+    def __init__(
+        self,
+        connect: Callable[[str, int], Awaitable[trio.abc.Stream]],
+        sentinels: Iterable[tuple[str, int]],
+        service_name: str,
+        *,
+        retry_interval: float = ...,
+    ) -> None: ...
+    async def __aenter__(self) -> SentinelRedis: ...
+    async def __aexit__(self, *exc_info: Any) -> None: ...
+    async def close(self) -> None: ...
+    async def discover(self) -> tuple[str, int]: ...
+    @property
+    def watch_error(self) -> Optional[Exception]: ...
+    @property
+    def primary(self) -> Optional[tuple[str, int]]: ...
@@ -1,2 +1,17 @@
 from ._basic import Ok, ErrorMessage  # noqa: F401
+from ._replies import (  # noqa: F401
+    Hash,
+    Info,
+    Numbers,
+    ScoredMembers,
+    StreamEntries,
+    StreamEntry,
+)
+from ._arrays import (  # noqa: F401
+    Array,
+    NDArray,
+    ParallelArrays,
+    ScoredArrays,
+    ScoredNDArrays,
+)
 from pydantic import Json  # noqa: F401
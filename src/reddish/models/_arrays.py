@@ -0,0 +1,148 @@
+from array import array
+from typing import Any, NamedTuple
+
+from ._replies import _ReplyModel, _convert
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_TYPECODES = {int: "q", float: "d"}
+_DTYPES = {int: "int64", float: "float64"}
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError(
+            "Execute 'pip install reddish[numpy]' to enable NumPy support"
+        )
+
+
+def _check_numeric(cls):
+    if cls._types[0] not in _TYPECODES:
+        raise TypeError(f"{cls.__name__} holds int or float")
+
+
+def _array(model, values):
+    # values are bulk strings, or numbers in RESP3 and for integer replies
+    type_ = model._types[0]
+    typecode = _TYPECODES[type_]
+    try:
+        return model(typecode, map(type_, values))
+    except TypeError:
+        if type_ is not float or None not in values:
+            raise
+    # missing values e.g. of keys that don't exist become NaN
+    return model(typecode, [float("nan") if v is None else float(v) for v in values])
+
+
+def _ndarray(type_, values):
+    dtype = _DTYPES[type_]
+    if not values:
+        return numpy.empty(0, dtype)  # asarray would make it float64
+    raw = numpy.asarray(values)  # bulk strings are copied into a fixed width array
+    if raw.dtype.kind in ("Sfiu" if type_ is float else "Siu"):
+        return raw.astype(dtype)  # parses bulk strings without python objects
+    if type_ is float:
+        # missing values e.g. of keys that don't exist become NaN
+        values = [b"nan" if v is None else v for v in values]
+        return numpy.asarray(values).astype(dtype)
+    raise ValueError("value is not a list of numbers")
+
+
+def _split_scored(value):
+    # members and scores of RESP2 flat lists and RESP3 lists of pairs
+    if type(value) is not list:
+        raise ValueError("value is not a list of members and scores")
+    if value and type(value[0]) is list:  # RESP3
+        return [pair[0] for pair in value], [pair[1] for pair in value]
+    if len(value) % 2:
+        raise ValueError("value is not a list of members and scores")
+    return value[::2], value[1::2]
+
+
+class Array(_ReplyModel, array):
+    """Numbers of an array reply e.g. from `LRANGE` stored in an `array.array`.
+
+    Holds `float` (typecode `d`) unless given `int` (typecode `q`) e.g.
+    `Array[int]`. Numbers are stored unboxed taking 8 bytes each. Missing values
+    become NaN in float arrays.
+    """
+
+    _types = (float,)
+    _converters = (float,)
+
+    @classmethod
+    def _convert_reply(cls, value):
+        if type(value) is not list:
+            raise ValueError("value is not a list of numbers")
+        _check_numeric(cls)
+        return _array(cls, value)
+
+
+class NDArray(_ReplyModel):
+    """Numbers of an array reply e.g. from `LRANGE` in a contiguous NumPy array.
+
+    Holds `float64` unless given `int` (`int64`) e.g. `NDArray[int]`. Bulk strings
+    are parsed by NumPy without creating python numbers. Missing values become NaN
+    in float arrays. Requires NumPy (`pip install reddish[numpy]`).
+    """
+
+    _types = (float,)
+    _converters = (float,)
+
+    @classmethod
+    def _convert_reply(cls, value):
+        _require_numpy()
+        if type(value) is not list:
+            raise ValueError("value is not a list of numbers")
+        _check_numeric(cls)
+        return _ndarray(cls._types[0], value)
+
+
+class ParallelArrays(NamedTuple):
+    """Members and their scores at the same positions."""
+
+    members: Any
+    scores: Any
+
+
+class ScoredArrays(_ReplyModel):
+    """`WITHSCORES` replies e.g. from `ZRANGE` as `ParallelArrays`.
+
+    Scores are stored in an `array.array` of floats. Members are decoded into a
+    list of `str` unless another type is given e.g. `ScoredArrays[float]` which
+    stores numeric members in an array as well.
+    """
+
+    _types = (str,)
+    _converters = (bytes.decode,)
+
+    @classmethod
+    def _convert_reply(cls, value):
+        members, scores = _split_scored(value)
+        type_ = cls._types[0]
+        if type_ in _TYPECODES:
+            members = _array(Array[type_], members)
+        else:
+            members = list(_convert(cls._converters[0], members))
+        return ParallelArrays(members, _array(Array, scores))
+
+
+class ScoredNDArrays(ScoredArrays):
+    """Like `ScoredArrays` with NumPy arrays for scores and numeric members.
+
+    Requires NumPy (`pip install reddish[numpy]`).
+    """
+
+    @classmethod
+    def _convert_reply(cls, value):
+        _require_numpy()
+        members, scores = _split_scored(value)
+        type_ = cls._types[0]
+        if type_ in _DTYPES:
+            members = _ndarray(type_, members)
+        else:
+            members = list(_convert(cls._converters[0], members))
+        return ParallelArrays(members, _ndarray(float, scores))
@@ -0,0 +1,15 @@
+from array import array
+from typing import Any, Generic, List, NamedTuple, TypeVar, Union
+
+N = TypeVar("N", int, float)
+M = TypeVar("M")
+
+class Array(array[N]): ...
+class NDArray(Generic[N]): ...
+
+class ParallelArrays(NamedTuple):
+    members: Union[List[Any], array[Any], Any]
+    scores: Any
+
+class ScoredArrays(ParallelArrays, Generic[M]): ...
+class ScoredNDArrays(ParallelArrays, Generic[M]): ...
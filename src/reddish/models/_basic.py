@@ -5,9 +5,15 @@ from hiredis import ReplyError
 
 class Ok:
     @classmethod
-    def __get_validators__(cls):
+    def __get_validators__(cls):  # pydantic 1.x
         yield cls._validate
 
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):  # pydantic >= 2
+        from pydantic_core import core_schema
+
+        return core_schema.no_info_plain_validator_function(cls._validate)
+
     @classmethod
     def _validate(cls, value):
         if isinstance(value, cls):
@@ -24,9 +30,15 @@ class ErrorMessage:
     message: str
 
     @classmethod
-    def __get_validators__(cls):
+    def __get_validators__(cls):  # pydantic 1.x
         yield cls._validate
 
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):  # pydantic >= 2
+        from pydantic_core import core_schema
+
+        return core_schema.no_info_plain_validator_function(cls._validate)
+
     @classmethod
     def _validate(cls, value):
         if isinstance(value, cls):
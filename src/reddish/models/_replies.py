@@ -0,0 +1,236 @@
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+# converters for the types models can be parametrized with; `None` keeps the value
+_CONVERTERS: Dict[type, Optional[Callable[[Any], Any]]] = {
+    str: bytes.decode,
+    bytes: None,
+    int: int,
+    float: float,
+}
+
+_parametrized: Dict[Tuple[type, Tuple[type, ...]], type] = {}
+
+
+def _converter(type_):
+    try:
+        return _CONVERTERS[type_]
+    except (KeyError, TypeError):
+        raise TypeError(f"{type_!r} is not one of str, bytes, int or float") from None
+
+
+def _convert(convert, values):
+    return values if convert is None else map(convert, values)
+
+
+def _pairs(value):
+    # keys and values of RESP2 flat pair lists and RESP3 maps
+    if type(value) is list:
+        if len(value) % 2:
+            raise ValueError("value is not a list of pairs")
+        return value[::2], value[1::2]
+    elif type(value) is dict:
+        return value.keys(), value.values()
+    raise ValueError("value is not a list of pairs or a map")
+
+
+class _ReplyModel:
+    """Base of models converting replies with tight loops instead of pydantic.
+
+    `Command.into` calls `_convert_reply` directly. Nested into other types e.g.
+    `Optional[Hash]` models are validated through pydantic.
+    """
+
+    _types: Tuple[type, ...] = ()
+    _converters: Tuple[Optional[Callable[[Any], Any]], ...] = ()
+
+    def __class_getitem__(cls, types):
+        if not isinstance(types, tuple):
+            types = (types,)
+        if len(types) != len(cls._types):
+            raise TypeError(f"{cls.__name__} takes {len(cls._types)} type(s)")
+        try:
+            return _parametrized[cls, types]
+        except KeyError:
+            pass
+        name = f"{cls.__name__}[{', '.join(t.__name__ for t in types)}]"
+        namespace = {
+            "_types": types,
+            "_converters": tuple(_converter(t) for t in types),
+            "__module__": cls.__module__,
+            "__qualname__": name,
+        }
+        model = _parametrized[cls, types] = type(name, (cls,), namespace)
+        return model
+
+    @classmethod
+    def __get_validators__(cls):  # pydantic 1.x
+        yield cls._validate
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):  # pydantic >= 2
+        from pydantic_core import core_schema
+
+        return core_schema.no_info_plain_validator_function(cls._validate)
+
+    @classmethod
+    def _validate(cls, value):
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls._convert_reply(value)
+        except TypeError as error:  # pydantic only reports value errors
+            raise ValueError(str(error)) from None
+
+    @classmethod
+    def _convert_reply(cls, value):
+        raise NotImplementedError
+
+
+class Hash(_ReplyModel, dict):
+    """Fields and values of a hash e.g. from `HGETALL` or `CONFIG GET`.
+
+    Converts RESP2 flat lists of pairs as well as RESP3 maps. Keys and values are
+    decoded into `str` unless other types are given e.g. `Hash[str, int]`.
+    """
+
+    _types = (str, str)
+    _converters = (bytes.decode, bytes.decode)
+
+    @classmethod
+    def _convert_reply(cls, value):
+        keys, values = _pairs(value)
+        convert_key, convert_value = cls._converters
+        return cls(zip(_convert(convert_key, keys), _convert(convert_value, values)))
+
+
+class ScoredMembers(_ReplyModel, list):
+    """`(member, score)` tuples e.g. from `ZRANGE ... WITHSCORES`.
+
+    Converts RESP2 flat lists alternating members and scores as well as RESP3
+    lists of pairs. Members are decoded into `str` unless another type is given
+    e.g. `ScoredMembers[bytes]`.
+    """
+
+    _types = (str,)
+    _converters = (bytes.decode,)
+
+    @classmethod
+    def _convert_reply(cls, value):
+        if type(value) is not list:
+            raise ValueError("value is not a list of members and scores")
+        if value and type(value[0]) is list:  # RESP3
+            members = [pair[0] for pair in value]
+            scores = [pair[1] for pair in value]
+        elif len(value) % 2:
+            raise ValueError("value is not a list of members and scores")
+        else:
+            members, scores = value[::2], value[1::2]
+        (convert_member,) = cls._converters
+        return cls(zip(_convert(convert_member, members), map(float, scores)))
+
+
+class StreamEntry(NamedTuple):
+    id: str
+    fields: Dict[Any, Any]
+
+
+class StreamEntries(_ReplyModel, list):
+    """`StreamEntry` tuples of ids and fields e.g. from `XRANGE`.
+
+    Fields are decoded like a `Hash` and can be given other types e.g.
+    `StreamEntries[str, bytes]`. Entries deleted since they were read e.g. with
+    `XREADGROUP` have no fields.
+    """
+
+    _types = (str, str)
+    _converters = (bytes.decode, bytes.decode)
+
+    @classmethod
+    def _convert_reply(cls, value):
+        if type(value) is not list:
+            raise ValueError("value is not a list of stream entries")
+        convert_key, convert_value = cls._converters
+        entries = []
+        append = entries.append
+        new_entry = tuple.__new__  # skips the python level `__new__` of named tuples
+        for id, fields in value:
+            if type(fields) is list and not len(fields) % 2:
+                keys, values = fields[::2], fields[1::2]
+            elif fields is None:
+                keys = values = ()
+            else:
+                keys, values = _pairs(fields)
+            keys, values = _convert(convert_key, keys), _convert(convert_value, values)
+            append(new_entry(StreamEntry, (bytes.decode(id), dict(zip(keys, values)))))
+        return cls(entries)
+
+
+class Numbers(_ReplyModel, list):
+    """Numbers from a list of bulk strings e.g. from `MGET` of counters.
+
+    Replies are converted into `int` unless another type is given e.g.
+    `Numbers[float]`. Missing values e.g. of keys that don't exist stay `None`.
+    """
+
+    _types = (int,)
+    _converters = (int,)
+
+    @classmethod
+    def _convert_reply(cls, value):
+        if type(value) is not list:
+            raise ValueError("value is not a list of numbers")
+        (convert,) = cls._converters
+        if convert is None:
+            return cls(value)
+        try:
+            return cls(map(convert, value))
+        except TypeError:
+            if None not in value:
+                raise
+        return cls([None if item is None else convert(item) for item in value])
+
+
+InfoValue = Union[int, float, str, Dict[str, Union[int, float, str]]]
+
+
+def _info_scalar(text: str) -> Union[int, float, str]:
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _info_value(text: str) -> InfoValue:
+    if "=" in text:
+        # e.g. `keys=1,expires=0,avg_ttl=0` of the keyspace section
+        parts = [part.partition("=") for part in text.split(",")]
+        if all(separator for _, separator, _ in parts):
+            return {key: _info_scalar(value) for key, _, value in parts}
+    return _info_scalar(text)
+
+
+class Info(_ReplyModel, dict):
+    """The fields of all sections of `INFO` with numbers converted.
+
+    Values made of comma separated `key=value` pairs e.g. of `db0` in the keyspace
+    section become dicts.
+    """
+
+    @classmethod
+    def _convert_reply(cls, value):
+        if type(value) is bytes:
+            value = value.decode()
+        elif type(value) is not str:
+            raise ValueError("value is not a valid INFO reply")
+        info = cls()
+        for line in value.splitlines():
+            if not line or line[0] == "#":
+                continue
+            key, separator, text = line.partition(":")
+            if separator:
+                info[key] = _info_value(text)
+        return info
@@ -0,0 +1,20 @@
+from typing import Any, Dict, Generic, List, NamedTuple, Optional, Tuple, TypeVar, Union
+
+K = TypeVar("K")
+V = TypeVar("V")
+M = TypeVar("M")
+N = TypeVar("N")
+
+class Hash(Dict[K, V]): ...
+class ScoredMembers(List[Tuple[M, float]]): ...
+
+class StreamEntry(NamedTuple):
+    id: str
+    fields: Dict[Any, Any]
+
+class StreamEntries(List[StreamEntry], Generic[K, V]): ...
+class Numbers(List[Optional[N]]): ...
+
+InfoValue = Union[int, float, str, Dict[str, Union[int, float, str]]]
+
+class Info(Dict[str, InfoValue]): ...
@@ -1,9 +1,25 @@
 import asyncio
+import socket
+import time
 import pytest
 import pytest_asyncio
-from reddish.clients.asyncio import Redis
-from reddish import Command
-from reddish._core.errors import ConnectionError
+from reddish.clients.asyncio import (
+    Redis,
+    RedisProtocol,
+    ProtocolRedis,
+    ConnectionPool,
+    Subscriber,
+    RedisCluster,
+    ReplicatedRedis,
+    SentinelRedis,
+    scan,
+    hscan,
+)
+from reddish.clients.socket import Redis as SocketRedis
+from reddish._core.cluster import key_slot
+from tests.standin import StandInCluster, StandInReplication, StandInSentinel
+from reddish import Command, MultiExec, Script, ClientSideCache, Message
+from reddish._core.errors import ConnectionError, PipelineError, CommandError
 
 pytestmark = pytest.mark.asyncio
 
@@ -33,6 +49,32 @@ async def test_execute_many(redis, ping):
     ["PONG", "PONG"] == await redis.execute_many(ping, ping)
 
 
+@pytest.mark.asyncio
+async def test_execute_iter(redis, ping):
+    outcomes = [outcome async for outcome in redis.execute_iter(ping, Command("foo"))]
+    assert outcomes[0].unwrap() == "PONG"
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+    assert "PONG" == await redis.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_execute_stream(redis, ping):
+    async def commands():
+        for i in range(1000):
+            yield Command("ECHO {}", i).into(int)
+
+    outcomes = [o async for o in redis.execute_stream(commands(), window=64)]
+    assert [outcome.unwrap() for outcome in outcomes] == list(range(1000))
+
+    commands = [ping, Command("foo"), ping]
+    outcomes = [o async for o in redis.execute_stream(commands, window=2)]
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+    assert outcomes[2].unwrap() == "PONG"
+    assert "PONG" == await redis.execute(ping)
+
+
 @pytest.mark.asyncio
 async def test_stream(connection):
     with pytest.raises(TypeError):
@@ -61,3 +103,539 @@ async def test_cancellation(redis, ping):
 
     with pytest.raises(ConnectionError):
         await redis.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_autopipeline(connection):
+    redis = Redis(await connection, autopipeline=True)
+    replies = await asyncio.gather(
+        *[redis.execute(Command("ECHO {}", i).into(int)) for i in range(100)]
+    )
+    assert replies == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_autopipeline_errors(connection, ping):
+    redis = Redis(await connection, autopipeline=True)
+    pong, error = await asyncio.gather(
+        redis.execute(ping), redis.execute(Command("foo")), return_exceptions=True
+    )
+    assert pong == "PONG"
+    assert isinstance(error, PipelineError)
+
+
+@pytest.mark.asyncio
+async def test_autopipeline_encoding_errors(connection, ping):
+    redis = Redis(await connection, autopipeline=True)
+    pong, error = await asyncio.gather(
+        redis.execute(ping),
+        redis.execute(Command("ECHO {}", "\udc80")),
+        return_exceptions=True,
+    )
+    assert pong == "PONG"
+    assert isinstance(error, UnicodeEncodeError)
+
+
+async def protocol_connection():
+    loop = asyncio.get_running_loop()
+    return await loop.create_connection(RedisProtocol, "localhost", 6379)
+
+
+@pytest_asyncio.fixture
+async def protocol_redis():
+    transport, protocol = await protocol_connection()
+    yield ProtocolRedis((transport, protocol))
+    transport.close()
+
+
+@pytest.mark.asyncio
+async def test_protocol_execute(protocol_redis, ping):
+    assert "PONG" == await protocol_redis.execute(ping)
+    assert ["PONG", "PONG"] == await protocol_redis.execute_many(ping, ping)
+    with pytest.raises(PipelineError):
+        await protocol_redis.execute_many(ping, Command("foo"))
+    assert "PONG" == await protocol_redis.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_protocol_concurrent_requests(protocol_redis):
+    replies = await asyncio.gather(
+        *[protocol_redis.execute(Command("ECHO {}", i).into(int)) for i in range(100)]
+    )
+    assert replies == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_protocol_concurrent_large_and_small_batch(protocol_redis):
+    transport = protocol_redis._transport
+    # a small send buffer makes the large request wait for the transport to drain
+    transport.get_extra_info("socket").setsockopt(
+        socket.SOL_SOCKET, socket.SO_SNDBUF, 4096
+    )
+    value = b"x" * 1024
+    large = [Command("SET {} {}", f"protocol:{i}", value) for i in range(3000)]
+    replies, echo = await asyncio.wait_for(
+        asyncio.gather(
+            protocol_redis.execute_many(*large),
+            protocol_redis.execute(Command("ECHO hello")),
+        ),
+        timeout=30,  # interleaved requests leave both callers waiting
+    )
+    assert replies == [b"OK"] * 3000
+    assert echo == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_protocol_large_replies(protocol_redis):
+    value = bytearray(b"x" * 1_000_000)  # written and read in many chunks
+    await protocol_redis.execute(Command("SET {} {}", "protocol:large", value))
+    replies = await asyncio.gather(
+        *[protocol_redis.execute(Command("GET protocol:large")) for _ in range(5)]
+    )
+    assert replies == [value] * 5
+
+
+@pytest.mark.asyncio
+async def test_protocol_cancellation_keeps_connection(protocol_redis, ping):
+    task = asyncio.ensure_future(protocol_redis.execute(ping))
+    await asyncio.sleep(0)  # the request was sent
+    task.cancel()
+    assert "PONG" == await protocol_redis.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_protocol_execute_iter(protocol_redis, ping):
+    outcomes = [o async for o in protocol_redis.execute_iter(ping, Command("foo"))]
+    assert outcomes[0].unwrap() == "PONG"
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+
+    async for _ in protocol_redis.execute_iter(ping, ping):
+        break  # stopping early leaves the connection usable
+    assert "PONG" == await protocol_redis.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_protocol_execute_stream(protocol_redis, ping):
+    async def commands():
+        for i in range(1000):
+            yield Command("ECHO {}", i).into(int)
+
+    outcomes = [o async for o in protocol_redis.execute_stream(commands(), window=64)]
+    assert [outcome.unwrap() for outcome in outcomes] == list(range(1000))
+
+    commands = [ping, Command("foo"), ping]
+    outcomes = [o async for o in protocol_redis.execute_stream(commands, window=2)]
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+    assert outcomes[2].unwrap() == "PONG"
+    assert [o async for o in protocol_redis.execute_stream([], window=2)] == []
+    assert "PONG" == await protocol_redis.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_protocol_closed_connection(protocol_redis, ping):
+    await protocol_redis.execute(Command("QUIT"))
+    with pytest.raises(ConnectionError):
+        await protocol_redis.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_protocol_requires_redis_protocol(connection):
+    with pytest.raises(TypeError):
+        ProtocolRedis(await connection)
+
+
+@pytest.mark.asyncio
+async def test_protocol_client_side_cache():
+    transport, protocol = await protocol_connection()
+    redis = ProtocolRedis((transport, protocol), cache=ClientSideCache())
+    other = Redis(await asyncio.open_connection("localhost", 6379))
+    await other.execute(Command("SET {} before", "protocol:cached"))
+    get = Command("GET {}", "protocol:cached").into(str)
+    assert "before" == await redis.execute(get)
+    assert [outcome.unwrap() async for outcome in redis.execute_iter(get)] == ["before"]
+    await other.execute(Command("SET {} after", "protocol:cached"))
+    await redis.execute(Command("PING"))  # receives the invalidation
+    assert "after" == await redis.execute(get)
+    transport.close()
+
+
+@pytest.mark.asyncio
+async def test_protocol_script(protocol_redis):
+    incrby = Script("return redis.call('INCRBY', KEYS[1], ARGV[1])")
+    await protocol_redis.execute(Command("DEL protocol:counter"))
+    assert 2 == await protocol_redis.execute(incrby(["protocol:counter"], [2]))
+    await protocol_redis.execute(Command("SCRIPT FLUSH"))
+    assert 5 == await protocol_redis.execute(incrby(["protocol:counter"], [3]))
+
+
+@pytest_asyncio.fixture
+async def pool():
+    async with ConnectionPool(
+        lambda: asyncio.open_connection("localhost", 6379), max_size=3
+    ) as pool:
+        yield pool
+
+
+@pytest.mark.asyncio
+async def test_pool_execute(pool, ping):
+    assert "PONG" == await pool.execute(ping)
+    assert ["PONG", "PONG"] == await pool.execute_many(ping, ping)
+
+
+@pytest.mark.asyncio
+async def test_pool_execute_iter(pool, ping):
+    outcomes = [outcome async for outcome in pool.execute_iter(ping, ping)]
+    assert ["PONG", "PONG"] == [outcome.unwrap() for outcome in outcomes]
+
+
+@pytest.mark.asyncio
+async def test_pool_concurrent_requests(pool, ping):
+    replies = await asyncio.gather(*[pool.execute(ping) for _ in range(20)])
+    assert replies == ["PONG"] * 20
+    assert pool._size <= 3
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_broken_connections(pool, ping):
+    # instructs redis server to close the pooled connection
+    await pool.execute(Command("QUIT"))
+    await asyncio.sleep(0.1)  # give the event loop time to notice the closed socket
+    assert "PONG" == await pool.execute(ping)
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_idle_connections(ping):
+    pool = ConnectionPool(
+        lambda: asyncio.open_connection("localhost", 6379),
+        min_size=1,
+        idle_timeout=0,
+    )
+    await asyncio.gather(*[pool.execute(ping) for _ in range(5)])
+    assert pool._size == 1
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_client_side_cache(connection):
+    cache = ClientSideCache()
+    redis = Redis(await connection, cache=cache)
+    other = Redis(await asyncio.open_connection("localhost", 6379))
+    await other.execute(Command("SET {} before", "cached"))
+    get = Command("GET {}", "cached").into(str)
+    assert ["before", "before"] == await redis.execute_many(get, get)
+    assert [outcome.unwrap() async for outcome in redis.execute_iter(get)] == ["before"]
+    assert cache.hits == 1  # the first batch was sent as a whole
+
+    await other.execute(Command("SET {} after", "cached"))
+    await redis.execute(Command("PING"))  # receives the invalidation
+    assert "after" == await redis.execute(get)
+
+
+async def _serves_invalidated_entries(redis, key):
+    other = Redis(await asyncio.open_connection("localhost", 6379))
+    await other.execute(Command("SET {} before", key))
+    get = Command("GET {}", key).into(str)
+    assert "before" == await redis.execute(get)
+
+    await other.execute(Command("SET {} after", key))
+    deadline = time.monotonic() + 5  # until the invalidation arrived
+    while await redis.execute(get) == "before" and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    return "before" == await redis.execute(get)
+
+
+@pytest.mark.asyncio
+async def test_client_side_cache_handles_pending_invalidations(connection):
+    redis = Redis(await connection, cache=ClientSideCache(ttl=None))
+    assert not await _serves_invalidated_entries(redis, "pending")
+
+    transport, protocol = await protocol_connection()
+    redis = ProtocolRedis((transport, protocol), cache=ClientSideCache(ttl=None))
+    assert not await _serves_invalidated_entries(redis, "protocol:pending")
+    transport.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client", [Redis, ProtocolRedis])
+async def test_client_side_cache_handles_invalidations_on_the_socket(client):
+    if client is Redis:
+        connection = await asyncio.open_connection("localhost", 6379)
+        close = connection[1].close  # the writer
+    else:
+        connection = await protocol_connection()
+        close = connection[0].close  # the transport
+    redis = client(connection, cache=ClientSideCache(ttl=None))
+    key = f"{client.__name__}:socket"
+    get = Command("GET {}", key).into(str)
+    with socket.create_connection(("localhost", 6379)) as other_socket:
+        other = SocketRedis(other_socket)
+        other.execute(Command("SET {} before", key))
+        assert "before" == await redis.execute(get)
+
+        # the invalidation arrives while the event loop is blocked
+        other.execute(Command("SET {} after", key))
+        time.sleep(0.1)
+        assert "after" == await redis.execute(get)
+    close()
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_cache_only_for_tracked_keys():
+    cache = ClientSideCache(ttl=None)
+    async with ConnectionPool(
+        lambda: asyncio.open_connection("localhost", 6379), max_size=2, cache=cache
+    ) as pool:
+        await pool.execute(Command("SET {} value", "pooled"))
+        get = Command("GET {}", "pooled").into(str)
+        first, second = await asyncio.gather(pool.execute(get), pool.execute(get))
+        assert first == second
+        assert cache.hits == 0  # each connection reads the key itself
+
+
+@pytest.mark.asyncio
+async def test_subscriber(redis):
+    async with Subscriber(
+        await asyncio.open_connection("localhost", 6379)
+    ) as subscriber:
+        await subscriber.subscribe("news")
+        await subscriber.psubscribe("n*")
+        ready = Command("PUBLISH news ready").into(int)
+        while await redis.execute(ready) < 2:  # until both subscriptions are active
+            await asyncio.sleep(0.01)
+        await redis.execute(Command("PUBLISH news {}", "hello"))
+
+        messages = []
+        async for message in subscriber:
+            if message.data == b"hello":
+                messages.append(message)
+                if len(messages) == 2:
+                    break
+        assert set(messages) == {
+            Message(b"news", b"hello"),
+            Message(b"news", b"hello", pattern=b"n*"),
+        }
+        assert subscriber.channels == {b"news"}
+
+
+@pytest.mark.asyncio
+async def test_subscriber_errors_between_messages():
+    ours, theirs = socket.socketpair()
+    message = b">3\r\n$7\r\nmessage\r\n$4\r\nnews\r\n$5\r\nhello\r\n"
+    async with Subscriber(await asyncio.open_connection(sock=ours)) as subscriber:
+        theirs.sendall(message + b"-ERR unknown command\r\n" + message)
+        assert await subscriber.get_messages() == [Message(b"news", b"hello")]
+        with pytest.raises(CommandError):
+            await subscriber.get_messages()
+        assert await subscriber.get_messages() == [Message(b"news", b"hello")]
+    theirs.close()
+
+
+@pytest.fixture
+def cluster():
+    with StandInCluster() as cluster:
+        yield cluster
+
+
+@pytest.mark.asyncio
+async def test_cluster(cluster):
+    async with RedisCluster(asyncio.open_connection, cluster.addresses[:1]) as redis:
+        keys = [f"key:{i}" for i in range(20)]
+        await redis.execute_many(*(Command("SET {} {}", key, key) for key in keys))
+        assert all(node.data for node in cluster.nodes)  # spread across all nodes
+        assert keys == await redis.execute_many(
+            *(Command("GET {}", key).into(str) for key in keys)
+        )
+
+
+@pytest.mark.asyncio
+async def test_cluster_redirects(cluster):
+    async with RedisCluster(asyncio.open_connection, cluster.addresses[:1]) as redis:
+        await redis.execute_many(Command("SET moved 1"), Command("SET asked 2"))
+        moved, asked = (key_slot(key) for key in ["moved", "asked"])
+        others = [node for node in cluster.nodes if node is not cluster.owner(moved)]
+        cluster.move_slot(moved, others[0])
+        source = cluster.owner(asked)
+        target = next(node for node in cluster.nodes if node is not source)
+        cluster.start_migration(asked, target)
+        target.data[b"asked"] = source.data.pop(b"asked")
+
+        assert [1, 2] == await redis.execute_many(
+            Command("GET moved").into(int), Command("GET asked").into(int)
+        )
+
+
+@pytest.mark.asyncio
+async def test_cluster_connects_once_per_node(cluster):
+    connects = []
+
+    async def connect(host, port):
+        connects.append((host, port))
+        await asyncio.sleep(0.01)  # concurrent callers miss the same node
+        return await asyncio.open_connection(host, port)
+
+    async with RedisCluster(connect, cluster.addresses[:1]) as redis:
+        keys = [f"key:{i}" for i in range(20)]
+        await asyncio.gather(*(redis.execute(Command("SET {} 1", key)) for key in keys))
+        assert sorted(connects) == sorted(set(connects))
+
+
+@pytest.fixture
+def replication():
+    with StandInReplication() as replication:
+        yield replication
+
+
+@pytest.mark.asyncio
+async def test_replicated(replication):
+    async with ReplicatedRedis(
+        asyncio.open_connection, replication.primary.address
+    ) as redis:
+        await redis.execute(Command("SET foo bar"))
+        assert replication.primary.data == {b"foo": b"bar"}
+        for _ in range(4):
+            assert "bar" == await redis.execute(Command("GET foo").into(str))
+        assert all(replica.commands_received == 2 for replica in replication.replicas)
+        # transactions and batches with writes go to the primary
+        assert [1, [2]] == await redis.execute_many(
+            Command("INCR counter"), MultiExec(Command("INCR counter"))
+        )
+
+
+@pytest.mark.asyncio
+async def test_replicated_lag(replication):
+    lagging, up_to_date = replication.replicas
+    async with ReplicatedRedis(
+        asyncio.open_connection,
+        replication.primary.address,
+        max_lag=0,
+        lag_check_interval=0,
+    ) as redis:
+        replication.pause(lagging)
+        await redis.execute(Command("SET foo bar"))
+        for _ in range(2):
+            assert "bar" == await redis.execute(Command("GET foo").into(str))
+        assert redis.replicas == [up_to_date.address]
+        replication.resume(lagging)
+        await redis.execute(Command("GET foo"))
+        assert len(redis.replicas) == 2
+
+
+@pytest.mark.asyncio
+async def test_replicated_retries_unreachable_replicas(replication):
+    replica = replication.replicas[0]
+    unreachable = {replica.address}
+
+    async def flaky_connect(host, port):
+        if (host, port) in unreachable:
+            raise ConnectionRefusedError()
+        return await asyncio.open_connection(host, port)
+
+    async with ReplicatedRedis(
+        flaky_connect,
+        replication.primary.address,
+        replicas=[replica.address],
+        lag_check_interval=0,
+    ) as redis:
+        await redis.execute(Command("GET foo"))  # served by the primary instead
+        assert redis.replicas == []
+        unreachable.clear()
+        await redis.execute(Command("GET foo"))
+        assert redis.replicas == [replica.address]
+        assert replica.commands_received == 1
+
+
+@pytest.fixture
+def sentinel(replication):
+    with StandInSentinel(replication) as sentinel:
+        yield sentinel
+
+
+@pytest.mark.asyncio
+async def test_sentinel(replication, sentinel):
+    new_primary = replication.replicas[0]
+    async with SentinelRedis(
+        asyncio.open_connection, [sentinel.address], "mymaster"
+    ) as redis:
+        assert redis.primary == replication.primary.address
+        await redis.execute(Command("SET foo bar"))
+        sentinel.failover(new_primary)
+        for _ in range(100):
+            if redis.primary == new_primary.address:
+                break
+            await asyncio.sleep(0.01)
+        await redis.execute(Command("SET foo baz"))
+        assert new_primary.data == {b"foo": b"baz"}
+
+
+@pytest.mark.asyncio
+async def test_sentinel_errors_keep_watching(replication, sentinel):
+    new_primary = replication.replicas[0]
+    connects = []
+
+    async def misdirected_connect(host, port):
+        connects.append((host, port))
+        if len(connects) == 2:  # the watcher's first subscription fails
+            host, port = replication.primary.address
+        return await asyncio.open_connection(host, port)
+
+    async with SentinelRedis(
+        misdirected_connect, [sentinel.address], "mymaster", retry_interval=0.01
+    ) as redis:
+        sentinel.failover(new_primary)
+        for _ in range(100):
+            if redis.primary == new_primary.address and redis.watch_error is None:
+                break  # the error is cleared once subscribed again
+            await asyncio.sleep(0.01)
+        assert redis.primary == new_primary.address
+        assert redis.watch_error is None
+
+
+@pytest.mark.asyncio
+async def test_sentinel_readonly(replication, sentinel):
+    new_primary = replication.replicas[0]
+    async with SentinelRedis(
+        asyncio.open_connection, [sentinel.address], "mymaster"
+    ) as redis:
+        await redis.execute(Command("SET foo bar"))
+        sentinel.failover(new_primary, announce=False)
+        with pytest.raises(PipelineError):
+            await redis.execute(Command("SET foo baz"))
+        # the old primary refused the write so the primary is looked up again
+        await redis.execute(Command("SET foo baz"))
+        assert redis.primary == new_primary.address
+        assert new_primary.data == {b"foo": b"baz"}
+
+
+@pytest.mark.asyncio
+async def test_scan(redis):
+    keys = [f"scan:key:{index}".encode() for index in range(50)]
+    await redis.execute_many(*(Command("SET {} 1", key) for key in keys))
+    found = [key async for key in scan(redis, "scan:key:*", count=7)]
+    assert sorted(found) == sorted(keys)
+    # stopping early leaves the connection usable
+    async for key in scan(redis, "scan:key:*", count=7):
+        assert b"1" == await redis.execute(Command("GET {}", key))
+        break
+    assert "PONG" == await redis.execute(Command("PING").into(str))
+
+
+@pytest.mark.asyncio
+async def test_hscan(redis):
+    await redis.execute(Command("HSET scan:hash a 1 b 2 c 3"))
+    pairs = [pair async for pair in hscan(redis, "scan:hash", count=1)]
+    assert dict(pairs) == {b"a": b"1", b"b": b"2", b"c": b"3"}
+
+
+@pytest.mark.asyncio
+async def test_script(redis):
+    incrby = Script("return redis.call('INCRBY', KEYS[1], ARGV[1])")
+    await redis.execute(Command("DEL script:counter"))
+    assert 2 == await redis.execute(incrby(["script:counter"], [2]))
+    # calls are retried after loading the script again
+    await redis.execute(Command("SCRIPT FLUSH"))
+    assert [5, 8] == await redis.execute_many(
+        incrby(["script:counter"], [3]), incrby(["script:counter"], [3])
+    )
+    assert [[9]] == await redis.execute_many(MultiExec(incrby(["script:counter"], [1])))
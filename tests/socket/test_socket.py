@@ -1,10 +1,22 @@
 import socket
+import time
 import pytest
+from itertools import islice
 from concurrent.futures import ThreadPoolExecutor
 
-from reddish.clients.socket import Redis
-from reddish import Command
-from reddish._core.errors import ConnectionError
+from reddish.clients.socket import (
+    Redis,
+    Subscriber,
+    RedisCluster,
+    ReplicatedRedis,
+    SentinelRedis,
+    scan,
+    hscan,
+)
+from reddish._core.cluster import key_slot
+from tests.standin import StandInCluster, StandInReplication, StandInSentinel
+from reddish import Command, MultiExec, Script, ClientSideCache, Message
+from reddish._core.errors import ConnectionError, CommandError, PipelineError
 
 
 @pytest.fixture
@@ -37,6 +49,46 @@ def test_execute_many(redis, ping):
     ["PONG", "PONG"] == redis.execute_many(ping, ping)
 
 
+def test_execute_iter(redis, ping):
+    outcomes = list(redis.execute_iter(ping, Command("foo"), ping))
+    assert outcomes[0].unwrap() == "PONG"
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+    assert outcomes[2].unwrap() == "PONG"
+    assert "PONG" == redis.execute(ping)
+
+
+def test_execute_iter_stopped_early(redis, ping):
+    for outcome in redis.execute_iter(ping, ping):
+        break
+    with pytest.raises(ConnectionError):
+        redis.execute(ping)
+
+
+def test_execute_stream(redis, ping):
+    commands = (Command("ECHO {}", i).into(int) for i in range(1000))
+    outcomes = list(redis.execute_stream(commands, window=64))
+    assert [outcome.unwrap() for outcome in outcomes] == list(range(1000))
+
+    outcomes = list(redis.execute_stream([ping, Command("foo"), ping], window=2))
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+    assert outcomes[2].unwrap() == "PONG"
+    assert "PONG" == redis.execute(ping)
+
+
+def test_encoding_error(redis, ping):
+    with pytest.raises(UnicodeEncodeError):
+        redis.execute(Command("ECHO {}", "\udc80"))
+    assert redis.execute(ping) == "PONG"  # nothing was sent
+
+
+def test_buffers(redis):
+    value = bytearray(b"x" * 100_000)
+    redis.execute(Command("SET {} {}", bytearray(b"buffer"), value))
+    assert redis.execute(Command("GET buffer").into(bytes)) == value
+
+
 def test_stream(unconnected_socket):
     with pytest.raises(TypeError):
         Redis(unconnected_socket)
@@ -53,3 +105,264 @@ def test_concurrent_requests(redis, ping):
     with ThreadPoolExecutor(max_workers=10) as pool:
         for i in range(10):
             pool.submit(redis.execute, ping)
+
+
+def test_client_side_cache(connected_socket):
+    cache = ClientSideCache()
+    redis = Redis(connected_socket, cache=cache)
+    with socket.create_connection(("localhost", 6379)) as other_socket:
+        other = Redis(other_socket)
+        other.execute(Command("SET {} before", "cached"))
+        get = Command("GET {}", "cached").into(str)
+        assert ["before", "before"] == redis.execute_many(get, get)
+        assert "before" == redis.execute(get)
+        assert cache.hits == 1  # the first batch was sent as a whole
+
+        other.execute(Command("SET {} after", "cached"))
+        redis.execute(Command("PING"))  # receives the invalidation
+        assert "after" == redis.execute(get)
+
+
+def test_client_side_cache_handles_pending_invalidations(connected_socket):
+    redis = Redis(connected_socket, cache=ClientSideCache(ttl=None))
+    with socket.create_connection(("localhost", 6379)) as other_socket:
+        other = Redis(other_socket)
+        other.execute(Command("SET {} before", "pending"))
+        get = Command("GET {}", "pending").into(str)
+        assert "before" == redis.execute(get)
+
+        other.execute(Command("SET {} after", "pending"))
+        deadline = time.monotonic() + 5  # until the invalidation arrived
+        while redis.execute(get) == "before" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "after" == redis.execute(get)
+
+
+def test_subscriber(redis):
+    with Subscriber(socket.create_connection(("localhost", 6379))) as subscriber:
+        subscriber.subscribe("news")
+        subscriber.psubscribe("n*")
+        ready = Command("PUBLISH news ready").into(int)
+        while redis.execute(ready) < 2:  # until both subscriptions are active
+            time.sleep(0.01)
+        redis.execute(Command("PUBLISH news {}", "hello"))
+
+        messages = (message for message in subscriber if message.data == b"hello")
+        assert set(islice(messages, 2)) == {
+            Message(b"news", b"hello"),
+            Message(b"news", b"hello", pattern=b"n*"),
+        }
+        assert subscriber.channels == {b"news"}
+        assert subscriber.patterns == {b"n*"}
+
+
+def test_subscriber_errors_between_messages():
+    ours, theirs = socket.socketpair()
+    message = b">3\r\n$7\r\nmessage\r\n$4\r\nnews\r\n$5\r\nhello\r\n"
+    with Subscriber(ours) as subscriber, theirs:
+        theirs.sendall(message + b"-ERR unknown command\r\n" + message)
+        assert subscriber.get_messages() == [Message(b"news", b"hello")]
+        with pytest.raises(CommandError):
+            subscriber.get_messages()
+        assert subscriber.get_messages() == [Message(b"news", b"hello")]
+
+
+def test_resp3(connected_socket, ping):
+    redis = Redis(connected_socket, protocol=3)
+    assert "PONG" == redis.execute(ping)
+
+
+@pytest.fixture
+def cluster():
+    with StandInCluster() as cluster:
+        yield cluster
+
+
+def connect(host, port):
+    return socket.create_connection((host, port))
+
+
+def test_cluster(cluster):
+    with RedisCluster(connect, cluster.addresses[:1]) as redis:
+        keys = [f"key:{i}" for i in range(20)]
+        redis.execute_many(*(Command("SET {} {}", key, key) for key in keys))
+        assert all(node.data for node in cluster.nodes)  # spread across all nodes
+        assert keys == redis.execute_many(
+            *(Command("GET {}", key).into(str) for key in keys)
+        )
+
+
+def test_cluster_connects_once_per_node(cluster):
+    connects = []
+
+    def counting_connect(host, port):
+        connects.append((host, port))
+        time.sleep(0.01)  # concurrent callers miss the same node
+        return connect(host, port)
+
+    with RedisCluster(counting_connect, cluster.addresses[:1]) as redis:
+        keys = [f"key:{i}" for i in range(20)]
+        with ThreadPoolExecutor(8) as executor:
+            list(
+                executor.map(lambda key: redis.execute(Command("SET {} 1", key)), keys)
+            )
+        assert sorted(connects) == sorted(set(connects))
+
+
+def test_cluster_redirects(cluster):
+    with RedisCluster(connect, cluster.addresses[:1]) as redis:
+        redis.execute_many(Command("SET moved 1"), Command("SET asked 2"))
+        moved, asked = (key_slot(key) for key in ["moved", "asked"])
+        others = [node for node in cluster.nodes if node is not cluster.owner(moved)]
+        cluster.move_slot(moved, others[0])
+        source = cluster.owner(asked)
+        target = next(node for node in cluster.nodes if node is not source)
+        cluster.start_migration(asked, target)
+        target.data[b"asked"] = source.data.pop(b"asked")
+
+        assert [1, 2] == redis.execute_many(
+            Command("GET moved").into(int), Command("GET asked").into(int)
+        )
+
+
+@pytest.fixture
+def replication():
+    with StandInReplication() as replication:
+        yield replication
+
+
+def test_replicated(replication):
+    with ReplicatedRedis(connect, replication.primary.address) as redis:
+        redis.execute(Command("SET foo bar"))
+        assert replication.primary.data == {b"foo": b"bar"}
+        for _ in range(4):
+            assert "bar" == redis.execute(Command("GET foo").into(str))
+        assert all(replica.commands_received == 2 for replica in replication.replicas)
+        # transactions and batches with writes go to the primary
+        assert [1, [2]] == redis.execute_many(
+            Command("INCR counter"), MultiExec(Command("INCR counter"))
+        )
+
+
+def test_replicated_lag(replication):
+    lagging, up_to_date = replication.replicas
+    with ReplicatedRedis(
+        connect, replication.primary.address, max_lag=0, lag_check_interval=0
+    ) as redis:
+        replication.pause(lagging)
+        redis.execute(Command("SET foo bar"))
+        for _ in range(2):
+            assert "bar" == redis.execute(Command("GET foo").into(str))
+        assert redis.replicas == [up_to_date.address]
+        replication.resume(lagging)
+        redis.execute(Command("GET foo"))
+        assert len(redis.replicas) == 2
+
+
+def test_replicated_retries_unreachable_replicas(replication):
+    replica = replication.replicas[0]
+    unreachable = {replica.address}
+
+    def flaky_connect(host, port):
+        if (host, port) in unreachable:
+            raise ConnectionRefusedError()
+        return connect(host, port)
+
+    with ReplicatedRedis(
+        flaky_connect,
+        replication.primary.address,
+        replicas=[replica.address],
+        lag_check_interval=0,
+    ) as redis:
+        redis.execute(Command("GET foo"))  # served by the primary instead
+        assert redis.replicas == []
+        unreachable.clear()
+        redis.execute(Command("GET foo"))
+        assert redis.replicas == [replica.address]
+        assert replica.commands_received == 1
+
+
+@pytest.fixture
+def sentinel(replication):
+    with StandInSentinel(replication) as sentinel:
+        yield sentinel
+
+
+def test_sentinel(replication, sentinel):
+    new_primary = replication.replicas[0]
+    with SentinelRedis(connect, [sentinel.address], "mymaster") as redis:
+        assert redis.primary == replication.primary.address
+        redis.execute(Command("SET foo bar"))
+        sentinel.failover(new_primary)
+        for _ in range(100):
+            if redis.primary == new_primary.address:
+                break
+            time.sleep(0.01)
+        redis.execute(Command("SET foo baz"))
+        assert new_primary.data == {b"foo": b"baz"}
+
+
+def test_sentinel_errors_keep_watching(replication, sentinel):
+    new_primary = replication.replicas[0]
+    connects = []
+
+    def misdirected_connect(host, port):
+        connects.append((host, port))
+        if len(connects) == 2:  # the watcher's first subscription fails
+            host, port = replication.primary.address
+        return connect(host, port)
+
+    with SentinelRedis(
+        misdirected_connect, [sentinel.address], "mymaster", retry_interval=0.01
+    ) as redis:
+        sentinel.failover(new_primary)
+        for _ in range(100):
+            if redis.primary == new_primary.address and redis.watch_error is None:
+                break  # the error is cleared once subscribed again
+            time.sleep(0.01)
+        assert redis.primary == new_primary.address
+        assert redis.watch_error is None
+
+
+def test_sentinel_readonly(replication, sentinel):
+    new_primary = replication.replicas[0]
+    with SentinelRedis(connect, [sentinel.address], "mymaster") as redis:
+        redis.execute(Command("SET foo bar"))
+        sentinel.failover(new_primary, announce=False)
+        with pytest.raises(PipelineError):
+            redis.execute(Command("SET foo baz"))
+        # the old primary refused the write so the primary is looked up again
+        redis.execute(Command("SET foo baz"))
+        assert redis.primary == new_primary.address
+        assert new_primary.data == {b"foo": b"baz"}
+
+
+def test_scan(redis):
+    keys = [f"scan:key:{index}".encode() for index in range(50)]
+    redis.execute_many(*(Command("SET {} 1", key) for key in keys))
+    found = list(scan(redis, "scan:key:*", count=7))
+    assert sorted(found) == sorted(keys)
+    # the connection can be used while iterating
+    for key in scan(redis, "scan:key:*", count=7):
+        assert b"1" == redis.execute(Command("GET {}", key))
+
+
+def test_hscan(redis):
+    redis.execute(Command("HSET scan:hash a 1 b 2 c 3"))
+    assert dict(hscan(redis, "scan:hash", count=1)) == {
+        b"a": b"1",
+        b"b": b"2",
+        b"c": b"3",
+    }
+
+
+def test_script(redis):
+    incrby = Script("return redis.call('INCRBY', KEYS[1], ARGV[1])")
+    redis.execute(Command("DEL script:counter"))
+    assert 2 == redis.execute(incrby(["script:counter"], [2]))
+    # calls are retried after loading the script again
+    redis.execute(Command("SCRIPT FLUSH"))
+    assert [5, 8] == redis.execute_many(
+        incrby(["script:counter"], [3]), incrby(["script:counter"], [3])
+    )
+    assert [[9]] == redis.execute_many(MultiExec(incrby(["script:counter"], [1])))
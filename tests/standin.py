@@ -0,0 +1,452 @@
+"""Minimal in-process stand-ins for redis clusters, replication and sentinels.
+
+Every node listens on its own port and serves a few commands (`PING`, `ECHO`,
+`GET`, `SET`, `INCR`, `DEL`, `MGET`, `MULTI`/`EXEC`, `ASKING`, `INFO`, `ROLE`
+and `CLUSTER SHARDS`). Cluster nodes reply with `MOVED` and `ASK` redirects like
+redis does, replicas refuse writes and apply the writes of their primary. A
+sentinel announces failovers to its subscribers with `+switch-master`.
+"""
+import socket
+import threading
+
+import hiredis
+
+from reddish._core.cluster import NUM_SLOTS, key_slot
+
+
+class _Error:
+    def __init__(self, message):
+        self.message = message
+
+
+class _Status:
+    def __init__(self, status):
+        self.status = status
+
+
+OK = _Status("OK")
+KEYED_COMMANDS = {b"GET", b"SET", b"INCR", b"DEL", b"MGET"}
+WRITE_COMMANDS = {b"SET", b"INCR", b"DEL"}
+
+
+def encode(value):
+    if value is None:
+        return b"$-1\r\n"
+    elif isinstance(value, _Error):
+        return b"-%b\r\n" % value.message.encode()
+    elif isinstance(value, _Status):
+        return b"+%b\r\n" % value.status.encode()
+    elif isinstance(value, int):
+        return b":%d\r\n" % value
+    elif isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%b\r\n" % (len(value), value)
+    elif isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+    raise TypeError(f"Can't encode {value!r}")
+
+
+def listen():
+    # `socket.create_server` requires python 3.8
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    return server
+
+
+class StandInNode:
+    def __init__(self, cluster=None, node_id=0, replication=None):
+        self.cluster = cluster
+        self.id = node_id
+        self.replication = replication
+        self.data = {}
+        self.commands_received = 0
+        self._server = listen()
+        self.address = self._server.getsockname()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.close()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._handle_connection, args=(connection,), daemon=True
+            ).start()
+
+    def _handle_connection(self, connection):
+        reader = hiredis.Reader()
+        state = {"asking": False, "transaction": None}
+        with connection:
+            while True:
+                try:
+                    data = connection.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                reader.feed(data)
+                replies = []
+                while True:
+                    command = reader.gets()
+                    if command is False:
+                        break
+                    replies.append(encode(self._handle(command, state)))
+                try:
+                    connection.sendall(b"".join(replies))
+                except OSError:
+                    return
+
+    def _redirect(self, keys, state):
+        # the error to reply with if this node doesn't serve the keys
+        slots = {key_slot(key) for key in keys}
+        if len(slots) > 1:
+            return _Error("CROSSSLOT Keys in request don't hash to the same slot")
+        (slot,) = slots
+        asking, state["asking"] = state["asking"], False
+        with self.cluster.lock:
+            owner = self.cluster.owner(slot)
+            migrating_to = self.cluster.migrating.get(slot)
+            if owner is self:
+                if migrating_to is not None and not all(
+                    key in self.data for key in keys
+                ):
+                    return _Error(f"ASK {slot} {migrating_to.address_string}")
+                return None
+            if asking and self.cluster.migrating.get(slot) is self:
+                return None  # importing the slot
+        return _Error(f"MOVED {slot} {owner.address_string}")
+
+    @property
+    def address_string(self):
+        return "%s:%d" % self.address
+
+    def _handle(self, command, state):
+        self.commands_received += 1
+        name, *args = command
+        name = name.upper()
+
+        refusal = self._refusal(name, args, state)
+        transaction = state["transaction"]
+        if transaction is not None and name not in (b"EXEC", b"MULTI"):
+            if refusal is not None:
+                state["aborted"] = True
+                return refusal
+            transaction.append(command)
+            return _Status("QUEUED")
+        if refusal is not None:
+            return refusal
+        return self._execute(name, args, state)
+
+    def _refusal(self, name, args, state):
+        # the error to reply with if this node can't execute the command
+        replication = self.replication
+        if replication is not None and name in WRITE_COMMANDS:
+            if self is not replication.primary:
+                return _Error("READONLY You can't write against a read only replica.")
+        if self.cluster is not None and name in KEYED_COMMANDS:
+            keys = args if name in (b"MGET", b"DEL") else args[:1]
+            return self._redirect(keys, state)
+        return None
+
+    def _execute(self, name, args, state):
+        replication = self.replication
+        if name in WRITE_COMMANDS and replication is not None:
+            with replication.lock:  # replicas apply writes in the same order
+                reply = self._apply(name, args, state)
+                replication.propagate([name, *args])
+            return reply
+        return self._apply(name, args, state)
+
+    def _apply(self, name, args, state):
+        data = self.data
+        if name == b"PING":
+            return _Status("PONG")
+        elif name == b"ECHO":
+            return args[0]
+        elif name == b"ASKING":
+            state["asking"] = True
+            return OK
+        elif name == b"GET":
+            return data.get(args[0])
+        elif name == b"SET":
+            data[args[0]] = args[1]
+            return OK
+        elif name == b"INCR":
+            value = int(data.get(args[0], 0)) + 1
+            data[args[0]] = b"%d" % value
+            return value
+        elif name == b"DEL":
+            return sum(data.pop(key, None) is not None for key in args)
+        elif name == b"MGET":
+            return [data.get(key) for key in args]
+        elif name == b"MULTI":
+            state["transaction"] = []
+            state["aborted"] = False
+            return OK
+        elif name == b"EXEC":
+            transaction, state["transaction"] = state["transaction"], None
+            if state.pop("aborted", False):
+                return _Error(
+                    "EXECABORT Transaction discarded because of previous errors."
+                )
+            return [
+                self._execute(cmd[0].upper(), cmd[1:], state) for cmd in transaction
+            ]
+        elif name == b"CLUSTER" and args[0].upper() == b"SHARDS":
+            return self.cluster.shards()
+        elif name == b"ROLE":
+            if self.replication is None or self is self.replication.primary:
+                return ["master", 0, []]
+            host, port = self.replication.primary.address
+            return ["slave", host, port, "connected", 0]
+        elif name == b"INFO":
+            if self.replication is not None:
+                return self.replication.info(self)
+            return "# Replication\r\nrole:master\r\nconnected_slaves:0\r\n"
+        return _Error(f"ERR unknown command '{name.decode()}'")
+
+
+class StandInCluster:
+    """A cluster of stand-in nodes with slots spread evenly across them."""
+
+    def __init__(self, num_nodes=3):
+        self.lock = threading.RLock()
+        self.nodes = [StandInNode(self, index) for index in range(num_nodes)]
+        self._slots = [
+            self.nodes[slot * num_nodes // NUM_SLOTS] for slot in range(NUM_SLOTS)
+        ]
+        self.migrating = {}  # slot -> node importing the slot
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for node in self.nodes:
+            node.close()
+
+    @property
+    def addresses(self):
+        return [node.address for node in self.nodes]
+
+    def owner(self, slot):
+        return self._slots[slot]
+
+    def node_for_key(self, key):
+        return self.owner(key_slot(key))
+
+    def start_migration(self, slot, target):
+        """Let the owner of `slot` reply with `ASK` for keys it doesn't have."""
+        with self.lock:
+            self.migrating[slot] = target
+
+    def move_slot(self, slot, target):
+        """Move `slot` and its keys to `target` which makes other nodes reply `MOVED`."""
+        with self.lock:
+            source = self._slots[slot]
+            for key in [key for key in source.data if key_slot(key) == slot]:
+                target.data[key] = source.data.pop(key)
+            self._slots[slot] = target
+            self.migrating.pop(slot, None)
+
+    def shards(self):
+        with self.lock:
+            ranges = {node: [] for node in self.nodes}
+            start = 0
+            for slot in range(1, NUM_SLOTS + 1):
+                if slot == NUM_SLOTS or self._slots[slot] is not self._slots[start]:
+                    ranges[self._slots[start]].extend([start, slot - 1])
+                    start = slot
+        shards = []
+        for node, slots in ranges.items():
+            host, port = node.address
+            description = [
+                "id", "%040d" % node.id, "port", port, "ip", host,
+                "endpoint", host, "role", "master", "replication-offset", 0,
+                "health", "online",
+            ]  # fmt: skip
+            shards.append(["slots", slots, "nodes", [description]])
+        return shards
+
+
+class StandInReplication:
+    """A primary node whose writes are applied to its replicas right away.
+
+    Replicas that are `pause`d fall behind until they are `resume`d.
+    """
+
+    def __init__(self, num_replicas=2):
+        self.lock = threading.RLock()
+        self.primary = StandInNode(replication=self)
+        self.replicas = [
+            StandInNode(node_id=index + 1, replication=self)
+            for index in range(num_replicas)
+        ]
+        self.offset = 0
+        self._backlog = []  # (offset after the command, command)
+        self._offsets = {replica: 0 for replica in self.replicas}
+        self._paused = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for node in [self.primary, *self.replicas]:
+            node.close()
+
+    @property
+    def replica_addresses(self):
+        return [replica.address for replica in self.replicas]
+
+    def propagate(self, command):
+        with self.lock:
+            self.offset += len(encode(list(command)))
+            self._backlog.append((self.offset, command))
+            for replica in self.replicas:
+                if replica not in self._paused:
+                    self._catch_up(replica)
+
+    def _catch_up(self, replica):
+        for offset, command in self._backlog:
+            if offset > self._offsets[replica]:
+                replica._apply(command[0], command[1:], {})
+                self._offsets[replica] = offset
+
+    def promote(self, replica):
+        """Make `replica` the primary and the primary one of its replicas."""
+        with self.lock:
+            old = self.primary
+            self.primary = replica
+            self.replicas = [
+                old,
+                *(node for node in self.replicas if node is not replica),
+            ]
+            self._offsets.pop(replica)
+            self._offsets[old] = self.offset
+
+    def pause(self, replica):
+        with self.lock:
+            self._paused.add(replica)
+
+    def resume(self, replica):
+        with self.lock:
+            self._paused.discard(replica)
+            self._catch_up(replica)
+
+    def info(self, node):
+        with self.lock:
+            if node is not self.primary:
+                return "# Replication\r\nrole:slave\r\n"
+            lines = ["# Replication", "role:master"]
+            lines.append(f"connected_slaves:{len(self.replicas)}")
+            for index, replica in enumerate(self.replicas):
+                host, port = replica.address
+                offset = self._offsets[replica]
+                lines.append(
+                    f"slave{index}:ip={host},port={port},state=online,"
+                    f"offset={offset},lag=0"
+                )
+            lines.append(f"master_repl_offset:{self.offset}")
+            return "\r\n".join(lines) + "\r\n"
+
+
+class StandInSentinel:
+    """A sentinel monitoring the primary of a `StandInReplication`."""
+
+    def __init__(self, replication, service_name="mymaster"):
+        self.replication = replication
+        self.service_name = service_name
+        self._subscribers = []  # connections subscribed to `+switch-master`
+        self._lock = threading.Lock()
+        self._server = listen()
+        self.address = self._server.getsockname()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._server.close()
+        with self._lock:
+            for connection in self._subscribers:
+                connection.close()
+
+    def failover(self, replica, announce=True):
+        """Promote `replica` and announce it unless `announce` is false."""
+        old_host, old_port = self.replication.primary.address
+        self.replication.promote(replica)
+        if not announce:
+            return
+        host, port = replica.address
+        data = f"{self.service_name} {old_host} {old_port} {host} {port}"
+        message = encode(["message", "+switch-master", data])
+        with self._lock:
+            for connection in self._subscribers:
+                try:
+                    connection.sendall(message)
+                except OSError:
+                    pass
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._handle_connection, args=(connection,), daemon=True
+            ).start()
+
+    def _handle_connection(self, connection):
+        reader = hiredis.Reader()
+        with connection:
+            while True:
+                try:
+                    data = connection.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                reader.feed(data)
+                while True:
+                    command = reader.gets()
+                    if command is False:
+                        break
+                    reply = encode(self._handle(connection, command))
+                    with self._lock:  # don't interleave with announcements
+                        try:
+                            connection.sendall(reply)
+                        except OSError:
+                            return
+
+    def _handle(self, connection, command):
+        name, *args = command
+        name = name.upper()
+        if name == b"PING":
+            return _Status("PONG")
+        elif name == b"SENTINEL" and args[0].upper() == b"GET-MASTER-ADDR-BY-NAME":
+            if args[1].decode() != self.service_name:
+                return None
+            host, port = self.replication.primary.address
+            return [host, str(port)]
+        elif name == b"SUBSCRIBE":
+            with self._lock:
+                self._subscribers.append(connection)
+            return ["subscribe", args[0], 1]
+        return _Error(f"ERR unknown command '{name.decode()}'")
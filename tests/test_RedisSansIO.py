@@ -1,6 +1,6 @@
 import pytest
 from outcome import Error, Value
-from reddish._core import Command, MultiExec
+from reddish._core import Command, MultiExec, Script
 from reddish._core.sansio import RedisSansIO, ProtocolError, NOT_ENOUGH_DATA
 from reddish._core.errors import UnsupportedCommandError, ConnectionError, PipelineError
 
@@ -23,6 +23,70 @@ def test_sending_multiple_commands(redis, ping):
     assert 2 * bytes(ping) == redis.send([ping, ping])
 
 
+def test_sending_in_chunks(redis):
+    commands = [Command("ECHO {}", i) for i in range(1000)]
+    chunks = redis.send_chunks(commands, chunk_size=100)
+    assert redis.in_flight == 1  # queued before the first chunk is requested
+    chunks = list(chunks)
+    assert len(chunks) > 1
+    assert all(len(chunk) < 100 + len(bytes(commands[-1])) for chunk in chunks)
+    assert b"".join(chunks) == b"".join(bytes(cmd) for cmd in commands)
+
+
+def test_sending_in_chunks_keeps_encodings_of_small_requests(redis):
+    small = [Command("ECHO {}", "foo"), MultiExec(Command("PING"))]
+    list(redis.send_chunks(small, chunk_size=100))
+    assert all(type(cmd._encoded) is bytes for cmd in small)
+
+    bulk = [Command("ECHO {}", i) for i in range(1000)]
+    list(redis.send_chunks(bulk, chunk_size=100))
+    assert all(cmd._encoded is None for cmd in bulk[-10:])
+
+
+def test_sending_large_buffers_without_copying(redis):
+    value = bytearray(200)
+    commands = [Command("SET foo bar"), Command("SET foo {}", value), Command("PING")]
+    chunks = list(redis.send_chunks(commands, chunk_size=100))
+    assert any(type(chunk) is memoryview and chunk.obj is value for chunk in chunks)
+    assert b"".join(chunks) == b"".join(bytes(cmd) for cmd in commands)
+
+
+def test_encoding_errors_keep_the_connection(redis, ping):
+    with pytest.raises(UnicodeEncodeError):
+        redis.send([ping, Command("ECHO {}", "\udc80")])
+    assert not redis.broken and not redis.in_flight  # nothing was sent
+    assert bytes(ping) == redis.send([ping])
+    assert ["PONG"] == redis.receive(b"+PONG\r\n")
+
+
+def test_encoding_errors_before_the_first_chunk_keep_the_connection(ping):
+    redis = RedisSansIO(protocol=3)
+    chunks = redis.send_chunks([ping, Command("ECHO {}", "\udc80")])
+    with pytest.raises(UnicodeEncodeError):
+        list(chunks)
+    assert not redis.broken and not redis.in_flight
+    # the handshake is sent with the next batch instead
+    assert redis.send([ping]) == bytes(Command("HELLO 3")) + bytes(ping)
+
+
+def test_encoding_errors_keep_scripts_to_be_loaded(redis):
+    script = Script("return 1")
+    with pytest.raises(UnicodeEncodeError):
+        redis.send([script(keys=["\udc80"])])
+    assert bytes(script._load) in redis.send([script()])
+
+
+def test_encoding_errors_while_sending_chunks_break_the_connection(redis, ping):
+    commands = [Command("ECHO {}", "x" * 100)] * 10 + [Command("ECHO {}", "\udc80")]
+    chunks = redis.send_chunks(commands, chunk_size=100)
+    assert next(chunks)  # part of the request may already be written
+    with pytest.raises(UnicodeEncodeError):
+        list(chunks)
+    assert redis.broken and not redis.in_flight
+    with pytest.raises(ConnectionError):
+        redis.send([ping])
+
+
 def test_receiving(redis, ping):
     redis.send([ping])
     assert ["PONG"] == redis.receive(b"+PONG\r\n")
@@ -34,10 +98,81 @@ def test_receiving_in_chunks(redis, ping):
     assert ["PONG"] == redis.receive(b"\r\n")
 
 
-def test_sending_repeatedly_should_raise(redis, ping):
-    with pytest.raises(ProtocolError):
-        redis.send([ping])
-        redis.send([ping])
+def test_receiving_into_buffer(redis, ping):
+    redis.send([ping])
+    data = b"+PONG\r\n"
+    redis.get_buffer()[: len(data)] = data
+    assert ["PONG"] == redis.buffer_updated(len(data))
+
+
+def test_read_size_adapts_to_reply_size(redis):
+    initial_size = redis.read_size
+    value = b"x" * 100_000
+    redis.send([Command("GET foo")])
+    data = b"$%d\r\n%b\r\n" % (len(value), value)
+
+    replies = NOT_ENOUGH_DATA
+    while data:
+        buffer = redis.get_buffer()
+        chunk, data = data[: len(buffer)], data[len(buffer) :]  # noqa: E203
+        buffer[: len(chunk)] = chunk
+        replies = redis.buffer_updated(len(chunk))
+    assert [value] == replies
+    assert redis.read_size > initial_size
+
+    for _ in range(100):
+        redis.send([Command("PING")])
+        redis.receive(b"+PONG\r\n")
+    assert redis.read_size == initial_size
+
+
+def test_receiving_outcomes(redis, ping):
+    redis.send([ping, Command("foo"), ping])
+    assert [] == redis.receive_outcomes(b"+PO")
+    first, second = redis.receive_outcomes(b"NG\r\n-ERR unknown command\r\n")
+    assert isinstance(first, Value) and first.unwrap() == "PONG"
+    assert isinstance(second, Error)
+    (third,) = redis.receive_outcomes(b"+PONG\r\n")
+    assert third.unwrap() == "PONG"
+    assert redis.in_flight == 0
+
+
+def test_receiving_outcomes_of_all_batches(redis, ping):
+    redis.send([ping, ping])
+    redis.send([Command("foo"), ping])
+    first, second, third = redis.receive_all_outcomes(
+        b"+PONG\r\n+PONG\r\n-ERR unknown command\r\n"
+    )
+    assert second.unwrap() == "PONG" and isinstance(third, Error)
+    (fourth,) = redis.receive_all_outcomes(b"+PONG\r\n")
+    assert fourth.unwrap() == "PONG"
+    assert redis.in_flight == 0
+
+
+def test_sending_multiple_batches(redis, ping):
+    redis.send([ping])
+    redis.send([ping, ping])
+    assert redis.in_flight == 2
+    assert ["PONG"] == redis.receive(b"+PONG\r\n+PONG\r\n")
+    assert redis.receive(b"") is NOT_ENOUGH_DATA
+    assert ["PONG", "PONG"] == redis.receive(b"+PONG\r\n")
+    assert redis.in_flight == 0
+
+
+def test_receiving_multiple_completed_batches(redis, ping):
+    redis.send([ping])
+    redis.send([ping])
+    assert ["PONG"] == redis.receive(b"+PONG\r\n+PONG\r\n")
+    assert ["PONG"] == redis.receive(b"")
+    assert redis.in_flight == 0
+
+
+def test_errors_in_earlier_batch_do_not_affect_later_batches(redis, ping):
+    redis.send([Command("foo")])
+    redis.send([ping])
+    with pytest.raises(PipelineError):
+        redis.receive(b"-ERR unknown command\r\n+PONG\r\n")
+    assert ["PONG"] == redis.receive(b"")
 
 
 def test_receiving_without_send_should_raise(redis):
@@ -78,3 +213,39 @@ def test_errors_in_pipeline(redis):
             first_reply, second_reply = error.outcomes
             assert isinstance(first_reply, Value) and isinstance(second_reply, Error)
             raise
+
+
+def test_negotiating_resp3(ping):
+    redis = RedisSansIO(protocol=3)
+    assert redis.send([ping]) == bytes(Command("HELLO 3")) + bytes(ping)
+    assert NOT_ENOUGH_DATA == redis.receive(b"%1\r\n+proto\r\n:3\r\n")
+    assert ["PONG"] == redis.receive(b"+PONG\r\n")
+
+
+def test_failing_resp3_negotiation(ping):
+    redis = RedisSansIO(protocol=3)
+    redis.send([ping])
+    with pytest.raises(ConnectionError):
+        redis.receive(b"-ERR unknown command 'HELLO'\r\n")
+
+
+def test_resp3_types():
+    redis = RedisSansIO(protocol=3)
+    redis.send([Command("HGETALL foo").into(dict), Command("EXISTS foo").into(bool)])
+    data = b"%1\r\n+proto\r\n:3\r\n" + b"%1\r\n$1\r\na\r\n,1.5\r\n" + b"#t\r\n"
+    assert [{b"a": 1.5}, True] == redis.receive(data)
+
+
+def test_push_frames_are_kept_apart(ping):
+    redis = RedisSansIO(protocol=3)
+    redis.send([ping])
+    push = b">2\r\n$10\r\ninvalidate\r\n*1\r\n$3\r\nfoo\r\n"
+    data = b"%1\r\n+proto\r\n:3\r\n" + push + b"+PONG\r\n" + push
+    assert ["PONG"] == redis.receive(data)
+    assert redis.pop_pushes() == 2 * [[b"invalidate", [b"foo"]]]
+    assert redis.pop_pushes() == []
+
+
+def test_unknown_protocol():
+    with pytest.raises(ValueError):
+        RedisSansIO(protocol=4)
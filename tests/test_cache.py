@@ -0,0 +1,185 @@
+import pytest
+from reddish._core import Command, ClientSideCache
+from reddish._core.cache import MISS, cached_keys
+from reddish._core.sansio import RedisSansIO, NOT_ENOUGH_DATA, ProtocolError
+from reddish._core.errors import (
+    ConnectionError,
+    PipelineError,
+    UnsupportedCommandError,
+)
+
+HANDSHAKE = b"%1\r\n+server\r\n+redis\r\n+OK\r\n"
+
+
+@pytest.fixture
+def cache():
+    return ClientSideCache()
+
+
+@pytest.fixture
+def redis(cache):
+    redis = RedisSansIO(cache=cache)
+    redis.send([Command("PING")])
+    assert [b"PONG"] == redis.receive(HANDSHAKE + b"+PONG\r\n")
+    return redis
+
+
+def test_cached_keys():
+    assert cached_keys(Command("GET foo")) == (b"foo",)
+    assert cached_keys(Command("MGET {} {}", "a", 1)) == (b"a", b"1")
+    assert cached_keys(Command("HGET {} field", "hash")) == (b"hash",)
+    assert cached_keys(Command("SET foo bar")) is None
+    assert cached_keys(Command("GET {}", bytearray(b"foo"))) is None  # may change
+
+
+def test_handshake_is_sent_first(cache):
+    redis = RedisSansIO(cache=cache)
+    request = redis.send([Command("PING")])
+    assert request == b"".join(
+        bytes(Command(cmd)) for cmd in ["HELLO 3", "CLIENT TRACKING ON", "PING"]
+    )
+    assert NOT_ENOUGH_DATA == redis.receive(HANDSHAKE)
+    assert [b"PONG"] == redis.receive(b"+PONG\r\n")
+
+
+def test_failing_handshake(cache):
+    redis = RedisSansIO(cache=cache)
+    redis.send([Command("PING")])
+    with pytest.raises(ConnectionError):
+        redis.receive(b"-ERR unknown command 'HELLO'\r\n-ERR no redirect\r\n")
+    assert redis.broken
+
+
+def test_serving_from_cache(redis, cache):
+    get = Command("GET foo").into(str)
+    assert bytes(get) == redis.send([get])
+    assert ["bar"] == redis.receive(b"$3\r\nbar\r\n")
+    assert len(cache) == 1
+
+    assert b"" == redis.send([get])
+    assert ["bar"] == redis.receive(b"")
+    assert cache.hits == 1
+
+
+def test_partially_cached_batch(redis):
+    get, incr = Command("GET foo"), Command("INCR counter")
+    redis.send([get])
+    redis.receive(b"$3\r\nbar\r\n")
+
+    assert bytes(incr) == redis.send([get, incr, get])
+    assert [b"bar", 1, b"bar"] == redis.receive(b":1\r\n")
+
+
+def test_outcomes_from_cache(redis):
+    get = Command("GET foo")
+    redis.send([get])
+    redis.receive(b"$3\r\nbar\r\n")
+
+    redis.send([get, Command("PING"), get])
+    outcomes = redis.receive_outcomes(b"")
+    assert [b"bar"] == [outcome.unwrap() for outcome in outcomes]
+    outcomes = redis.receive_outcomes(b"+PONG\r\n")
+    assert [b"PONG", b"bar"] == [outcome.unwrap() for outcome in outcomes]
+
+
+def test_invalidation(redis, cache):
+    get = Command("GET foo")
+    redis.send([get])
+    redis.receive(b"$3\r\nbar\r\n")
+
+    ping = Command("PING")
+    redis.send([ping])
+    assert [b"PONG"] == redis.receive(
+        b">2\r\n$10\r\ninvalidate\r\n*1\r\n$3\r\nfoo\r\n+PONG\r\n"
+    )
+    assert len(cache) == 0
+    assert cache.invalidations == 1
+    assert bytes(get) == redis.send([get])
+
+
+def test_invalidation_while_nothing_is_in_flight(redis, cache):
+    get = Command("GET foo")
+    redis.send([get])
+    redis.receive(b"$3\r\nbar\r\n")
+
+    redis.receive_pushes(b">2\r\n$10\r\ninvalidate\r\n*1\r\n$3\r\nfoo\r\n")
+    assert len(cache) == 0
+    assert bytes(get) == redis.send([get])  # not served from the cache
+
+
+def test_replies_while_nothing_is_in_flight(redis):
+    with pytest.raises(ProtocolError):
+        redis.receive_pushes(b"+OK\r\n")
+    assert redis.broken
+
+
+def test_entries_are_served_to_the_connection_that_read_them(redis, cache):
+    get = Command("GET foo")
+    redis.send([get])
+    redis.receive(b"$3\r\nbar\r\n")
+
+    # only the connection that read the key is told about changes to it
+    other = RedisSansIO(cache=cache)
+    other.send([Command("PING")])
+    other.receive(HANDSHAKE + b"+PONG\r\n")
+    assert bytes(get) == other.send([get])
+    other.receive(b"$3\r\nbaz\r\n")
+    assert b"" == other.send([get])  # served from the cache
+    assert [b"baz"] == other.receive(b"")
+    assert bytes(get) == redis.send([get])
+
+
+def test_invalidating_everything(redis, cache):
+    redis.send([Command("GET foo"), Command("GET bar")])
+    redis.receive(b"$1\r\n1\r\n$1\r\n2\r\n")
+    assert len(cache) == 2
+
+    redis.send([Command("PING")])
+    redis.receive(b">2\r\n$10\r\ninvalidate\r\n_\r\n+PONG\r\n")
+    assert len(cache) == 0
+
+
+def test_errors_are_not_cached(redis, cache):
+    redis.send([Command("GET foo")])
+    with pytest.raises(PipelineError):
+        redis.receive(b"-WRONGTYPE wrong kind of value\r\n")
+    assert len(cache) == 0
+
+
+def test_broken_connection_clears_cache(redis, cache):
+    redis.send([Command("GET foo")])
+    redis.receive(b"$3\r\nbar\r\n")
+    redis.mark_broken()
+    assert len(cache) == 0
+
+
+def test_eviction():
+    cache = ClientSideCache(max_entries=2)
+    for key in ["a", "b", "c"]:
+        command = Command("GET {}", key)
+        cache.set(command, cached_keys(command), b"value")
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get(Command("GET a")) is MISS
+    assert cache.get(Command("GET c")) == b"value"
+
+
+def test_entries_expire_by_default():
+    cache = ClientSideCache()
+    command = Command("GET foo")
+    cache.set(command, cached_keys(command), b"bar")
+    assert cache.get(command) == b"bar"
+    assert cache._entries[bytes(command)].expires < float("inf")
+
+
+def test_expiry():
+    cache = ClientSideCache(ttl=0)
+    command = Command("GET foo")
+    cache.set(command, cached_keys(command), b"bar")
+    assert cache.get(command) is MISS
+    assert len(cache) == 0
+
+
+def test_client_tracking_is_not_supported(redis):
+    with pytest.raises(UnsupportedCommandError):
+        redis.send([Command("CLIENT TRACKING ON")])
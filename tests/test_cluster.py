@@ -0,0 +1,173 @@
+import pytest
+from outcome import Error, Value
+from reddish._core import Command, MultiExec
+from reddish._core.command import Args
+from reddish._core.cluster import (
+    ClusterPipeline,
+    SlotMap,
+    command_slot,
+    crc16,
+    first_key,
+    key_slot,
+)
+from reddish._core.errors import CommandError, ConnectionError, PipelineError
+
+A, B = ("127.0.0.1", 7000), ("127.0.0.1", 7001)
+
+
+def test_crc16():
+    assert crc16(b"123456789") == 0x31C3
+
+
+@pytest.mark.parametrize(
+    "key, same_as",
+    [
+        ("{user1000}.following", "user1000"),
+        ("foo{bar}{zap}", "bar"),
+        ("foo{}{bar}", "foo{}{bar}"),
+        ("foo{{bar}}zap", "{bar"),
+        (b"{bar", b"{bar"),
+    ],
+)
+def test_hashtags(key, same_as):
+    assert key_slot(key) == key_slot(same_as)
+
+
+def test_key_slot():
+    assert key_slot("foo") == 12182
+    assert key_slot(42) == key_slot("42")
+    assert key_slot(memoryview(b"foo")) == key_slot("foo")
+
+
+@pytest.mark.parametrize(
+    "command, key",
+    [
+        (Command("GET foo"), "foo"),
+        (Command("MGET {}", Args(["a", "b"])), "a"),
+        (Command("PING"), None),
+        (Command("EVAL {} 1 {}", "return 1", "key"), "key"),
+        (Command("EVAL {} 0", "return 1"), None),
+        (Command("XREAD COUNT 2 STREAMS stream 0"), "stream"),
+        (Command("OBJECT ENCODING foo"), "foo"),
+        (Command("JSON.GET doc $"), "doc"),  # unknown commands
+        (MultiExec(Command("PING"), Command("INCR counter")), "counter"),
+    ],
+)
+def test_first_key(command, key):
+    assert first_key(command) == key
+
+
+def shards(resp3=False):
+    def node(port):
+        fields = ["port", port, "ip", "127.0.0.1", "role", "master"]
+        fields += ["health", "online"]
+        return dict(zip(fields[::2], fields[1::2])) if resp3 else fields
+
+    replica = ["port", 7002, "ip", "127.0.0.1", "role", "replica"]
+    shards = [
+        ["slots", [0, 8000], "nodes", [node(7000), replica]],
+        ["slots", [8001, 16000, 16001, 16383], "nodes", [node(7001)]],
+    ]
+    if resp3:
+        return [dict(zip(shard[::2], shard[1::2])) for shard in shards]
+    return shards
+
+
+@pytest.mark.parametrize("resp3", [False, True])
+def test_slot_map_from_shards(resp3):
+    slot_map = SlotMap.from_shards(shards(resp3))
+    assert slot_map.node_for_slot(0) == A
+    assert slot_map.node_for_slot(8000) == A
+    assert slot_map.node_for_slot(8001) == B
+    assert slot_map.node_for_slot(16383) == B
+    assert slot_map.node_for_slot(None) in (A, B)
+    assert sorted(slot_map.nodes) == [A, B]
+
+
+@pytest.fixture
+def slot_map():
+    return SlotMap([(0, 8000, A), (8001, 16383, B)])
+
+
+def keys_on(slot_map, address, count):
+    keys = (f"key:{i}" for i in range(1000))
+    return [k for k in keys if slot_map.node_for_slot(key_slot(k)) == address][:count]
+
+
+def test_splitting_and_reassembling(slot_map):
+    (a1, a2), (b1,) = keys_on(slot_map, A, 2), keys_on(slot_map, B, 1)
+    commands = [Command("GET {}", a1), Command("GET {}", b1), Command("GET {}", a2)]
+    pipeline = ClusterPipeline(slot_map, commands)
+
+    requests = pipeline.requests()
+    assert requests == {A: [commands[0], commands[2]], B: [commands[1]]}
+    pipeline.feed(B, [Value(b"b1")])
+    pipeline.feed(A, [Value(b"a1"), Value(b"a2")])
+    assert pipeline.done
+    assert pipeline.replies() == [b"a1", b"b1", b"a2"]
+
+
+def test_following_moved(slot_map):
+    (key,) = keys_on(slot_map, A, 1)
+    command = Command("GET {}", key)
+    pipeline = ClusterPipeline(slot_map, [command])
+    pipeline.requests()
+    moved = f"MOVED {key_slot(key)} {B[0]}:{B[1]}"
+    pipeline.feed(A, [Error(CommandError(moved))])
+
+    assert pipeline.moved
+    assert slot_map.node_for_slot(key_slot(key)) == B
+    assert pipeline.requests() == {B: [command]}
+    pipeline.feed(B, [Value(b"value")])
+    assert pipeline.replies() == [b"value"]
+
+
+def test_following_ask(slot_map):
+    (key,) = keys_on(slot_map, A, 1)
+    command = Command("GET {}", key)
+    pipeline = ClusterPipeline(slot_map, [command])
+    pipeline.requests()
+    pipeline.feed(A, [Error(CommandError(f"ASK {key_slot(key)} {B[0]}:{B[1]}"))])
+
+    assert not pipeline.moved
+    assert slot_map.node_for_slot(key_slot(key)) == A
+    ((address, commands),) = pipeline.requests().items()
+    assert address == B
+    assert bytes(commands[0]) == bytes(Command("ASKING"))
+    assert commands[1] is command
+    pipeline.feed(B, [Value(b"OK"), Value(b"value")])
+    assert pipeline.replies() == [b"value"]
+
+
+def test_max_redirects(slot_map):
+    (key,) = keys_on(slot_map, A, 1)
+    moved = Error(CommandError(f"MOVED {key_slot(key)} {A[0]}:{A[1]}"))
+    pipeline = ClusterPipeline(slot_map, [Command("GET {}", key)], max_redirects=2)
+    for _ in range(3):
+        ((address, _),) = pipeline.requests().items()
+        pipeline.feed(address, [moved])
+    assert pipeline.done
+    with pytest.raises(PipelineError):
+        pipeline.replies()
+
+
+def test_failing_node(slot_map):
+    (key,) = keys_on(slot_map, A, 1)
+    pipeline = ClusterPipeline(slot_map, [Command("GET {}", key)])
+    pipeline.requests()
+    pipeline.fail(A, ConnectionError())
+    assert pipeline.done
+    with pytest.raises(ConnectionError):
+        pipeline.outcomes[0].unwrap()
+
+
+def test_unserved_slots():
+    pipeline = ClusterPipeline(SlotMap(), [Command("GET foo")])
+    assert pipeline.done
+    with pytest.raises(ConnectionError):
+        pipeline.outcomes[0].unwrap()
+
+
+def test_command_slot():
+    assert command_slot(Command("PING")) is None
+    assert command_slot(Command("SET {} 1", "{tag}a")) == key_slot("tag")
@@ -1,3 +1,6 @@
+import mmap
+from array import array
+
 import hiredis
 import hypothesis.strategies as st
 import pytest
@@ -7,7 +10,12 @@ from hiredis import ReplyError
 
 # functions under test
 from reddish._core import Args, Command, MultiExec
-from reddish._core.errors import CommandError, TransactionError, ParseError
+from reddish._core.errors import (
+    CommandError,
+    TransactionError,
+    ParseError,
+    UnsupportedCommandError,
+)
 
 from .strategies import complex_type, type_and_value
 
@@ -37,17 +45,188 @@ def test_command_parsing_fails():
             raise
 
 
+def test_repr_with_keyword_args():
+    command = Command("SET {key} {value}", key="foo", value=42)
+    assert repr(command) == "Command('SET {key} {value}', key='foo', value=42)"
+
+
+def test_repr_with_unused_args():
+    command = Command("ECHO {}", "foo", "bar", baz=42)
+    assert bytes(command) == bytes(Command("ECHO foo"))
+    assert repr(command) == "Command('ECHO {}', 'foo', 'bar', baz=42)"
+
+
+def test_repr_with_buffers():
+    command = Command("SET {} {}", "foo", Args([bytearray(b"bar"), memoryview(b"baz")]))
+    assert repr(command) == "Command('SET {} {}', 'foo', Args([b'bar', b'baz']))"
+    assert bytes(eval(repr(command))) == bytes(command)
+
+
+def test_repr_with_large_buffers():
+    command = Command("SET {} {}", "foo", bytearray(1000))
+    assert (
+        repr(command)
+        == f"Command('SET {{}} {{}}', 'foo', {repr(bytes(64))}...(1000 bytes))"
+    )
+
+
+def test_command_template():
+    template = Command.template("SET {key} {value}")
+    assert bytes(template(key="foo", value=42)) == bytes(
+        Command("SET {key} {value}", key="foo", value=42)
+    )
+    assert bytes(template(key="bar", value=Args([1, 2]))) == bytes(
+        Command("SET bar 1 2")
+    )
+
+
+def test_command_template_into():
+    template = Command.template("ECHO {}").into(int)
+    assert 42 == template(42)._parse_response(b"42")
+
+
+def test_command_template_repr():
+    command = Command.template("ECHO {}")("hello")
+    assert bytes(eval(repr(command))) == bytes(command)
+
+
+def test_command_template_missing_args():
+    with pytest.raises(TypeError):
+        Command.template("SET {key} {value}")(key="foo")
+
+
+def test_command_template_invalid_args():
+    with pytest.raises(ValueError):
+        Command.template("ECHO {}")(object())
+
+
+def test_command_template_unsupported_command():
+    with pytest.raises(UnsupportedCommandError):
+        Command.template("SUBSCRIBE {}")
+
+
 def test_empty_Command():
     with pytest.raises(ValueError):
         Command("")
 
 
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Command("SET {} {}", "foo", Args([1, 2])),
+        Command("PING").into(str),
+        Args(["foo", 1]),
+        MultiExec(Command("PING")),
+    ],
+)
+def test_no_instance_dict(obj):
+    # large pipelines hold many commands and arguments
+    assert not hasattr(obj, "__dict__")
+
+
+def test_args_are_kept_in_a_tuple():
+    args = Args(iter(["foo", 1, 1.5, b"bar"]))
+    assert args._parts == ("foo", 1, 1.5, b"bar")
+    assert list(args) == ["foo", 1, 1.5, b"bar"] and len(args) == 4
+    with pytest.raises(ValueError):
+        Args([None])
+
+
+def test_args_from_sequence():
+    assert Args.from_sequence([1, 2, 3])._parts == (1, 2, 3)
+    assert Args.from_sequence(array("q", [1, 2]))._parts == (1, 2)
+    assert Args.from_sequence(array("d", [1.5]))._parts == (1.5,)
+    assert Args.from_sequence(["foo", 1])._parts == ("foo", 1)  # mixed types
+    with pytest.raises(ValueError):
+        Args.from_sequence([1, None])
+
+
+def test_args_from_numpy_array():
+    numpy = pytest.importorskip("numpy")
+    assert Args.from_sequence(numpy.arange(3))._parts == (0, 1, 2)
+    with pytest.raises(ValueError):
+        Args.from_sequence(numpy.zeros((2, 2)))
+
+
+@pytest.mark.parametrize(
+    "buffer",
+    [bytearray(b"bar"), memoryview(b"bar"), memoryview(array("B", b"bar")), b"bar"],
+)
+def test_buffers_are_encoded_like_bytes(buffer):
+    expected = bytes(Command("SET foo bar"))
+    assert bytes(Command("SET foo {}", buffer)) == expected
+    assert bytes(Command("SET {}", Args([b"foo", buffer]))) == expected
+
+
+def test_buffers_are_not_copied():
+    value = bytearray(b"bar")
+    command = Command("RPUSH foo {} {}", value, Args([1, value]))
+    views = [part for part in command._segments() if type(part) is memoryview]
+    assert len(views) == 2 and all(view.obj is value for view in views)
+    value[:] = b"baz"  # commands with buffers are never cached
+    assert bytes(command) == bytes(Command("RPUSH foo baz 1 baz"))
+    assert bytes(command) == bytes(Command("RPUSH foo baz 1 baz"))
+
+
+def test_mmap_fields():
+    with mmap.mmap(-1, 3) as buffer:
+        buffer.write(b"bar")
+        assert bytes(Command("SET foo {}", buffer)) == bytes(Command("SET foo bar"))
+
+
+def test_non_contiguous_buffers_are_rejected():
+    with pytest.raises(ValueError):
+        Command("SET foo {}", memoryview(b"abcd")[::2])
+
+
+@pytest.mark.parametrize(
+    "buffer", [array("q", [1, 2, 300]), memoryview(array("d", [1.5]))]
+)
+def test_buffers_of_numbers_are_rejected(buffer):
+    with pytest.raises(ValueError):  # numbers would be sent as raw memory
+        Command("SET foo {}", buffer)
+    with pytest.raises(ValueError):
+        Args([buffer])
+
+
+def test_buffers_of_signed_bytes():
+    assert bytes(Command("SET foo {}", array("b", b"bar"))) == bytes(
+        Command("SET foo bar")
+    )
+
+
+def test_numpy_values_are_not_sent_as_raw_memory():
+    numpy = pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        Args(numpy.array([1, 2, 300]))  # use `Args.from_sequence` instead
+    with pytest.raises(ValueError):
+        Command("SET foo {}", numpy.int64(7))
+    assert Args.from_sequence(numpy.array([1, 2, 300]))._parts == (1, 2, 300)
+
+
+def test_multi_exec_with_buffers():
+    tx = MultiExec(Command("SET foo {}", bytearray(b"bar")), Command("GET foo"))
+    expected = MultiExec(Command("SET foo bar"), Command("GET foo"))
+    assert bytes(tx) == bytes(expected)
+
+
 def test_command_serialization():
     reader = hiredis.Reader()
     reader.feed(bytes(Command("SET {foo} {bar}", foo="foo", bar="bar")))
     assert [b"SET", b"foo", b"bar"] == reader.gets()
 
 
+def test_command_serialization_is_cached():
+    command = Command("SET {foo} {bar}", foo="foo", bar=Args(["bar", "baz"]))
+    assert bytes(command) is bytes(command)
+    assert bytes(command.into(str)) is bytes(command)
+
+
+def test_multi_exec_serialization_is_cached():
+    tx = MultiExec(Command("PING"), Command("ECHO {}", "foo"))
+    assert bytes(tx) is bytes(tx)
+
+
 def test_command_error():
     with pytest.raises(CommandError):
         try:
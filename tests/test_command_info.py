@@ -0,0 +1,118 @@
+import pytest
+from reddish._core import Args, Command
+from reddish._core.command_info import (
+    CommandInfo,
+    CommandTable,
+    command_table,
+    generate_table,
+)
+from reddish._core import command_table as command_table_module
+from reddish._core.command_table import COMMANDS
+
+
+@pytest.mark.parametrize(
+    "command, keys",
+    [
+        (Command("GET foo"), ("foo",)),
+        (Command("MGET {}", Args(["a", "b"])), ("a", "b")),
+        (Command("MSET a 1 b 2"), ("a", "b")),
+        (Command("BLPOP a b 0"), ("a", "b")),
+        (Command("COPY a b REPLACE"), ("a", "b")),
+        (Command("ZINTERSTORE out 2 a b WEIGHTS 1 2"), ("out", "a", "b")),
+        (Command("EVAL {} 1 key arg", "return 1"), ("key",)),
+        (Command("EVAL {} 0 arg", "return 1"), ()),
+        (Command("XREAD COUNT 2 STREAMS s1 s2 0 0"), ("s1", "s2")),
+        (Command("XREADGROUP GROUP g c STREAMS s >"), ("s",)),
+        (Command("OBJECT ENCODING foo"), ("foo",)),
+        (Command("OBJECT {} foo", "encoding"), ("foo",)),
+        (Command("PING"), ()),
+        (Command("NOT.A.COMMAND foo"), None),
+    ],
+)
+def test_keys(command, keys):
+    assert command.keys() == keys
+
+
+def test_flags():
+    assert Command("GET foo").info.readonly
+    assert Command("SET foo bar").info.write
+    assert Command("BLPOP foo 0").info.blocking
+    assert not Command("GET foo").info.blocking
+    assert Command("xinfo stream foo").info.name == "XINFO|STREAM"
+
+
+def test_info_of_templates():
+    assert Command.template("GET {}")("foo").info is command_table["GET"]
+    template = Command.template("{} {}")
+    assert template("GET", "foo").info is command_table["GET"]
+    assert template("ECHO", "foo").info is command_table["ECHO"]
+
+
+def resp2_entry(name, arity, flags, specs, subcommands=()):
+    return [name, arity, flags, 0, 0, 0, [], [], specs, list(subcommands)]
+
+
+def key_spec(begin, find):
+    return ["flags", ["RO"], "begin_search", begin, "find_keys", find]
+
+
+def index(i):
+    return ["type", "index", "spec", ["index", i]]
+
+
+def range_(lastkey, keystep=1, limit=0):
+    spec = ["lastkey", lastkey, "keystep", keystep, "limit", limit]
+    return ["type", "range", "spec", spec]
+
+
+def test_table_from_reply():
+    reply = [
+        resp2_entry(b"json.get", -2, [b"readonly"], [key_spec(index(1), range_(0))]),
+        resp2_entry(
+            b"xinfo",
+            -2,
+            [],
+            [],
+            [resp2_entry(b"xinfo|stream", -3, [b"readonly"], [])],
+        ),
+        ["get", 2, ["readonly", "fast"], 1, 1, 1],  # before redis 7
+        ["mget", -2, ["readonly", "fast"], 1, -1, 1],
+        None,  # `COMMAND INFO` of unknown commands
+    ]
+    table = CommandTable.from_reply(reply)
+    assert table.lookup("JSON.GET").readonly
+    assert table.lookup(b"json.get").keys(["JSON.GET", "doc", "$"]) == ["doc"]
+    assert table.lookup("XINFO", "STREAM").name == "XINFO|STREAM"
+    assert table.lookup("GET").keys(["GET", "foo"]) == ["foo"]
+    assert table.lookup("MGET").keys(["MGET", "a", "b"]) == ["a", "b"]
+
+
+def test_table_from_resp3_reply():
+    spec = {
+        "flags": ["RO"],
+        "begin_search": {
+            "type": "keyword",
+            "spec": {"keyword": "KEYS", "startfrom": 1},
+        },
+        "find_keys": {
+            "type": "keynum",
+            "spec": {"keynumidx": 0, "firstkey": 1, "keystep": 1},
+        },
+    }
+    table = CommandTable.from_reply([resp2_entry("my.cmd", -2, [], [spec])])
+    info = table.lookup("MY.CMD")
+    assert info.keys(["MY.CMD", "x", "keys", 2, "a", "b", "c"]) == ["a", "b"]
+
+
+def test_update_is_seen_by_existing_commands():
+    table = CommandTable([CommandInfo("GET", 2, ["readonly"], [(1, "range", 0, 1, 0)])])
+    info = table.lookup("GET")
+    table.update([resp2_entry("get", 2, ["readonly", "fast"], [])])
+    assert table.lookup("GET") is info
+    assert "fast" in info.flags
+    assert info.key_specs == ()
+
+
+def test_generated_table_round_trips():
+    with open(command_table_module.__file__) as file:
+        assert generate_table(CommandTable.from_table(COMMANDS)) == file.read()
@@ -0,0 +1,155 @@
+import pytest
+
+from reddish import Command, MultiExec
+from reddish._core.instrumentation import (
+    Histogram,
+    Instrumentation,
+    LatencyRecorder,
+    SUB_BUCKETS,
+    command_name,
+    prometheus_text,
+)
+from reddish._core.sansio import RedisSansIO
+from reddish._core.stream import StreamWindow
+
+
+class Hooks(Instrumentation):
+    def __init__(self):
+        self.calls = []
+
+    def on_send(self, batch):
+        self.calls.append(("send", batch))
+
+    def on_first_byte(self, batch):
+        self.calls.append(("first_byte", batch))
+
+    def on_complete(self, batch):
+        self.calls.append(("complete", batch))
+
+
+@pytest.fixture
+def ping():
+    return Command("PING").into(str)
+
+
+def test_command_names(ping):
+    assert command_name(ping) == "PING"
+    assert command_name(Command("get {}", "foo")) == "GET"
+    assert command_name(MultiExec(ping, ping)) == "MULTI"
+
+
+def test_histogram_small_values_are_exact():
+    histogram = Histogram()
+    for value in range(1, 11):
+        histogram.record(value)
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(100) == 10
+    assert histogram.count == 10 and histogram.sum == 55
+    assert (histogram.min, histogram.max) == (1, 10)
+
+
+@pytest.mark.parametrize("value", [33, 64, 65, 100, 1_000, 123_456, 10**9])
+def test_histogram_relative_precision(value):
+    histogram = Histogram()
+    histogram.record(value)
+    histogram.record(1)
+    upper = Histogram._upper_bound(Histogram._index(value))
+    assert value <= upper < value * (1 + 1 / SUB_BUCKETS)  # about 3%
+    assert histogram.percentile(99) == value  # capped by the maximum
+
+
+def test_histogram_buckets_per_power_of_two():
+    indexes = {Histogram._index(value) for value in range(1 << 20, 1 << 21)}
+    assert len(indexes) == SUB_BUCKETS
+    assert Histogram._index((1 << 20) - 1) < min(indexes)
+    assert Histogram._index(1 << 21) > max(indexes)
+
+
+def test_histogram_merge_and_cumulative_counts():
+    first, second = Histogram(), Histogram()
+    first.record(10, count=3)
+    second.record(1000)
+    first.merge(second)
+    assert first.count == 4 and first.max == 1000
+    assert first.cumulative_counts([5, 10, 2000]) == [0, 3, 4]
+
+
+def test_hooks_order_and_stats(ping):
+    hooks = Hooks()
+    redis = RedisSansIO(instrumentation=hooks)
+    request = redis.send([ping, ping])
+    assert [name for name, _ in hooks.calls] == ["send"]
+    batch = hooks.calls[0][1]
+    assert batch.size == 2 and batch.command_names == ["PING", "PING"]
+    assert batch.encoded_bytes == len(request)
+
+    redis.receive(b"+PONG\r\n")
+    assert [name for name, _ in hooks.calls] == ["send", "first_byte"]
+    assert redis.receive(b"+PONG\r\n") == ["PONG", "PONG"]
+    assert [name for name, _ in hooks.calls] == ["send", "first_byte", "complete"]
+    assert batch.reply_bytes == 14
+    assert batch.completed is not None
+    assert 0 <= batch.io_time <= batch.latency
+
+
+def test_hooks_with_chunks(ping):
+    hooks = Hooks()
+    redis = RedisSansIO(instrumentation=hooks)
+    request = b"".join(redis.send_chunks([ping] * 10, chunk_size=20))
+    ((_, batch),) = hooks.calls
+    assert batch.encoded_bytes == len(request)
+
+
+def test_latency_recorder(ping):
+    recorder = LatencyRecorder()
+    redis = RedisSansIO(instrumentation=recorder)
+    redis.send([ping, Command("GET foo")])
+    redis.receive(b"+PONG\r\n$-1\r\n")
+    assert recorder.latencies["PING"].count == 1
+    assert recorder.latencies["GET"].count == 1
+    assert recorder.batch_sizes.max == 2
+    assert recorder.received_bytes == 12
+    assert 0 < recorder.percentile("ping", 99) < 1
+
+
+def test_prometheus_text(ping):
+    recorder = LatencyRecorder()
+    redis = RedisSansIO(instrumentation=recorder)
+    redis.send([ping])
+    redis.receive(b"+PONG\r\n")
+    text = prometheus_text(recorder)
+    assert "# TYPE reddish_command_duration_seconds histogram" in text
+    assert 'reddish_command_duration_seconds_bucket{command="PING",le="+Inf"} 1' in text
+    assert 'reddish_command_duration_seconds_count{command="PING"} 1' in text
+    assert 'reddish_batch_size_bucket{le="1"} 1' in text
+    assert f"reddish_sent_bytes_total {len(bytes(ping))}" in text
+    assert "reddish_received_bytes_total 7" in text
+
+
+def test_stream_window(ping):
+    redis = RedisSansIO()
+    window = StreamWindow(redis, 8)
+    assert window.wanted == 8
+    b"".join(window.send_chunks([ping] * 8))
+    assert window.wanted == 0 and window.in_flight == 8
+    assert len(window.receive(b"+PONG\r\n" * 2)) == 2
+    assert window.wanted == 2  # a quarter of the window is free
+    b"".join(window.send_chunks([ping]))
+    assert window.exhausted and not window.done
+    assert len(window.receive(b"+PONG\r\n" * 7)) == 7
+    assert window.done
+
+
+def test_stream_window_counts_outcomes_received_elsewhere(ping):
+    redis = RedisSansIO()
+    window = StreamWindow(redis, 4)
+    b"".join(window.send_chunks([ping] * 2))
+    assert window.exhausted
+    outcomes = redis.receive_all_outcomes(b"+PONG\r\n" * 2)  # e.g. by a protocol
+    assert window.received(outcomes) == outcomes
+    assert window.done
+
+
+def test_stream_window_needs_room():
+    with pytest.raises(ValueError):
+        StreamWindow(RedisSansIO(), 0)
@@ -0,0 +1,182 @@
+import math
+from array import array
+from typing import List, Optional
+
+import pytest
+
+from reddish import Command
+from reddish._core.errors import ParseError
+from reddish._core.parser import parse
+from reddish.models import (
+    Array,
+    Hash,
+    Info,
+    NDArray,
+    Numbers,
+    ScoredArrays,
+    ScoredMembers,
+    ScoredNDArrays,
+    StreamEntries,
+    StreamEntry,
+)
+
+INFO = (
+    b"# Server\r\n"
+    b"redis_version:7.2.4\r\n"
+    b"uptime_in_seconds:42\r\n"
+    b"\r\n"
+    b"# Memory\r\n"
+    b"mem_fragmentation_ratio:1.25\r\n"
+    b"\r\n"
+    b"# Keyspace\r\n"
+    b"db0:keys=3,expires=1,avg_ttl=0\r\n"
+)
+
+
+@pytest.mark.parametrize(
+    "model, reply, expected",
+    [
+        (Hash, [b"a", b"1", b"b", b"2"], {"a": "1", "b": "2"}),
+        (Hash, {b"a": b"1"}, {"a": "1"}),  # RESP3
+        (Hash[str, int], [b"a", b"1"], {"a": 1}),
+        (Hash[bytes, bytes], [b"a", b"1"], {b"a": b"1"}),
+        (Hash, [], {}),
+        (ScoredMembers, [b"a", b"1", b"b", b"2.5"], [("a", 1.0), ("b", 2.5)]),
+        (ScoredMembers, [[b"a", 1.0], [b"b", 2.5]], [("a", 1.0), ("b", 2.5)]),
+        (ScoredMembers[bytes], [b"a", b"inf"], [(b"a", float("inf"))]),
+        (
+            StreamEntries,
+            [[b"1-0", [b"f", b"v"]], [b"2-0", None]],
+            [StreamEntry("1-0", {"f": "v"}), StreamEntry("2-0", {})],
+        ),
+        (
+            StreamEntries[str, int],
+            [[b"1-0", [b"count", b"3"]]],
+            [StreamEntry("1-0", {"count": 3})],
+        ),
+        (Numbers, [b"1", None, 3], [1, None, 3]),
+        (Numbers[float], [b"1.5", b"2"], [1.5, 2.0]),
+        (
+            Info,
+            INFO,
+            {
+                "redis_version": "7.2.4",
+                "uptime_in_seconds": 42,
+                "mem_fragmentation_ratio": 1.25,
+                "db0": {"keys": 3, "expires": 1, "avg_ttl": 0},
+            },
+        ),
+    ],
+)
+def test_convert(model, reply, expected):
+    converted = parse(model, reply)
+    assert converted == expected
+    assert isinstance(converted, model)
+
+
+@pytest.mark.parametrize(
+    "model, reply",
+    [
+        (Hash, [b"a"]),
+        (Hash[str, int], [b"a", b"b"]),
+        (Hash, b"foo"),
+        (ScoredMembers, [b"a", b"b"]),
+        (StreamEntries, [[b"1-0"]]),
+        (Numbers, [b"foo"]),
+        (Numbers, b"1"),
+        (Info, 42),
+    ],
+)
+def test_invalid_replies(model, reply):
+    with pytest.raises(ParseError):
+        parse(model, reply)
+
+
+def test_nested_into_other_types():
+    assert parse(Optional[Hash], None) is None
+    assert parse(List[Hash[str, int]], [[b"a", b"1"]]) == [{"a": 1}]
+
+
+def test_parametrized_models_are_cached():
+    assert Hash[str, int] is Hash[str, int]
+    assert issubclass(Hash[str, int], Hash)
+    with pytest.raises(TypeError):
+        Hash[str]
+    with pytest.raises(TypeError):
+        Numbers[list]
+
+
+def test_into():
+    command = Command("HGETALL {}", "foo").into(Hash[str, int])
+    assert command._parse_response([b"a", b"1"]) == {"a": 1}
+
+
+def test_array():
+    converted = parse(Array, [b"1.5", b"-2", b"inf", 3])
+    assert isinstance(converted, array) and converted.typecode == "d"
+    assert list(converted) == [1.5, -2.0, float("inf"), 3.0]
+    assert parse(Array[int], [b"1", b"-2", 3]) == array("q", [1, -2, 3])
+
+
+def test_array_missing_values():
+    assert math.isnan(parse(Array, [b"1", None])[1])
+    with pytest.raises(ParseError):
+        parse(Array[int], [b"1", None])
+
+
+@pytest.mark.parametrize(
+    "model, reply",
+    [(Array, [b"foo"]), (Array[int], [b"1.5"]), (Array[str], [b"1"]), (Array, b"1")],
+)
+def test_array_invalid_replies(model, reply):
+    with pytest.raises(ParseError):
+        parse(model, reply)
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [[b"a", b"1", b"b", b"2.5"], [[b"a", 1.0], [b"b", 2.5]]],  # RESP2 and RESP3
+)
+def test_scored_arrays(reply):
+    members, scores = parse(ScoredArrays, reply)
+    assert members == ["a", "b"]
+    assert scores == array("d", [1.0, 2.5])
+
+
+def test_scored_arrays_numeric_members():
+    members, scores = parse(ScoredArrays[int], [b"10", b"1", b"20", b"2"])
+    assert members == array("q", [10, 20])
+    assert scores == array("d", [1.0, 2.0])
+
+
+def test_empty_arrays():
+    assert parse(Array[int], []) == array("q")
+    members, scores = parse(ScoredArrays[int], [])
+    assert members == array("q") and scores == array("d")
+
+
+def test_ndarray():
+    numpy = pytest.importorskip("numpy")
+    converted = parse(NDArray, [b"1.5", b"-2", None])
+    assert converted.dtype == numpy.float64 and converted.flags.c_contiguous
+    assert converted[:2].tolist() == [1.5, -2.0] and math.isnan(converted[2])
+    assert parse(NDArray[int], [b"1", b"2"]).tolist() == [1, 2]
+    with pytest.raises(ParseError):
+        parse(NDArray[int], [b"1.5"])
+
+
+def test_empty_ndarrays():
+    numpy = pytest.importorskip("numpy")
+    for type_, dtype in [(int, numpy.int64), (float, numpy.float64)]:
+        converted = parse(NDArray[type_], [])
+        assert converted.dtype == dtype and converted.shape == (0,)
+        members, scores = parse(ScoredNDArrays[type_], [])
+        assert members.dtype == dtype and members.shape == (0,)
+        assert scores.dtype == numpy.float64 and scores.shape == (0,)
+
+
+def test_scored_ndarrays():
+    pytest.importorskip("numpy")
+    members, scores = parse(ScoredNDArrays[float], [b"1.5", b"1", b"2.5", b"2"])
+    assert members.tolist() == [1.5, 2.5]
+    assert scores.tolist() == [1.0, 2.0]
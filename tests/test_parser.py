@@ -0,0 +1,55 @@
+from typing import Dict, List, Optional
+
+import pytest
+from hypothesis import given
+
+from reddish._core.errors import ParseError
+from reddish._core.parser import get_validator, parse
+
+from .strategies import complex_type, type_and_value
+
+
+@pytest.mark.parametrize(
+    "type_, value, expected",
+    [
+        (int, b"42", 42),
+        (int, b"-1", -1),
+        (int, b"1.0", 1),  # not handled by the fast path but by pydantic
+        (float, b"1.5", 1.5),
+        (float, b"inf", float("inf")),
+        (float, 3, 3.0),
+        (str, b"foo", "foo"),
+        (bytes, b"foo", b"foo"),
+        (List[bytes], [b"foo", b"bar"], [b"foo", b"bar"]),
+        (List[int], [b"1", 2], [1, 2]),
+        (Dict[bytes, bytes], {b"foo": b"bar"}, {b"foo": b"bar"}),
+        (Optional[int], None, None),
+    ],
+)
+def test_parse(type_, value, expected):
+    assert expected == parse(type_, value)
+
+
+@pytest.mark.parametrize(
+    "type_, value",
+    [
+        (int, b"foo"),
+        (str, b"\xff"),
+        (bytes, 42),
+        (List[bytes], [b"foo", None]),
+        (Dict[bytes, bytes], [b"foo", b"bar"]),
+    ],
+)
+def test_parse_error(type_, value):
+    with pytest.raises(ParseError):
+        parse(type_, value)
+
+
+@given(example=type_and_value(complex_type))
+def test_parse_complex_types(example):
+    type_, value = example
+    assert value == parse(type_, value)
+
+
+def test_validators_are_reused():
+    assert get_validator(List[int]) is get_validator(List[int])
@@ -0,0 +1,73 @@
+import pytest
+from reddish._core import Command
+from reddish._core.command import Args
+from reddish._core.pubsub import SubscriberSansIO, Message
+from reddish._core.errors import CommandError, ConnectionError
+
+
+@pytest.fixture
+def subscriber():
+    return SubscriberSansIO()
+
+
+def test_subscribing(subscriber):
+    request = subscriber.subscribe("foo", "bar")
+    assert request == bytes(Command("SUBSCRIBE {}", Args(["foo", "bar"])))
+    assert not subscriber.channels  # not confirmed yet
+
+    subscriber.receive(b"*3\r\n$9\r\nsubscribe\r\n$3\r\nfoo\r\n:1\r\n")
+    assert subscriber.channels == {b"foo"}
+
+
+def test_subscribing_requires_channels(subscriber):
+    with pytest.raises(ValueError):
+        subscriber.subscribe()
+
+
+def test_unsubscribing_from_everything(subscriber):
+    assert subscriber.unsubscribe() == bytes(Command("UNSUBSCRIBE"))
+    subscriber.channels.add(b"foo")
+    subscriber.receive(b"*3\r\n$11\r\nunsubscribe\r\n$3\r\nfoo\r\n:0\r\n")
+    assert not subscriber.channels
+
+
+def test_receiving_messages_in_batches(subscriber):
+    data = (
+        b"*3\r\n$7\r\nmessage\r\n$3\r\nfoo\r\n$1\r\n1\r\n"
+        b"*4\r\n$8\r\npmessage\r\n$2\r\nf*\r\n$3\r\nfoo\r\n$1\r\n2\r\n"
+        b"*3\r\n$8\r\nsmessage\r\n$3\r\nbar\r\n$1\r\n3\r\n"
+        b"*3\r\n$7\r\nmessage\r\n$3\r\nfoo\r\n$1\r\n"
+    )
+    assert subscriber.receive(data) == [
+        Message(b"foo", b"1"),
+        Message(b"foo", b"2", pattern=b"f*"),
+        Message(b"bar", b"3"),
+    ]
+    assert subscriber.receive(b"4\r\n") == [Message(b"foo", b"4")]
+
+
+def test_receiving_push_frames(subscriber):
+    data = b">3\r\n$7\r\nmessage\r\n$3\r\nfoo\r\n$1\r\n1\r\n"
+    assert subscriber.receive(data) == [Message(b"foo", b"1")]
+
+
+def test_receiving_errors(subscriber):
+    with pytest.raises(CommandError):
+        subscriber.receive(b"-ERR unknown command 'SSUBSCRIBE'\r\n")
+
+
+def test_receiving_errors_after_messages(subscriber):
+    message = b">3\r\n$7\r\nmessage\r\n$3\r\nfoo\r\n$1\r\n1\r\n"
+    data = message + b"-ERR unknown command 'SSUBSCRIBE'\r\n" + message
+    assert subscriber.receive(data) == [Message(b"foo", b"1")]
+    with pytest.raises(CommandError):
+        subscriber.receive(b"")
+    assert subscriber.receive(b"") == [Message(b"foo", b"1")]
+
+
+def test_broken_connection(subscriber):
+    subscriber.mark_broken()
+    with pytest.raises(ConnectionError):
+        subscriber.subscribe("foo")
+    with pytest.raises(ConnectionError):
+        subscriber.receive(b"")
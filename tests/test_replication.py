@@ -0,0 +1,76 @@
+import pytest
+from reddish._core import Command, MultiExec
+from reddish._core.replication import (
+    LEAST_OUTSTANDING,
+    ReplicaSelector,
+    is_read_only,
+    parse_replication_info,
+)
+
+A, B, C = ("10.0.0.1", 6379), ("10.0.0.2", 6379), ("10.0.0.3", 6379)
+
+INFO = (
+    b"# Replication\r\n"
+    b"role:master\r\n"
+    b"connected_slaves:3\r\n"
+    b"slave0:ip=10.0.0.1,port=6379,state=online,offset=1000,lag=0\r\n"
+    b"slave1:ip=10.0.0.2,port=6379,state=online,offset=900,lag=1\r\n"
+    b"slave2:ip=10.0.0.3,port=6379,state=wait_bgsave,offset=0,lag=0\r\n"
+    b"master_failover_state:no-failover\r\n"
+    b"master_repl_offset:1000\r\n"
+)
+
+
+@pytest.mark.parametrize(
+    "commands, read_only",
+    [
+        ([Command("GET foo"), Command("HGETALL bar")], True),
+        ([Command("GET foo"), Command("SET foo bar")], False),
+        ([MultiExec(Command("GET foo"))], False),
+        ([Command("UNKNOWN.COMMAND foo")], False),
+        ([Command("PING")], False),
+    ],
+)
+def test_is_read_only(commands, read_only):
+    assert is_read_only(commands) is read_only
+
+
+def test_parse_replication_info():
+    info = parse_replication_info(INFO)
+    assert info.role == "master"
+    assert info.offset == 1000
+    assert [replica.address for replica in info.replicas] == [A, B, C]
+    assert info.replicas_within(None) == [A, B]  # only online replicas
+    assert info.replicas_within(100) == [A, B]
+    assert info.replicas_within(0) == [A]
+
+
+def test_round_robin():
+    selector = ReplicaSelector([A, B])
+    assert [selector.select() for _ in range(4)] == [A, B, A, B]
+
+
+def test_least_outstanding():
+    selector = ReplicaSelector([A, B, C], LEAST_OUTSTANDING)
+    selector.started(A)
+    selector.started(A)
+    selector.started(B)
+    assert selector.select() == C
+    selector.started(C)
+    selector.finished(A)
+    selector.finished(A)
+    assert selector.select() == A
+
+
+def test_removing_replicas():
+    selector = ReplicaSelector([A])
+    assert not selector.degraded
+    selector.remove(A)
+    assert selector.select() is None and selector.degraded
+    selector.replicas = [A, B]
+    assert selector.replicas == [A, B] and not selector.degraded
+
+
+def test_unknown_balancing():
+    with pytest.raises(ValueError):
+        ReplicaSelector([A], "random")
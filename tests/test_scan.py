@@ -0,0 +1,74 @@
+import pytest
+from reddish import Command
+from reddish._core.scan import HSCAN, SCAN, SSCAN, ZSCAN, ScanSansIO
+
+
+def test_commands():
+    scan = ScanSansIO(SCAN, match="user:*", type="hash", count=10)
+    assert bytes(scan.next_command()) == bytes(
+        Command("SCAN 0 MATCH user:* TYPE hash COUNT 10")
+    )
+    scan.page([b"17", []])
+    assert bytes(scan.next_command()) == bytes(
+        Command("SCAN 17 MATCH user:* TYPE hash COUNT 10")
+    )
+    assert bytes(ScanSansIO(SSCAN, "set", count=10).next_command()) == bytes(
+        Command("SSCAN set 0 COUNT 10")
+    )
+
+
+@pytest.mark.parametrize(
+    "command, key, options",
+    [
+        ("GET", None, {}),
+        (SCAN, "key", {}),
+        (HSCAN, None, {}),
+        (ZSCAN, "key", {"type": "zset"}),
+        (SCAN, None, {"count": 0}),
+    ],
+)
+def test_invalid(command, key, options):
+    with pytest.raises(ValueError):
+        ScanSansIO(command, key, **options)
+
+
+def test_until_cursor_is_zero():
+    scan = ScanSansIO(SCAN, target_latency=None)
+    assert scan.page([b"3", [b"a", b"b"]]) == [b"a", b"b"]
+    assert not scan.done
+    assert scan.page([b"0", [b"c"]]) == [b"c"]
+    assert scan.done
+    with pytest.raises(RuntimeError):
+        scan.next_command()
+
+
+def test_dedupe():
+    scan = ScanSansIO(SCAN)
+    assert scan.page([b"3", [b"a", b"b", b"a"]]) == [b"a", b"b"]
+    assert scan.page([b"0", [b"b", b"c"]]) == [b"c"]
+
+    scan = ScanSansIO(SCAN, dedupe=False)
+    assert scan.page([b"0", [b"a", b"a"]]) == [b"a", b"a"]
+
+
+def test_pairs():
+    scan = ScanSansIO(ZSCAN, "zset")
+    assert scan.page([b"5", [b"a", b"1", b"b", b"2"]]) == [(b"a", b"1"), (b"b", b"2")]
+    # members are told apart regardless of their score
+    assert scan.page([b"0", [b"a", b"3", b"c", b"4"]]) == [(b"c", b"4")]
+
+
+def test_adapt_count():
+    scan = ScanSansIO(SCAN, count=100, target_latency=0.01, max_count=300)
+    scan.page([b"1", []], elapsed=0.008)
+    assert scan.count == 125
+    scan.page([b"1", []], elapsed=0.001)  # at most doubled per page
+    assert scan.count == 250
+    scan.page([b"1", []], elapsed=0.001)
+    assert scan.count == 300
+    scan.page([b"1", []], elapsed=1.0)  # at most halved per page
+    assert scan.count == 150
+
+    scan = ScanSansIO(SCAN, count=100, target_latency=None)
+    scan.page([b"1", []], elapsed=1.0)
+    assert scan.count == 100
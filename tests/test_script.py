@@ -0,0 +1,86 @@
+import pytest
+from hiredis import ReplyError
+from outcome import Error, Value
+from reddish import Command, MultiExec
+from reddish._core.errors import CommandError, PipelineError
+from reddish._core.sansio import RedisSansIO
+from reddish._core.script import Library, Loading, Script, ScriptRetry
+
+INCRBY = Script("return redis.call('INCRBY', KEYS[1], ARGV[1])")
+LIBRARY = Library(
+    "#!lua name=counters\n"
+    "redis.register_function('incrby', function(keys, args)\n"
+    "  return redis.call('INCRBY', keys[1], args[1])\n"
+    "end)"
+)
+
+
+def test_script_call():
+    assert bytes(INCRBY(["counter"], [2])) == bytes(
+        Command("EVALSHA {} 1 counter 2", INCRBY.sha)
+    )
+    assert INCRBY(["counter"], [2]).keys() == ("counter",)
+
+
+def test_library_call():
+    assert LIBRARY.name == "counters"
+    assert bytes(LIBRARY.fcall("incrby", ["counter"], [2])) == bytes(
+        Command("FCALL incrby 1 counter 2")
+    )
+    assert bytes(LIBRARY.fcall_ro("get", ["counter"])) == bytes(
+        Command("FCALL_RO get 1 counter")
+    )
+    with pytest.raises(ValueError):
+        Library("redis.register_function('f', function() end)")
+
+
+def test_loaded_once_per_connection():
+    redis = RedisSansIO()
+    call = INCRBY(["counter"], [2])
+    load = bytes(Command("SCRIPT LOAD {}", INCRBY.source))
+    assert (
+        redis.send([call, Command("PING")])
+        == load + bytes(call) + b"*1\r\n$4\r\nPING\r\n"
+    )
+    assert redis.receive(b"$40\r\n" + INCRBY.sha.encode() + b"\r\n:2\r\n+PONG\r\n") == [
+        2,
+        b"PONG",
+    ]
+    # the script is known to the connection now
+    assert redis.send([call]) == bytes(call)
+    assert redis.receive(b":4\r\n") == [4]
+    # and to a transaction
+    transaction = MultiExec(LIBRARY.fcall("incrby", ["counter"], [1]))
+    load = bytes(Command("FUNCTION LOAD REPLACE {}", LIBRARY.code))
+    assert redis.send([transaction]) == load + bytes(transaction)
+    replies = b"$8\r\ncounters\r\n+OK\r\n+QUEUED\r\n*1\r\n:5\r\n"
+    assert redis.receive(replies) == [[5]]
+
+
+def test_load_error():
+    broken = Script("return (")
+    loading = Loading([broken()], broken())
+    error = ReplyError("ERR Error compiling script")
+    with pytest.raises(CommandError, match="compiling"):
+        loading._parse_response(error, ReplyError("NOSCRIPT No matching script"))
+
+
+def test_retry():
+    commands = [INCRBY(["a"], [1]), Command("GET b"), INCRBY(["c"], [1])]
+    noscript = Error(CommandError("NOSCRIPT No matching script."))
+    error = PipelineError((noscript, Value(b"1"), noscript))
+    retry = ScriptRetry.from_error(commands, error)
+    # the script is loaded once for both calls
+    assert [type(command) for command in retry.commands] == [Loading, type(commands[2])]
+    assert retry.resolve([1, 2]) == [1, b"1", 2]
+
+
+def test_no_retry():
+    commands = [INCRBY(["a"], [1]), Command("GET b")]
+    error = PipelineError(
+        (
+            Error(CommandError("ERR something else")),
+            Error(CommandError("NOSCRIPT not a script call")),
+        )
+    )
+    assert ScriptRetry.from_error(commands, error) is None
@@ -0,0 +1,73 @@
+import pytest
+from outcome import Error, Value
+from reddish._core.pubsub import Message
+from reddish._core.errors import CommandError, PipelineError
+from reddish._core.sentinel import (
+    PrimaryConnections,
+    failed_over,
+    is_primary,
+    parse_address,
+    parse_switch_master,
+)
+
+A, B = ("10.0.0.1", 6379), ("10.0.0.2", 6379)
+
+
+def test_parse_address():
+    assert parse_address([b"10.0.0.1", b"6379"]) == A
+    assert parse_address(None) is None
+
+
+@pytest.mark.parametrize(
+    "data, address",
+    [
+        (b"mymaster 10.0.0.2 6379 10.0.0.1 6379", A),
+        (b"othermaster 10.0.0.2 6379 10.0.0.1 6379", None),
+        (b"mymaster", None),
+    ],
+)
+def test_parse_switch_master(data, address):
+    message = Message(b"+switch-master", data)
+    assert parse_switch_master(message, "mymaster") == address
+
+
+def test_is_primary():
+    assert is_primary([b"master", 1000, []])
+    assert not is_primary([b"slave", b"10.0.0.1", 6379, b"connected", 1000])
+
+
+def test_failed_over():
+    readonly = CommandError("READONLY You can't write against a read only replica.")
+    assert failed_over(readonly)
+    assert failed_over(Error(readonly))
+    assert failed_over(PipelineError([Value("OK"), Error(readonly)]))
+    assert not failed_over(CommandError("ERR unknown command"))
+    assert not failed_over(Value("OK"))
+
+
+def test_primary_connections_drain():
+    connections = PrimaryConnections()
+    assert connections.switch(A) == []
+    connections.connected("a")
+    connections.started("a")
+    # the batch on the old primary is allowed to finish
+    assert connections.switch(B) == []
+    assert connections.address == B
+    assert connections.current is None
+    connections.connected("b")
+    connections.started("b")
+    assert connections.finished("a") == ["a"]
+    assert connections.finished("b") == []
+    assert connections.switch(B) == []  # announced again
+    assert connections.current == "b"
+    assert connections.close() == ["b"]
+
+
+def test_primary_connections_retire():
+    connections = PrimaryConnections()
+    connections.switch(A)
+    connections.connected("a")
+    assert connections.retire("a") == ["a"]
+    assert connections.address == A
+    assert connections.current is None
+    assert connections.retire("a") == []
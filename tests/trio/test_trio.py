@@ -1,9 +1,19 @@
 import trio
 import pytest_trio
 import pytest
-from reddish.clients.trio import Redis
-from reddish import Command
-from reddish._core.errors import ConnectionError
+from reddish.clients.trio import (
+    Redis,
+    Subscriber,
+    RedisCluster,
+    ReplicatedRedis,
+    SentinelRedis,
+    scan,
+    hscan,
+)
+from reddish._core.cluster import key_slot
+from tests.standin import StandInCluster, StandInReplication, StandInSentinel
+from reddish import Command, MultiExec, Script, Message
+from reddish._core.errors import ConnectionError, PipelineError, CommandError
 
 
 @pytest_trio.trio_fixture
@@ -31,6 +41,32 @@ async def test_execute_many(redis, ping):
     ["PONG", "PONG"] == await redis.execute_many(ping, ping)
 
 
+@pytest.mark.trio
+async def test_execute_iter(redis, ping):
+    outcomes = [outcome async for outcome in redis.execute_iter(ping, Command("foo"))]
+    assert outcomes[0].unwrap() == "PONG"
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+    assert "PONG" == await redis.execute(ping)
+
+
+@pytest.mark.trio
+async def test_execute_stream(redis, ping):
+    async def commands():
+        for i in range(1000):
+            yield Command("ECHO {}", i).into(int)
+
+    outcomes = [o async for o in redis.execute_stream(commands(), window=64)]
+    assert [outcome.unwrap() for outcome in outcomes] == list(range(1000))
+
+    commands = [ping, Command("foo"), ping]
+    outcomes = [o async for o in redis.execute_stream(commands, window=2)]
+    with pytest.raises(CommandError):
+        outcomes[1].unwrap()
+    assert outcomes[2].unwrap() == "PONG"
+    assert "PONG" == await redis.execute(ping)
+
+
 @pytest.mark.trio
 async def test_stream(connection):
     with pytest.raises(TypeError):
@@ -60,3 +96,219 @@ async def test_cancellation(redis, ping):
 
     with pytest.raises(ConnectionError):
         await redis.execute(ping)
+
+
+@pytest.mark.trio
+async def test_autopipeline(connection):
+    redis = Redis(await connection, autopipeline=True)
+    replies = {}
+
+    async def echo(i):
+        replies[i] = await redis.execute(Command("ECHO {}", i).into(int))
+
+    async with trio.open_nursery() as nursery:
+        for i in range(100):
+            nursery.start_soon(echo, i)
+
+    assert all(i == reply for i, reply in replies.items())
+
+
+@pytest.mark.trio
+async def test_autopipeline_errors(connection, ping):
+    redis = Redis(await connection, autopipeline=True)
+
+    async def fail():
+        with pytest.raises(PipelineError):
+            await redis.execute(Command("foo"))
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(fail)
+        nursery.start_soon(redis.execute, ping)
+
+
+@pytest.mark.trio
+async def test_subscriber(redis):
+    async with Subscriber(await trio.open_tcp_stream("localhost", 6379)) as subscriber:
+        await subscriber.subscribe("news")
+        await subscriber.psubscribe("n*")
+        ready = Command("PUBLISH news ready").into(int)
+        while await redis.execute(ready) < 2:  # until both subscriptions are active
+            await trio.sleep(0.01)
+        await redis.execute(Command("PUBLISH news {}", "hello"))
+
+        messages = []
+        async for message in subscriber:
+            if message.data == b"hello":
+                messages.append(message)
+                if len(messages) == 2:
+                    break
+        assert set(messages) == {
+            Message(b"news", b"hello"),
+            Message(b"news", b"hello", pattern=b"n*"),
+        }
+        assert subscriber.channels == {b"news"}
+
+
+@pytest.mark.trio
+async def test_subscriber_errors_between_messages():
+    ours, theirs = trio.socket.socketpair()
+    message = b">3\r\n$7\r\nmessage\r\n$4\r\nnews\r\n$5\r\nhello\r\n"
+    async with Subscriber(trio.SocketStream(ours)) as subscriber:
+        await theirs.send(message + b"-ERR unknown command\r\n" + message)
+        assert await subscriber.get_messages() == [Message(b"news", b"hello")]
+        with pytest.raises(CommandError):
+            await subscriber.get_messages()
+        assert await subscriber.get_messages() == [Message(b"news", b"hello")]
+    theirs.close()
+
+
+@pytest.fixture
+def cluster():
+    with StandInCluster() as cluster:
+        yield cluster
+
+
+@pytest.mark.trio
+async def test_cluster(cluster):
+    async with RedisCluster(trio.open_tcp_stream, cluster.addresses[:1]) as redis:
+        keys = [f"key:{i}" for i in range(20)]
+        await redis.execute_many(*(Command("SET {} {}", key, key) for key in keys))
+        assert all(node.data for node in cluster.nodes)  # spread across all nodes
+        assert keys == await redis.execute_many(
+            *(Command("GET {}", key).into(str) for key in keys)
+        )
+
+
+@pytest.mark.trio
+async def test_cluster_redirects(cluster):
+    async with RedisCluster(trio.open_tcp_stream, cluster.addresses[:1]) as redis:
+        await redis.execute_many(Command("SET moved 1"), Command("SET asked 2"))
+        moved, asked = (key_slot(key) for key in ["moved", "asked"])
+        others = [node for node in cluster.nodes if node is not cluster.owner(moved)]
+        cluster.move_slot(moved, others[0])
+        source = cluster.owner(asked)
+        target = next(node for node in cluster.nodes if node is not source)
+        cluster.start_migration(asked, target)
+        target.data[b"asked"] = source.data.pop(b"asked")
+
+        assert [1, 2] == await redis.execute_many(
+            Command("GET moved").into(int), Command("GET asked").into(int)
+        )
+
+
+@pytest.fixture
+def replication():
+    with StandInReplication() as replication:
+        yield replication
+
+
+@pytest.mark.trio
+async def test_replicated(replication):
+    async with ReplicatedRedis(
+        trio.open_tcp_stream, replication.primary.address
+    ) as redis:
+        await redis.execute(Command("SET foo bar"))
+        assert replication.primary.data == {b"foo": b"bar"}
+        for _ in range(4):
+            assert "bar" == await redis.execute(Command("GET foo").into(str))
+        assert all(replica.commands_received == 2 for replica in replication.replicas)
+        # transactions and batches with writes go to the primary
+        assert [1, [2]] == await redis.execute_many(
+            Command("INCR counter"), MultiExec(Command("INCR counter"))
+        )
+
+
+@pytest.mark.trio
+async def test_replicated_lag(replication):
+    lagging, up_to_date = replication.replicas
+    async with ReplicatedRedis(
+        trio.open_tcp_stream,
+        replication.primary.address,
+        max_lag=0,
+        lag_check_interval=0,
+    ) as redis:
+        replication.pause(lagging)
+        await redis.execute(Command("SET foo bar"))
+        for _ in range(2):
+            assert "bar" == await redis.execute(Command("GET foo").into(str))
+        assert redis.replicas == [up_to_date.address]
+        replication.resume(lagging)
+        await redis.execute(Command("GET foo"))
+        assert len(redis.replicas) == 2
+
+
+@pytest.fixture
+def sentinel(replication):
+    with StandInSentinel(replication) as sentinel:
+        yield sentinel
+
+
+@pytest.mark.trio
+async def test_sentinel(replication, sentinel):
+    new_primary = replication.replicas[0]
+    async with SentinelRedis(
+        trio.open_tcp_stream, [sentinel.address], "mymaster"
+    ) as redis:
+        assert redis.primary == replication.primary.address
+        await redis.execute(Command("SET foo bar"))
+        sentinel.failover(new_primary)
+        for _ in range(100):
+            if redis.primary == new_primary.address:
+                break
+            await trio.sleep(0.01)
+        await redis.execute(Command("SET foo baz"))
+        assert new_primary.data == {b"foo": b"baz"}
+
+
+@pytest.mark.trio
+async def test_sentinel_readonly(replication, sentinel):
+    new_primary = replication.replicas[0]
+    async with SentinelRedis(
+        trio.open_tcp_stream, [sentinel.address], "mymaster"
+    ) as redis:
+        await redis.execute(Command("SET foo bar"))
+        sentinel.failover(new_primary, announce=False)
+        with pytest.raises(PipelineError):
+            await redis.execute(Command("SET foo baz"))
+        # the old primary refused the write so the primary is looked up again
+        await redis.execute(Command("SET foo baz"))
+        assert redis.primary == new_primary.address
+        assert new_primary.data == {b"foo": b"baz"}
+
+
+@pytest.mark.trio
+async def test_scan(redis):
+    keys = [f"scan:key:{index}".encode() for index in range(50)]
+    await redis.execute_many(*(Command("SET {} 1", key) for key in keys))
+    async with scan(redis, "scan:key:*", count=7) as found:
+        assert sorted([key async for key in found]) == sorted(keys)
+    # stopping early leaves the connection usable
+    async with scan(redis, "scan:key:*", count=7) as found:
+        async for key in found:
+            assert b"1" == await redis.execute(Command("GET {}", key))
+            break
+    assert "PONG" == await redis.execute(Command("PING").into(str))
+
+
+@pytest.mark.trio
+async def test_hscan(redis):
+    await redis.execute(Command("HSET scan:hash a 1 b 2 c 3"))
+    async with hscan(redis, "scan:hash", count=1) as pairs:
+        assert dict([pair async for pair in pairs]) == {
+            b"a": b"1",
+            b"b": b"2",
+            b"c": b"3",
+        }
+
+
+@pytest.mark.trio
+async def test_script(redis):
+    incrby = Script("return redis.call('INCRBY', KEYS[1], ARGV[1])")
+    await redis.execute(Command("DEL script:counter"))
+    assert 2 == await redis.execute(incrby(["script:counter"], [2]))
+    # calls are retried after loading the script again
+    await redis.execute(Command("SCRIPT FLUSH"))
+    assert [5, 8] == await redis.execute_many(
+        incrby(["script:counter"], [3]), incrby(["script:counter"], [3])
+    )
+    assert [[9]] == await redis.execute_many(MultiExec(incrby(["script:counter"], [1])))
@@ -1,4 +1,4 @@
-from reddish._core.command import Command
+from reddish._core.command import Command, CommandTemplate
 from reddish._core.multiexec import MultiExec
 from typing_extensions import assert_type
 
@@ -84,3 +84,9 @@ def check_MultiExec_n_args_non_uniform() -> None:
         ),
         MultiExec[tuple],
     )
+
+
+def check_CommandTemplate() -> None:
+    template = Command.template("GET {}").into(int)
+    assert_type(template, CommandTemplate[int])
+    assert_type(template("foo"), Command[int])